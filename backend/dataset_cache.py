@@ -0,0 +1,126 @@
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a generator change alters the output of the same request
+CACHE_VERSION = 4
+
+# Request fields that decide the bytes of a dataset
+CACHE_KEY_FIELDS = ("total_reviews", "chunk_size", "seed", "engine", "output_format", "compression",
+                    "include_structure_id", "dedup", "uniqueness_target")
+
+MANIFEST = "manifest.json"
+
+def _link_or_copy(source, target):
+    """Hard-link source to target, copying instead across filesystems"""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        shutil.copyfile(source, target)
+
+class DatasetCache:
+    """Content-addressed store of finished datasets
+    
+    Each entry is a directory named after a hash of everything that decides
+    a dataset's bytes: the request settings, the seed and the template
+    tables. Files are hard-linked in and out of it when possible. Once the
+    entries outgrow max_bytes the least recently used ones are evicted.
+    """
+    
+    def __init__(self, root, max_bytes, template_fingerprint):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.template_fingerprint = template_fingerprint
+        self.hits = 0
+        self.misses = 0
+    
+    def key(self, params):
+        """Cache key of a generation request, or None when it can't be cached
+        
+        Unseeded runs are meant to differ every time, so they are never cached.
+        """
+        if self.max_bytes <= 0 or params["seed"] is None:
+            return None
+        settings = {name: params[name] for name in CACHE_KEY_FIELDS}
+        # Sharded output doesn't depend on the number of workers, only on sharding
+        settings["sharded"] = params["workers"] > 1
+        payload = {"version": CACHE_VERSION, "settings": settings, "templates": self.template_fingerprint}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def fetch(self, key, output_dir):
+        """Link a cached dataset into output_dir and return its file paths, or None on a miss"""
+        entry = os.path.join(self.root, key)
+        manifest_path = os.path.join(entry, MANIFEST)
+        if not os.path.exists(manifest_path):
+            self.misses += 1
+            return None
+        
+        with open(manifest_path, encoding='utf-8') as f:
+            names = json.load(f)["files"]
+        os.makedirs(output_dir, exist_ok=True)
+        file_paths = []
+        for name in names:
+            file_paths.append(os.path.join(output_dir, name))
+            _link_or_copy(os.path.join(entry, name), file_paths[-1])
+        
+        # The manifest's mtime is the entry's last use for LRU eviction
+        os.utime(manifest_path)
+        self.hits += 1
+        return file_paths
+    
+    def store(self, key, file_paths):
+        """Add the files of a finished run under key, then evict down to the budget"""
+        entry = os.path.join(self.root, key)
+        if os.path.exists(os.path.join(entry, MANIFEST)):
+            return
+        os.makedirs(self.root, exist_ok=True)
+        
+        # Build the entry aside and move it into place, so a half-stored entry is never served
+        staging = os.path.join(self.root, f".{key}.{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            names = [os.path.basename(path) for path in file_paths]
+            for path, name in zip(file_paths, names):
+                _link_or_copy(path, os.path.join(staging, name))
+            with open(os.path.join(staging, MANIFEST), 'w', encoding='utf-8') as f:
+                json.dump({"key": key, "files": names}, f)
+            os.rename(staging, entry)
+        except OSError:
+            # Another run stored the same key first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(os.path.join(entry, MANIFEST)):
+                raise
+        
+        self.evict()
+    
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for key in os.listdir(self.root):
+            manifest_path = os.path.join(self.root, key, MANIFEST)
+            if not os.path.exists(manifest_path):
+                continue
+            entry = os.path.join(self.root, key)
+            size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+            entries.append((os.path.getmtime(manifest_path), size, entry))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            logger.info("Evicting cached dataset %s", os.path.basename(entry))
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+    
+    def stats(self):
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
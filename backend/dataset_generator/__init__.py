@@ -0,0 +1,14 @@
+"""Negative hotel review dataset generator, shared by the CLI and the web app
+
+The template tables live in templates as read-only data built once per
+process, so every generator, job worker and shard worker reuses them.
+"""
+from .dedup import DEDUP_MODES, BloomFilter, ReviewDeduplicator
+from .generator import ENGINES, HotelReviewDatasetGenerator
+from .jobs import GenerationCancelled, ProgressReporter, run_generation_job
+from .output import COMPRESSIONS, OUTPUT_FORMATS, clear_checkpoint, load_checkpoint, save_checkpoint
+from .pipeline import DEFAULT_WRITERS, WritePipeline
+from .profiling import PROFILE_MODES, StageProfiler
+from .sampling import AspectQuotaScheduler, FeistelPermutation
+from .serializers import SERIALIZERS, JSONSerializer
+from .templates import TEMPLATE_SETS, TemplateSet
@@ -0,0 +1,356 @@
+import base64
+import hashlib
+import math
+import random
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # only needed to check a whole block at once
+    np = None
+
+# Detection levels of the optional dedup stage
+DEDUP_MODES = (None, "exact", "near")
+
+# A duplicate is drawn again at most this many times before it is kept anyway
+MAX_RESAMPLES = 20
+
+DEDUP_COUNTERS = ("reviews", "exact_duplicates", "near_duplicates", "resampled")
+
+# Hashes are computed modulo 2**64, which NumPy's uint64 arithmetic wraps to for free
+_MASK64 = (1 << 64) - 1
+_GOLDEN64 = 0x9E3779B97F4A7C15
+
+def _check_dedup_options(dedup, uniqueness_target):
+    """Reject unknown dedup settings before anything is generated"""
+    if dedup not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode: {dedup}")
+    if uniqueness_target is not None:
+        if dedup is None:
+            raise ValueError("A uniqueness target needs a dedup mode")
+        if not 0 < uniqueness_target <= 1:
+            raise ValueError("The uniqueness target must be in (0, 1]")
+
+def _dedup_rates(counts):
+    """Add duplicate rates to the counters of one or more deduplicators"""
+    reviews = counts["reviews"]
+    stats = dict(counts)
+    for kind in ("exact", "near"):
+        stats[f"{kind}_rate"] = round(counts[f"{kind}_duplicates"] / reviews, 6) if reviews else 0.0
+    stats["duplicate_rate"] = round(stats["exact_rate"] + stats["near_rate"], 6)
+    return stats
+
+def _mix64(z):
+    """splitmix64 finalizer, which spreads the bits of a 64-bit int"""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+def _mix64_array(z):
+    """_mix64 of every element of a uint64 array"""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def _format_dedup_stats(stats):
+    return (f"Duplicates: {stats['exact_duplicates']:,} exact ({stats['exact_rate']:.2%}), "
+            f"{stats['near_duplicates']:,} near ({stats['near_rate']:.2%}), "
+            f"{stats['resampled']:,} drawn again")
+
+class BloomFilter:
+    """Fixed-size set of keys that answers "maybe present" or "absent"
+    
+    The bit array is sized so that false positives stay near error_rate until
+    capacity keys have been added; there are never false negatives. A key's
+    bit positions come from two 64-bit hashes, so they can be computed for a
+    whole array of keys with NumPy as well as for one key.
+    """
+    
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+    
+    def positions(self, key):
+        """Bit positions of a byte string, from one digest split into two hashes"""
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        return self.hash_positions(int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little"))
+    
+    def hash_positions(self, h1, h2):
+        """Bit positions of a key given as two 64-bit hashes"""
+        h2 |= 1
+        return [((h1 + i * h2) & _MASK64) % self.num_bits for i in range(self.num_hashes)]
+    
+    def block_positions(self, h1, h2):
+        """hash_positions of arrays of hashes, as a (keys, num_hashes) array"""
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps * (h2 | np.uint64(1))[:, None]) % np.uint64(self.num_bits)
+    
+    def contains(self, positions):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+    
+    def add(self, positions):
+        bits = self.bits
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+    
+    def block_contains(self, positions):
+        """contains for every row of a block_positions array"""
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        masks = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+        return (bits[(positions >> np.uint64(3)).astype(np.intp)] & masks).all(axis=-1)
+    
+    def block_add(self, positions):
+        """add every row of a block_positions array"""
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        masks = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+        np.bitwise_or.at(bits, (positions >> np.uint64(3)).astype(np.intp).ravel(), masks.ravel())
+    
+    def get_state(self):
+        return base64.b64encode(zlib.compress(self.bits, 1)).decode('ascii')
+    
+    def set_state(self, state):
+        self.bits = bytearray(zlib.decompress(base64.b64decode(state)))
+
+class ReviewDeduplicator:
+    """Flag reviews whose text repeats, or nearly repeats, an earlier one
+    
+    Exact duplicates are looked up in a Bloom filter of the texts. Near
+    duplicates use MinHash over word shingles with LSH: the signature is cut
+    into bands, and a review that shares a whole band with an earlier one
+    counts as a near duplicate, which catches pairs whose shingle sets have a
+    Jaccard similarity of about 0.7 or more. The bands go into a second Bloom
+    filter, so memory is fixed by capacity however many reviews are checked.
+    
+    Shingles and MinHash permutations are multiply-shift hashes modulo 2**64,
+    so classify_block computes the keys of a whole block of texts with
+    NumPy and gets the same keys classify gets one text at a time.
+    
+    With a uniqueness_target, allows_duplicate tells the generator whether
+    keeping one more duplicate would bring the share of unique reviews
+    below the target, in which case it draws the review again.
+    """
+    
+    NUM_PERMUTATIONS = 16
+    BANDS = 4
+    SHINGLE_WORDS = 3
+    # Templates reuse the same few thousand words and shingles, so their hashes are cached up to this many
+    SHINGLE_CACHE_SIZE = 1 << 16
+    # Texts whose keys are computed in one go; bounds the (shingles, permutations) array
+    BLOCK_TEXTS = 8192
+    # Stands between the texts of a block, and its hash 0 between their word hashes
+    _SEPARATOR = "\x01"
+    
+    def __init__(self, capacity, near=True, uniqueness_target=None, error_rate=0.001):
+        self.near = near
+        self.uniqueness_target = uniqueness_target
+        self.texts = BloomFilter(capacity, error_rate)
+        self.bands = BloomFilter(capacity * self.BANDS, error_rate) if near else None
+        # Fixed multipliers, so signatures agree between runs and checkpoints
+        hash_rng = random.Random(0)
+        self.permutations = [(hash_rng.getrandbits(64) | 1, hash_rng.getrandbits(64))
+                             for _ in range(self.NUM_PERMUTATIONS)]
+        self.shingle_multipliers = [hash_rng.getrandbits(64) | 1 for _ in range(self.SHINGLE_WORDS + 1)]
+        self.band_seeds = [hash_rng.getrandbits(64) for _ in range(self.BANDS)]
+        self._word_hashes = {self._SEPARATOR: 0}
+        self._shingle_hashes = {}
+        self.counts = dict.fromkeys(DEDUP_COUNTERS, 0)
+    
+    def classify(self, text, keys=None):
+        """Return (kind, keys) for a text; kind is None, "exact" or "near"
+        
+        Nothing is recorded until keys is passed to keep, so a text that is
+        drawn again doesn't count as seen. keys may be given when they were
+        computed ahead, by block_keys.
+        """
+        if keys is None:
+            keys = self._keys(text)
+        text_positions, band_positions = keys
+        kind = "exact" if self.texts.contains(text_positions) else None
+        if kind is None and any(self.bands.contains(positions) for positions in band_positions):
+            kind = "near"
+        return kind, keys
+    
+    def allows_duplicate(self):
+        """Whether one more duplicate keeps the share of unique reviews at the target"""
+        if self.uniqueness_target is None:
+            return True
+        duplicates = self.counts["exact_duplicates"] + self.counts["near_duplicates"] + 1
+        return duplicates <= (1 - self.uniqueness_target) * (self.counts["reviews"] + 1)
+    
+    def keep(self, kind, keys, resampled=0):
+        """Record a review that goes into the dataset"""
+        text_positions, band_positions = keys
+        self.texts.add(text_positions)
+        for positions in band_positions:
+            self.bands.add(positions)
+        self.counts["reviews"] += 1
+        self.counts["resampled"] += resampled
+        if kind is not None:
+            self.counts[f"{kind}_duplicates"] += 1
+    
+    def block_keys(self, texts):
+        """keys of every text, for classify, computed a block at a time"""
+        keys = []
+        for start in range(0, len(texts), self.BLOCK_TEXTS):
+            text_hashes, text_positions, band_hashes, band_positions = self._block_keys(
+                texts[start:start + self.BLOCK_TEXTS])
+            band_positions = band_positions.tolist() if band_positions is not None else [[]] * len(text_positions)
+            keys.extend(zip(text_positions.tolist(), band_positions))
+        return keys
+    
+    def classify_and_keep_block(self, texts):
+        """Classify and keep a block of texts without drawing any of them again
+        
+        Each text is looked up in the filters as they were before the block
+        and among the block's earlier texts by its hashes, so, unlike one
+        text at a time, a false positive can't come from bits that only
+        texts of the same block set.
+        """
+        for start in range(0, len(texts), self.BLOCK_TEXTS):
+            text_hashes, text_positions, band_hashes, band_positions = self._block_keys(
+                texts[start:start + self.BLOCK_TEXTS])
+            exact = self.texts.block_contains(text_positions) | _seen_earlier(text_hashes[:, None])
+            near = np.zeros_like(exact)
+            if self.near:
+                near = ~exact & (self.bands.block_contains(band_positions).any(axis=1) | _seen_earlier(band_hashes))
+                self.bands.block_add(band_positions.reshape(-1, band_positions.shape[-1]))
+            self.texts.block_add(text_positions)
+            self.counts["reviews"] += len(text_hashes)
+            self.counts["exact_duplicates"] += int(exact.sum())
+            self.counts["near_duplicates"] += int(near.sum())
+    
+    def stats(self):
+        return _dedup_rates(self.counts)
+    
+    def get_state(self):
+        """Counters and filters as plain data for a checkpoint"""
+        state = {"counts": dict(self.counts), "texts": self.texts.get_state()}
+        if self.near:
+            state["bands"] = self.bands.get_state()
+        return state
+    
+    def set_state(self, state):
+        self.counts = dict(state["counts"])
+        self.texts.set_state(state["texts"])
+        if self.near:
+            self.bands.set_state(state["bands"])
+    
+    def _keys(self, text):
+        """Bit positions of a text and of its bands"""
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        text_positions = self.texts.hash_positions(int.from_bytes(digest[:8], "little"),
+                                                   int.from_bytes(digest[8:], "little"))
+        band_positions = []
+        if self.near:
+            band_positions = [self.bands.hash_positions(band, _mix64(band ^ _GOLDEN64)) for band in self._bands(text)]
+        return text_positions, band_positions
+    
+    def _word_hash_list(self, words):
+        """Hash of every word, never 0, which marks the separator"""
+        cache = self._word_hashes
+        try:
+            return [cache[word] for word in words]
+        except KeyError:
+            pass
+        hashes = []
+        for word in words:
+            h = cache.get(word)
+            if h is None:
+                h = zlib.crc32(word.encode('utf-8')) + 1
+                if len(cache) < self.SHINGLE_CACHE_SIZE:
+                    cache[word] = h
+            hashes.append(h)
+        return hashes
+    
+    def _shingle_hash(self, words):
+        """Multiply-shift hash of the word hashes of one shingle"""
+        h = self.shingle_multipliers[-1]
+        for word, multiplier in zip(words, self.shingle_multipliers):
+            h += word * multiplier
+        return (h & _MASK64) >> 32
+    
+    def _band_hash(self, band, values):
+        """64-bit key of one band of a signature, from pairs of its 32-bit values"""
+        h = self.band_seeds[band]
+        for i in range(0, len(values), 2):
+            h = _mix64(h ^ (values[i] << 32 | values[i + 1]))
+        return h
+    
+    def _bands(self, text):
+        """LSH band keys of a text's MinHash signature
+        
+        A text of fewer words than a shingle is one shingle, padded with 0.
+        """
+        size = self.SHINGLE_WORDS
+        words = self._word_hash_list(text.lower().split()) + [0] * size
+        cache = self._shingle_hashes
+        shingle_hashes = []
+        for i in range(max(1, len(words) - 2 * size + 1)):
+            shingle = tuple(words[i:i + size])
+            hashes = cache.get(shingle)
+            if hashes is None:
+                h = self._shingle_hash(shingle)
+                hashes = tuple(((a * h + b) & _MASK64) >> 32 for a, b in self.permutations)
+                if len(cache) < self.SHINGLE_CACHE_SIZE:
+                    cache[shingle] = hashes
+            shingle_hashes.append(hashes)
+        # Each permutation's minimum over the shingles
+        signature = list(map(min, zip(*shingle_hashes)))
+        rows = self.NUM_PERMUTATIONS // self.BANDS
+        return [self._band_hash(band, signature[band * rows:(band + 1) * rows]) for band in range(self.BANDS)]
+    
+    def _block_keys(self, texts):
+        """Hashes and bit positions of a block of texts and of their bands
+        
+        Returns the (texts,) hashes and (texts, num_hashes) positions of the
+        texts, then the (texts, BANDS) hashes and (texts, BANDS, num_hashes)
+        positions of their bands, which are None without near detection.
+        """
+        digests = b"".join(hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts)
+        text_hashes = np.frombuffer(digests, dtype="<u8").reshape(len(texts), 2)
+        text_positions = self.texts.block_positions(text_hashes[:, 0], text_hashes[:, 1])
+        if not self.near:
+            return text_hashes[:, 0], text_positions, None, None
+        
+        # Every text is followed by a shingle's worth of separators, whose
+        # hash 0 pads the shingle of a short text as _bands does
+        size = self.SHINGLE_WORDS
+        separators = f" {' '.join([self._SEPARATOR] * size)} "
+        tokens = (separators.join(texts) + separators).lower().split()
+        words = np.array(self._word_hash_list(tokens), dtype=np.uint64)
+        ends = np.flatnonzero(words == 0)[::size]
+        starts = np.concatenate([[0], ends[:-1] + size])
+        counts = np.maximum(1, ends - starts - size + 1)
+        offsets = np.cumsum(counts) - counts
+        shingle_starts = np.repeat(starts, counts) + np.arange(counts.sum()) - np.repeat(offsets, counts)
+        
+        shingles = np.full(len(shingle_starts), self.shingle_multipliers[-1], dtype=np.uint64)
+        for i, multiplier in enumerate(self.shingle_multipliers[:size]):
+            shingles += words[shingle_starts + i] * np.uint64(multiplier)
+        shingles >>= np.uint64(32)
+        multipliers = np.array([a for a, _ in self.permutations], dtype=np.uint64)
+        increments = np.array([b for _, b in self.permutations], dtype=np.uint64)
+        hashes = (shingles[:, None] * multipliers + increments) >> np.uint64(32)
+        signatures = np.minimum.reduceat(hashes, offsets, axis=0)
+        
+        rows = self.NUM_PERMUTATIONS // self.BANDS
+        band_hashes = np.empty((len(texts), self.BANDS), dtype=np.uint64)
+        for band in range(self.BANDS):
+            h = np.full(len(texts), self.band_seeds[band], dtype=np.uint64)
+            for i in range(band * rows, (band + 1) * rows, 2):
+                h = _mix64_array(h ^ (signatures[:, i] << np.uint64(32) | signatures[:, i + 1]))
+            band_hashes[:, band] = h
+        band_positions = self.bands.block_positions(
+            band_hashes.ravel(), _mix64_array(band_hashes.ravel() ^ np.uint64(_GOLDEN64)))
+        return (text_hashes[:, 0], text_positions, band_hashes,
+                band_positions.reshape(len(texts), self.BANDS, -1))
+
+def _seen_earlier(keys):
+    """Whether any key of each row of a (rows, keys) array is also a key of an earlier row"""
+    _, first, inverse = np.unique(keys.ravel(), return_index=True, return_inverse=True)
+    first_row = first // keys.shape[1]
+    rows = np.repeat(np.arange(len(keys)), keys.shape[1])
+    return (first_row[inverse.ravel()] < rows).reshape(keys.shape).any(axis=1)
@@ -0,0 +1,1096 @@
+import bisect
+import contextlib
+import gc
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the vectorized engine
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # only needed for the columnar output formats
+    pa = None
+    pq = None
+
+from .dedup import (DEDUP_COUNTERS, MAX_RESAMPLES, ReviewDeduplicator, _check_dedup_options, _dedup_rates,
+                    _format_dedup_stats)
+from .output import (COLUMNAR_FORMATS, COMPRESSIONS, OUTPUT_FORMATS, _check_output_options, _open_part_file,
+                     save_checkpoint)
+from .pipeline import WritePipeline
+from .profiling import PROFILED_METHODS, StageProfiler, _check_profile_option
+from .sampling import (MAX_ASPECTS, AspectQuotaScheduler, FeistelPermutation, _elementary_symmetric, _sum_without,
+                       _without)
+from .serializers import JSONSerializer
+from .templates import (TEMPLATE_SETS, _assemble_columns, _compile_template, _compile_template_columns, _object_array,
+                        _render_template)
+
+ENGINES = ("python", "numpy", "unique")
+
+def _limit_review_length(review_text):
+    """Ensure a review doesn't exceed 60 tokens"""
+    words = review_text.split()
+    if len(words) > 60:
+        review_text = " ".join(words[:60])
+        if not review_text.endswith('.'):
+            review_text += "."
+    return review_text
+
+def _rng_state_from_json(state):
+    """Turn a random.Random state read back from JSON into the tuple setstate expects"""
+    version, internal_state, gauss_next = state
+    return version, tuple(internal_state), gauss_next
+
+class HotelReviewDatasetGenerator:
+    def __init__(self, seed=None, rng=None, engine="python", batch_size=100000, include_structure_id=False,
+                 dedup=None, uniqueness_target=None, profile=None, templates="standard", serializer=None,
+                 json_compat=False):
+        # All randomness goes through this RNG so a seeded run is reproducible
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        
+        # "numpy" draws the random choices of a whole batch of reviews at once,
+        # "unique" unranks distinct combinations so that no review repeats
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if engine == "numpy" and np is None:
+            raise ImportError("The numpy engine requires numpy to be installed")
+        self.engine = engine
+        self.batch_size = batch_size
+        self._resume_point = None
+        # Writer threads of the current streamed run, if any
+        self.pipeline = None
+        
+        # Record which review structure opened each review as "structure_id"
+        self.include_structure_id = include_structure_id
+        
+        # Optional dedup stage: count "exact" or "near" duplicate texts, and
+        # with a uniqueness_target draw a duplicate's wording again
+        _check_dedup_options(dedup, uniqueness_target)
+        if dedup is not None and engine == "unique":
+            raise ValueError("The unique engine never repeats a combination and has no dedup stage")
+        self.dedup = dedup
+        self.uniqueness_target = uniqueness_target
+        self.deduplicator = None
+        self._shard_dedup_counts = None
+        
+        # Optional profiling: time the stages of every run, and with "cprofile"
+        # or "tracemalloc" also capture the runs with that module
+        _check_profile_option(profile)
+        self.profile = profile
+        self.profiler = None
+        if profile is not None:
+            self.profiler = StageProfiler(profile)
+            self.profiler.instrument(self, PROFILED_METHODS)
+        
+        # The template tables are shared, read-only data built once per process
+        if templates not in TEMPLATE_SETS:
+            raise ValueError(f"Unknown templates: {templates}")
+        self.templates = TEMPLATE_SETS[templates]
+        self.aspect_mappings = self.templates.aspect_mappings
+        self.problem_templates = self.templates.problem_templates
+        self.review_structures = self.templates.review_structures
+        self.connectors = self.templates.connectors
+        self.complaint_structures = self.templates.complaint_structures
+        self.realistic_endings = self.templates.realistic_endings
+        self.ending_probability = self.templates.ending_probability
+        self._compiled_structures = self.templates.compiled_structures
+        self._compiled_complaints = self.templates.compiled_complaints
+        
+        # JSON parts are encoded by orjson or msgspec when installed; with
+        # json_compat a part holding floats is encoded by the json module
+        self.serializer = JSONSerializer(serializer, json_compat)
+    
+    def template_fingerprint(self):
+        """Hash of every template table, which changes whenever the generated text would"""
+        return self.templates.fingerprint()
+    
+    def get_random_aspects(self, min_aspects=1, max_aspects=3):
+        """Get random aspects ensuring variety"""
+        aspect_keys = list(self.aspect_mappings.keys())
+        num_aspects = self.rng.randint(min_aspects, max_aspects)
+        selected_aspects = self.rng.sample(aspect_keys, num_aspects)
+        
+        result_aspects = []
+        for aspect_key in selected_aspects:
+            # Choose random synonym for each aspect
+            synonym = self.rng.choice(self.aspect_mappings[aspect_key])
+            result_aspects.append(synonym)
+        
+        return selected_aspects, result_aspects
+    
+    def get_problems_for_aspects(self, aspect_keys):
+        """Get corresponding problems for selected aspects"""
+        problems = []
+        for aspect_key in aspect_keys:
+            if aspect_key in self.problem_templates:
+                problem = self.rng.choice(self.problem_templates[aspect_key])
+                problems.append(problem)
+        return problems
+    
+    def generate_review_text(self, aspects, problems):
+        """Generate natural review text"""
+        return self._compose_review_text(aspects, problems)[0]
+    
+    def _compose_review_text(self, aspects, problems, rng=None):
+        """Build the review text and return it with the id of the structure it opens with"""
+        rng = rng or self.rng
+        if len(aspects) == 1:
+            structure_id, structure = rng.choice(self._compiled_structures)
+            return _render_template(structure, (aspects[0], problems[0])), structure_id
+        else:
+            # For multiple aspects, create more complex reviews
+            structure_id, structure = rng.choice(self._compiled_structures)
+            review_text = _render_template(structure, (aspects[0], problems[0]))
+            for aspect, problem in zip(aspects[1:], problems[1:]):
+                connector = rng.choice(self.connectors)
+                structure = rng.choice(self._compiled_complaints)
+                review_text += _render_template(structure, (connector, aspect, problem))
+            
+            # Templates without closing remarks draw nothing for them
+            if self.ending_probability and rng.random() < self.ending_probability:
+                review_text += rng.choice(self.realistic_endings)
+            
+            return review_text, structure_id
+    
+    def generate_single_review(self, review_id):
+        """Generate a single review"""
+        aspect_keys, display_aspects = self.get_random_aspects()
+        problems = self.get_problems_for_aspects(aspect_keys)
+        
+        review_text = self.generate_review_text(display_aspects, problems)
+        
+        # Ensure review doesn't exceed 60 tokens (approximate)
+        words = review_text.split()
+        if len(words) > 60:
+            review_text = " ".join(words[:60])
+            # Ensure it ends properly
+            if not review_text.endswith('.'):
+                review_text += "."
+        
+        return {
+            "review_id": review_id,
+            "review_text": review_text,
+            "aspects": display_aspects,
+            "problems": problems
+        }
+    
+    # Called through the instance so that a profiled run can time it
+    _limit_review_length = staticmethod(_limit_review_length)
+    
+    def _draw_review(self, aspect_keys, rng):
+        """Draw the wording of a review about aspect_keys
+        
+        Returns the text, the aspect synonyms, the problems and the id of the
+        opening structure.
+        """
+        display_aspects = [rng.choice(self.aspect_mappings[key]) for key in aspect_keys]
+        problems = [rng.choice(self.problem_templates[key]) for key in aspect_keys]
+        
+        review_text, structure_id = self._compose_review_text(display_aspects, problems, rng)
+        return self._limit_review_length(review_text), display_aspects, problems, structure_id
+    
+    def _deduplicate(self, aspect_keys, drawn, rng, keys=None):
+        """Pass a drawn review through the dedup stage, drawing it again while its duplicate isn't allowed
+        
+        Only the wording is drawn again, never the aspects, so the aspect
+        quotas are unaffected. keys are those of the drawn text when they
+        were computed ahead.
+        """
+        kind, keys = self.deduplicator.classify(drawn[0], keys)
+        resampled = 0
+        while kind is not None and resampled < MAX_RESAMPLES and not self.deduplicator.allows_duplicate():
+            drawn = self._draw_review(aspect_keys, rng)
+            kind, keys = self.deduplicator.classify(drawn[0])
+            resampled += 1
+        self.deduplicator.keep(kind, keys, resampled)
+        return drawn
+    
+    def _deduplicate_block(self, texts, aspect_ids, rng):
+        """Pass a block of vectorized texts through the dedup stage
+        
+        Returns {row: drawn review} for the rows whose wording was drawn again.
+        Without a uniqueness target nothing is drawn again and the whole block
+        is checked at once; with one, the keys of the block are computed at
+        once and the rows are checked in order.
+        """
+        if self.uniqueness_target is None:
+            self.deduplicator.classify_and_keep_block(texts)
+            return {}
+        
+        aspect_keys = list(self.aspect_mappings)
+        redrawn = {}
+        for row, (text, ids, keys) in enumerate(zip(texts, aspect_ids.tolist(),
+                                                     self.deduplicator.block_keys(texts))):
+            drawn = (text,)
+            result = self._deduplicate([aspect_keys[i] for i in ids if i >= 0], drawn, rng, keys)
+            if result is not drawn:
+                redrawn[row] = result
+        return redrawn
+    
+    def dedup_stats(self):
+        """Duplicate counts and rates of the last run, or None without a dedup stage"""
+        if self.deduplicator is not None:
+            return self.deduplicator.stats()
+        if self._shard_dedup_counts is not None:
+            return _dedup_rates(self._shard_dedup_counts)
+        return None
+    
+    def pipeline_stats(self):
+        """Writer pipeline stalls of the last run, or None when parts were written inline"""
+        return self.pipeline.stats() if self.pipeline is not None else None
+    
+    def profile_report(self):
+        """Stage timings of the profiled runs so far, or None when profiling is off"""
+        return self.profiler.report() if self.profiler is not None else None
+    
+    def _stage(self, name):
+        """Time a block as a stage of a profiled run, doing nothing otherwise"""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(name)
+    
+    def iter_balanced_dataset(self, total_reviews=750000, start_id=1, aspect_targets=None, verbose=True,
+                              progress=None, resume=None):
+        """Yield balanced reviews one at a time instead of building the whole list
+        
+        aspect_targets overrides the even per-aspect quota, which lets a shard
+        cover its share of a larger run's quotas. progress is an optional
+        ProgressReporter advanced as reviews are generated. resume is a state
+        from checkpoint_state; the run then continues right after it.
+        
+        The unique engine has no aspect quotas and ignores aspect_targets; see
+        _iter_unique_reviews.
+        """
+        if resume is not None and resume["engine"] != self.engine:
+            raise ValueError(f"The checkpoint was written by the {resume['engine']} engine")
+        if self.engine == "unique":
+            yield from self._iter_unique_reviews(total_reviews, start_id, verbose, progress, resume)
+            return
+        
+        target_per_aspect = total_reviews // len(self.aspect_mappings)
+        if aspect_targets is None:
+            aspect_targets = {key: target_per_aspect for key in self.aspect_mappings}
+        scheduler = AspectQuotaScheduler(aspect_targets, self.rng)
+        if self.profiler is not None:
+            self.profiler.instrument(scheduler, {"draw": "Aspect scheduling", "draw_block": "Aspect scheduling"})
+        if resume is not None:
+            scheduler.set_state(resume["scheduler"])
+        
+        if verbose:
+            print(f"Generating {total_reviews:,} reviews with balanced aspect distribution...")
+            print(f"Target per aspect: {target_per_aspect:,}")
+            if resume is not None:
+                print(f"Resuming after {resume['generated']:,} reviews")
+        
+        self.deduplicator = None
+        if self.dedup is not None:
+            self.deduplicator = ReviewDeduplicator(total_reviews, near=self.dedup == "near",
+                                                   uniqueness_target=self.uniqueness_target)
+            if resume is not None:
+                self.deduplicator.set_state(resume["dedup"])
+        
+        if self.engine == "numpy":
+            yield from self._iter_vectorized_reviews(total_reviews, start_id, scheduler, verbose, progress, resume)
+        else:
+            yield from self._iter_reviews(total_reviews, start_id, scheduler, verbose, progress, resume)
+        
+        if verbose:
+            print("Final aspect distribution:")
+            for key, count in sorted(scheduler.counts.items()):
+                print(f"  {key}: {count:,}")
+            if self.deduplicator is not None:
+                print(f"  {_format_dedup_stats(self.deduplicator.stats())}")
+    
+    def _iter_reviews(self, total_reviews, start_id, scheduler, verbose, progress=None, resume=None):
+        """Build reviews one at a time, drawing each choice separately"""
+        first = 1
+        if resume is not None:
+            self.rng.setstate(_rng_state_from_json(resume["rng"]))
+            first = resume["generated"] + 1
+        self._resume_point = {"engine": "python", "scheduler": scheduler}
+        
+        for i in range(first, total_reviews + 1):
+            # Pick aspects, preferring those that still need more representation
+            aspect_keys = scheduler.draw()
+            
+            # Generate review
+            drawn = self._draw_review(aspect_keys, self.rng)
+            if self.deduplicator is not None:
+                drawn = self._deduplicate(aspect_keys, drawn, self.rng)
+            review_text, display_aspects, problems, structure_id = drawn
+            
+            review = {
+                "review_id": start_id + i - 1,
+                "review_text": review_text,
+                "aspects": display_aspects,
+                "problems": problems
+            }
+            if self.include_structure_id:
+                review["structure_id"] = structure_id
+            yield review
+            
+            if verbose and i % 50000 == 0:
+                print(f"Generated {i:,} reviews...")
+            if progress is not None and i >= progress.next_report:
+                progress.advance(i)
+    
+    def _space(self):
+        """Per-aspect choices and their symmetric sums, computed once for the unique engine"""
+        return self.templates.derived("review_space", self._compute_space)
+    
+    def _compute_space(self):
+        # Some aspects share a synonym and a problem, e.g. "odor" for both
+        # smoke and smell; each such pair belongs to the first aspect only
+        seen = set()
+        pairs = []
+        for key in self.aspect_mappings:
+            owned = []
+            for synonym in self.aspect_mappings[key]:
+                for problem in self.problem_templates[key]:
+                    if (synonym, problem) not in seen:
+                        seen.add((synonym, problem))
+                        owned.append((synonym, problem))
+            pairs.append(owned)
+        
+        # Repeated templates, and structures that leave out the aspect or the
+        # problem, would make different choices read the same
+        structures = [
+            (structure_id, compiled) for structure_id, compiled in self._compiled_structures
+            if "{aspect}" in self.review_structures[structure_id]
+            and "{problem}" in self.review_structures[structure_id]
+            and self.review_structures.index(self.review_structures[structure_id]) == structure_id
+        ]
+        # A connector and a complaint structure are one choice, as different
+        # pairs can read the same, e.g. " Also the " + "{aspect}" and
+        # " Also " + "the {aspect}"; only distinct renderings are kept
+        complaints = [
+            _compile_template(complaint, ["aspect", "problem"])
+            for complaint in dict.fromkeys(
+                structure.format(connector=connector, aspect="{aspect}", problem="{problem}")
+                for structure in self.complaint_structures
+                if "{aspect}" in structure and "{problem}" in structure
+                for connector in self.connectors
+            )
+        ]
+        
+        # A review with several aspects may end with any closing remark, or none
+        endings = [None]
+        if self.ending_probability > 0:
+            remarks = [ending for ending in dict.fromkeys(self.realistic_endings) if ending]
+            if self.ending_probability < 1:
+                endings += remarks
+            elif remarks:
+                endings = remarks
+        weights = [len(owned) for owned in pairs]
+        sums = _elementary_symmetric(weights, MAX_ASPECTS)
+        
+        # Where the block of each aspect starts when it comes first, by number of aspects
+        starts = {}
+        for k in range(1, MAX_ASPECTS + 1):
+            starts[k] = [0]
+            for weight in weights[:-1]:
+                block = weight * math.factorial(k - 1) * _sum_without(sums, weight, k - 1)
+                starts[k].append(starts[k][-1] + block)
+        return {"pairs": pairs, "weights": weights, "sums": sums, "starts": starts,
+                "structures": structures, "complaints": complaints, "endings": endings}
+    
+    def capacity(self):
+        """Number of distinct reviews the templates can produce, by number of aspects
+        
+        k distinct aspects in order, each with one of its synonym and problem
+        pairs, can be picked in k! * e_k ways, where e_k is the elementary
+        symmetric polynomial of the per-aspect pair counts. That is multiplied
+        by the choices of opening structure, of connector and structure for
+        every further complaint, and of ending. A pair two aspects share, a
+        template listed twice and a connector and structure that render like
+        another pair are counted once, and structures that leave out the
+        aspect or the problem are not used, so different combinations give
+        different reviews.
+        """
+        space = self._space()
+        capacity = {}
+        for k in range(1, MAX_ASPECTS + 1):
+            combinations = math.factorial(k) * space["sums"][k] * len(space["structures"])
+            if k > 1:
+                combinations *= len(space["complaints"]) ** (k - 1)
+                combinations *= len(space["endings"])
+            capacity[k] = combinations
+        return capacity
+    
+    def unique_quotas(self, total_reviews):
+        """Split a unique run between 1, 2 and 3 aspect reviews
+        
+        Each aspect count gets an equal share, as the other engines draw the
+        count uniformly, and a count with fewer combinations than its share
+        passes the rest on to the larger ones.
+        """
+        capacity = self.capacity()
+        if total_reviews > sum(capacity.values()):
+            raise ValueError(f"The templates allow only {sum(capacity.values())} distinct reviews")
+        quotas = {}
+        remaining = total_reviews
+        for i, k in enumerate(sorted(capacity, key=capacity.get)):
+            quotas[k] = min(remaining // (len(capacity) - i), capacity[k])
+            remaining -= quotas[k]
+        return [quotas[k] for k in sorted(quotas)]
+    
+    def _unrank_review(self, num_aspects, rank):
+        """The review of a given rank among the capacity()[num_aspects] combinations
+        
+        The rank is read as a mixed-radix number: the opening structure, the
+        connector and structure of every further complaint and the ending
+        come first, then the aspects in order. The block of an aspect is its
+        weight times the number of ways to fill the remaining positions from
+        the aspects not yet taken, which the symmetric sums give without
+        enumerating them.
+        """
+        space = self._space()
+        rank, structure = divmod(rank, len(space["structures"]))
+        structure_id, structure = space["structures"][structure]
+        complaints = []
+        for _ in range(num_aspects - 1):
+            rank, complaint = divmod(rank, len(space["complaints"]))
+            complaints.append(space["complaints"][complaint])
+        ending = None
+        if num_aspects > 1:
+            rank, ending = divmod(rank, len(space["endings"]))
+            ending = space["endings"][ending]
+        
+        pairs, weights, sums = space["pairs"], space["weights"], space["sums"]
+        taken = []
+        display_aspects, problems = [], []
+        for position in range(num_aspects):
+            rest = num_aspects - position - 1
+            rest_factorial = math.factorial(rest)
+            if position == 0:
+                starts = space["starts"][num_aspects]
+                index = bisect.bisect_right(starts, rank) - 1
+                rank -= starts[index]
+                weight = weights[index]
+            else:
+                for index, weight in enumerate(weights):
+                    if index in taken:
+                        continue
+                    block = weight * rest_factorial * _sum_without(sums, weight, rest)
+                    if rank < block:
+                        break
+                    rank -= block
+            sums = _without(sums, weight)
+            choice, rank = divmod(rank, rest_factorial * sums[rest])
+            taken.append(index)
+            
+            synonym, problem = pairs[index][choice]
+            display_aspects.append(synonym)
+            problems.append(problem)
+        
+        review_text = _render_template(structure, (display_aspects[0], problems[0]))
+        for complaint, aspect, problem in zip(complaints, display_aspects[1:], problems[1:]):
+            review_text += _render_template(complaint, (aspect, problem))
+        if ending is not None:
+            review_text += ending
+        return self._limit_review_length(review_text), display_aspects, problems, structure_id
+    
+    def _iter_unique_reviews(self, total_reviews, start_id, verbose, progress=None, resume=None):
+        """Build reviews from distinct ranks, so that no two repeat a combination
+        
+        Review j of a run is a pure function of the run's key and j. A Feistel
+        permutation of the run's positions picks its aspect count and its
+        place in that count's quota, and a Feistel permutation of the count's
+        capacity turns that place into a rank. Nothing is kept between
+        reviews. Aspects turn up in proportion to their number of synonym
+        and problem pairs instead of being balanced.
+        """
+        quotas = self.unique_quotas(total_reviews)
+        capacity = self.capacity()
+        key = resume["key"] if resume is not None else self.rng.getrandbits(64)
+        self._resume_point = {"engine": "unique", "key": key}
+        order = FeistelPermutation(total_reviews, key)
+        ranks = [FeistelPermutation(capacity[k], f"{key}:{k}") for k in range(1, MAX_ASPECTS + 1)]
+        
+        if verbose:
+            print(f"Generating {total_reviews:,} unique reviews...")
+            print("Reviews by number of aspects: " +
+                  ", ".join(f"{quota:,}/{capacity[k]:,}" for k, quota in zip(capacity, quotas)))
+            if resume is not None:
+                print(f"Resuming after {resume['generated']:,} reviews")
+        
+        first = resume["generated"] + 1 if resume is not None else 1
+        for i in range(first, total_reviews + 1):
+            position = order(i - 1)
+            num_aspects = 1
+            while position >= quotas[num_aspects - 1]:
+                position -= quotas[num_aspects - 1]
+                num_aspects += 1
+            review_text, display_aspects, problems, structure_id = self._unrank_review(
+                num_aspects, ranks[num_aspects - 1](position))
+            
+            review = {
+                "review_id": start_id + i - 1,
+                "review_text": review_text,
+                "aspects": display_aspects,
+                "problems": problems
+            }
+            if self.include_structure_id:
+                review["structure_id"] = structure_id
+            yield review
+            
+            if verbose and i % 50000 == 0:
+                print(f"Generated {i:,} reviews...")
+            if progress is not None and i >= progress.next_report:
+                progress.advance(i)
+    
+    def _build_batch_tables(self):
+        """Integer-encode the template tables once for the vectorized engine"""
+        return self.templates.derived("batch_tables", self._compute_batch_tables)
+    
+    def _compute_batch_tables(self):
+        synonyms, synonym_offsets, synonym_counts = [], [], []
+        problems, problem_offsets, problem_counts = [], [], []
+        for key in self.aspect_mappings:
+            synonym_offsets.append(len(synonyms))
+            synonym_counts.append(len(self.aspect_mappings[key]))
+            synonyms.extend(self.aspect_mappings[key])
+            problem_offsets.append(len(problems))
+            problem_counts.append(len(self.problem_templates[key]))
+            problems.extend(self.problem_templates[key])
+        
+        return {
+            "synonyms": _object_array(synonyms),
+            "synonym_spaces": np.array([text.count(" ") for text in synonyms]),
+            "synonym_offsets": np.array(synonym_offsets),
+            "synonym_counts": np.array(synonym_counts),
+            "problems": _object_array(problems),
+            "problem_spaces": np.array([text.count(" ") for text in problems]),
+            "problem_offsets": np.array(problem_offsets),
+            "problem_counts": np.array(problem_counts),
+            "connectors": _object_array(self.connectors),
+            "connector_spaces": np.array([text.count(" ") for text in self.connectors]),
+            "endings": _object_array(self.realistic_endings),
+            "ending_spaces": np.array([text.count(" ") for text in self.realistic_endings]),
+            "structures": _compile_template_columns(self.review_structures, ["aspect", "problem"]),
+            "complaints": _compile_template_columns(self.complaint_structures, ["connector", "aspect", "problem"]),
+        }
+    
+    def _iter_vectorized_reviews(self, total_reviews, start_id, scheduler, verbose, progress=None, resume=None):
+        """Build reviews from index arrays drawn for a whole batch at once
+        
+        Every random choice of a batch is drawn with NumPy against the
+        integer-encoded tables and the texts are concatenated column-wise, so
+        the only per-review Python work is slicing and building the dict.
+        """
+        tables = self._build_batch_tables()
+        if resume is not None:
+            # Redraw the block the checkpoint fell in and skip what was already written
+            np_rng = np.random.default_rng()
+            np_rng.bit_generator.state = resume["np_rng"]
+            generated = resume["block_start"]
+            skip = resume["generated"] - generated
+        else:
+            np_rng = np.random.default_rng(self.rng.getrandbits(64))
+            generated = 0
+            skip = 0
+        
+        review_id = start_id + generated
+        while generated < total_reviews:
+            size = min(self.batch_size, total_reviews - generated)
+            self._resume_point = {"engine": "numpy", "block_start": generated,
+                                  "np_rng": np_rng.bit_generator.state, "scheduler": scheduler.get_state()}
+            if self.deduplicator is not None:
+                self._resume_point["dedup"] = self.deduplicator.get_state()
+            
+            aspect_ids = scheduler.draw_block(np_rng, size)
+            with self._stage("Text assembly"):
+                num_aspects = (aspect_ids >= 0).sum(axis=1)
+                safe_ids = np.maximum(aspect_ids, 0)
+                synonym_ids = tables["synonym_offsets"][safe_ids] + (
+                    np_rng.random((size, 3)) * tables["synonym_counts"][safe_ids]).astype(np.int64)
+                problem_ids = tables["problem_offsets"][safe_ids] + (
+                    np_rng.random((size, 3)) * tables["problem_counts"][safe_ids]).astype(np.int64)
+                aspect_texts = tables["synonyms"][synonym_ids]
+                aspect_spaces = tables["synonym_spaces"][synonym_ids]
+                problem_texts = tables["problems"][problem_ids]
+                problem_spaces = tables["problem_spaces"][problem_ids]
+                
+                # First complaint uses a full review structure
+                structure_ids = np_rng.integers(0, len(self.review_structures), size)
+                texts, spaces = _assemble_columns(
+                    tables["structures"], structure_ids,
+                    {"aspect": aspect_texts[:, 0], "problem": problem_texts[:, 0]},
+                    {"aspect": aspect_spaces[:, 0], "problem": problem_spaces[:, 0]})
+                
+                # Remaining complaints are joined with a connector
+                for j in (1, 2):
+                    rows = np.flatnonzero(num_aspects > j)
+                    connector_ids = np_rng.integers(0, len(self.connectors), len(rows))
+                    complaint_ids = np_rng.integers(0, len(self.complaint_structures), len(rows))
+                    parts, part_spaces = _assemble_columns(
+                        tables["complaints"], complaint_ids,
+                        {"connector": tables["connectors"][connector_ids],
+                         "aspect": aspect_texts[rows, j], "problem": problem_texts[rows, j]},
+                        {"connector": tables["connector_spaces"][connector_ids],
+                         "aspect": aspect_spaces[rows, j], "problem": problem_spaces[rows, j]})
+                    texts[rows] = texts[rows] + parts
+                    spaces[rows] += part_spaces
+                
+                if self.realistic_endings:
+                    rows = np.flatnonzero((num_aspects > 1) & (np_rng.random(size) < self.ending_probability))
+                    ending_ids = np_rng.integers(0, len(self.realistic_endings), len(rows))
+                    texts[rows] = texts[rows] + tables["endings"][ending_ids]
+                    spaces[rows] += tables["ending_spaces"][ending_ids]
+            
+            # Ensure reviews don't exceed 60 tokens; fewer than 60 spaces means they can't
+            with self._stage("Length limit"):
+                texts = texts.tolist()
+                for row in np.flatnonzero(spaces >= 60).tolist():
+                    words = texts[row].split()
+                    if len(words) > 60:
+                        texts[row] = " ".join(words[:60])
+                        if not texts[row].endswith('.'):
+                            texts[row] += "."
+            
+            # Rows the dedup stage drew again are worded one at a time
+            redrawn = {}
+            if self.deduplicator is not None:
+                redrawn = self._deduplicate_block(texts, aspect_ids, random.Random(int(np_rng.integers(2 ** 63))))
+            
+            # Building a block of acyclic dicts with the collector paused
+            # avoids repeated full collections over the growing block
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                reviews = [
+                    {
+                        "review_id": row_id,
+                        "review_text": review_text,
+                        "aspects": aspects[:count],
+                        "problems": problems[:count]
+                    }
+                    for row_id, review_text, aspects, problems, count in zip(
+                        range(review_id, review_id + size), texts, aspect_texts.tolist(),
+                        problem_texts.tolist(), num_aspects.tolist())
+                ]
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            
+            if self.include_structure_id:
+                for review, structure_id in zip(reviews, structure_ids.tolist()):
+                    review["structure_id"] = structure_id
+            for row, (review_text, aspects, problems, structure_id) in redrawn.items():
+                reviews[row].update(review_text=review_text, aspects=aspects, problems=problems)
+                if self.include_structure_id:
+                    reviews[row]["structure_id"] = structure_id
+            
+            yield from reviews[skip:] if skip else reviews
+            del reviews
+            skip = 0
+            review_id += size
+            generated += size
+            if verbose:
+                print(f"Generated {generated:,} reviews...")
+            if progress is not None:
+                progress.advance(generated)
+    
+    def checkpoint_state(self, generated):
+        """State needed to resume the current run after its first `generated` reviews
+        
+        Only valid while the review iterator is paused right after yielding
+        review number `generated`, which is when a part file gets written.
+        The numpy engine saves the start of the current block instead, and a
+        resumed run redraws that block.
+        """
+        point = self._resume_point
+        if point["engine"] == "python":
+            state = {"engine": "python", "generated": generated, "rng": self.rng.getstate(),
+                     "scheduler": point["scheduler"].get_state()}
+            if self.deduplicator is not None:
+                state["dedup"] = self.deduplicator.get_state()
+            return state
+        return dict(point, generated=generated)
+    
+    def run_settings(self, total_reviews, chunk_size, output_format, compression, sharded):
+        """Settings a checkpoint must have been written with to be resumed"""
+        return {"total_reviews": total_reviews, "chunk_size": chunk_size, "output_format": output_format,
+                "compression": compression, "engine": self.engine, "batch_size": self.batch_size,
+                "include_structure_id": self.include_structure_id, "dedup": self.dedup,
+                "uniqueness_target": self.uniqueness_target, "templates": self.templates.name, "sharded": sharded}
+    
+    def _check_resume(self, checkpoint, settings):
+        if checkpoint["settings"] != settings:
+            raise ValueError("The checkpoint was written by a run with different settings")
+    
+    def generate_balanced_dataset(self, total_reviews=750000):
+        """Generate balanced dataset ensuring all aspects get fair representation"""
+        return list(self.iter_balanced_dataset(total_reviews))
+    
+    def part_filename(self, part_number, total_chunks, output_format="json", compression=None):
+        """Name of a part file for the given output format and compression"""
+        extension = OUTPUT_FORMATS[output_format]
+        if output_format not in COLUMNAR_FORMATS:
+            extension += COMPRESSIONS[compression]
+        return f"negative_hotel_reviews_part_{part_number:02d}_of_{total_chunks:02d}{extension}"
+    
+    def _write_part(self, chunk, part_number, total_chunks, output_dir, output_format="json", compression=None):
+        """Write one part file and return its path
+        
+        "json" writes the part as one indented array, "jsonl" writes one compact
+        review per line so consumers can parse it as a stream. "parquet" and
+        "arrow" write a columnar table, see _write_columnar_part.
+        
+        The part is written next to its final name and moved into place, so a
+        part file is never half written and an existing file, which may be
+        hard-linked elsewhere, is replaced rather than overwritten.
+        """
+        filename = self.part_filename(part_number, total_chunks, output_format, compression)
+        filepath = os.path.join(output_dir, filename)
+        tmp_path = filepath + ".tmp"
+        
+        if output_format in COLUMNAR_FORMATS:
+            self._write_columnar_part(chunk, tmp_path, output_format, compression)
+        elif output_format == "jsonl":
+            with _open_part_file(tmp_path, compression) as f:
+                f.write(self.serializer.dumps_lines(chunk))
+        else:
+            with _open_part_file(tmp_path, compression) as f:
+                f.write(self.serializer.dumps_indented(chunk))
+        os.replace(tmp_path, filepath)
+        
+        print(f"  Saved {filename} with {len(chunk):,} reviews")
+        return filepath
+    
+    def _build_vocabularies(self):
+        """Fixed aspect and problem vocabularies shared by every columnar part"""
+        return self.templates.derived("vocabularies", self._compute_vocabularies)
+    
+    def _compute_vocabularies(self):
+        aspects = list(dict.fromkeys(
+            synonym for synonyms in self.aspect_mappings.values() for synonym in synonyms))
+        problems = list(dict.fromkeys(
+            problem for templates in self.problem_templates.values() for problem in templates))
+        return {
+            "aspects": (pa.array(aspects, pa.string()), {text: i for i, text in enumerate(aspects)}),
+            "problems": (pa.array(problems, pa.string()), {text: i for i, text in enumerate(problems)}),
+        }
+    
+    def _columnar_table(self, chunk):
+        """Convert a chunk of reviews into an Arrow table
+        
+        Aspects and problems become list columns of dictionary indices into
+        the fixed vocabularies, so every part shares the same dictionaries.
+        """
+        vocabularies = self._build_vocabularies()
+        offsets = [0]
+        for review in chunk:
+            offsets.append(offsets[-1] + len(review["aspects"]))
+        offsets = pa.array(offsets, pa.int32())
+        
+        columns = {
+            "review_id": pa.array([review["review_id"] for review in chunk], pa.int64()),
+            "review_text": pa.array([review["review_text"] for review in chunk], pa.string()),
+        }
+        for name in ("aspects", "problems"):
+            dictionary, index = vocabularies[name]
+            indices = pa.array([index[text] for review in chunk for text in review[name]], pa.int16())
+            columns[name] = pa.ListArray.from_arrays(
+                offsets, pa.DictionaryArray.from_arrays(indices, dictionary))
+        if chunk and "structure_id" in chunk[0]:
+            columns["structure_id"] = pa.array([review["structure_id"] for review in chunk], pa.int16())
+        return pa.table(columns)
+    
+    def _write_columnar_part(self, chunk, filepath, output_format, compression=None):
+        """Write a chunk as a Parquet file or an Arrow IPC file"""
+        table = self._columnar_table(chunk)
+        if output_format == "parquet":
+            pq.write_table(table, filepath, compression=compression or "none")
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            with pa.OSFile(filepath, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                    writer.write_table(table)
+    
+    def stream_and_save_dataset(self, reviews, total_reviews, chunk_size=50000, output_dir="dataset_parts",
+                                output_format="json", compression=None, progress=None,
+                                checkpoint=False, resume_from=None, writers=0):
+        """Consume an iterable of reviews and write each part as soon as it is full
+        
+        Only the chunk currently being filled is kept in memory, so peak memory
+        depends on chunk_size rather than total_reviews. The time spent writing
+        is added to progress, if given, as the "Writing parts" phase.
+        
+        With writers, parts are serialized and written by that many threads
+        while the next chunk is generated, see WritePipeline; up to
+        2 * writers finished chunks then wait in memory. Their stalls are
+        reported by pipeline_stats.
+        
+        With checkpoint, a checkpoint is saved after every part. resume_from is
+        such a checkpoint; its parts are kept and numbering continues after
+        them, while reviews must come from iter_balanced_dataset resumed from
+        the same checkpoint.
+        """
+        _check_output_options(output_format, compression)
+        if writers < 0:
+            raise ValueError("The number of writer threads can't be negative")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        settings = self.run_settings(total_reviews, chunk_size, output_format, compression, sharded=False)
+        if resume_from is not None:
+            self._check_resume(resume_from, settings)
+        
+        total_chunks = math.ceil(total_reviews / chunk_size)
+        file_paths = list(resume_from["files"]) if resume_from is not None else []
+        first_part = len(file_paths) + 1
+        chunk = []
+        # Parts written out of order wait here for the parts before them
+        finished = {}
+        lock = threading.Lock()
+        
+        def write(part):
+            part_number, chunk, state = part
+            started = time.perf_counter()
+            filepath = self._write_part(chunk, part_number, total_chunks, output_dir, output_format, compression)
+            with lock:
+                finished[part_number] = filepath, state
+                # A checkpoint only covers the unbroken run of parts from the first
+                while len(file_paths) + 1 in finished:
+                    filepath, state = finished.pop(len(file_paths) + 1)
+                    file_paths.append(filepath)
+                    if checkpoint:
+                        save_checkpoint(output_dir, {"settings": settings, "files": file_paths, "generator": state})
+                if progress is not None:
+                    progress.add_time("Writing parts", time.perf_counter() - started)
+        
+        def submit(part_number, chunk):
+            # The generator's state must be read while it is paused right after this chunk
+            generated = (part_number - 1) * chunk_size + len(chunk)
+            part = (part_number, chunk, self.checkpoint_state(generated) if checkpoint else None)
+            if self.pipeline is not None:
+                self.pipeline.submit(part)
+            else:
+                write(part)
+        
+        print(f"\nStreaming {total_reviews:,} reviews into {total_chunks} files...")
+        
+        self.pipeline = WritePipeline(write, writers) if writers else None
+        with self.pipeline or contextlib.nullcontext():
+            part_number = first_part
+            for review in reviews:
+                chunk.append(review)
+                if len(chunk) == chunk_size:
+                    submit(part_number, chunk)
+                    part_number += 1
+                    chunk = []
+            
+            if chunk:
+                submit(part_number, chunk)
+        
+        return file_paths
+    
+    def split_and_save_dataset(self, reviews, chunk_size=50000, output_dir="dataset_parts",
+                               output_format="json", compression=None):
+        """Split dataset into parts and save as JSON files"""
+        print(f"\nSplitting {len(reviews):,} reviews into {math.ceil(len(reviews) / chunk_size)} files...")
+        return self.stream_and_save_dataset(reviews, len(reviews), chunk_size, output_dir,
+                                            output_format, compression)
+    
+    def split_aspect_targets(self, total_reviews, shard_sizes):
+        """Divide the per-aspect quotas of a whole run between shards
+        
+        Each shard gets a share proportional to its size, and the shares of
+        every aspect add up exactly to total_reviews // number of aspects.
+        """
+        target_per_aspect = total_reviews // len(self.aspect_mappings)
+        shard_targets = []
+        start = 0
+        for size in shard_sizes:
+            end = start + size
+            share = target_per_aspect * end // total_reviews - target_per_aspect * start // total_reviews
+            shard_targets.append({key: share for key in self.aspect_mappings})
+            start = end
+        return shard_targets
+    
+    def generate_sharded_dataset(self, total_reviews=750000, chunk_size=50000, output_dir="dataset_parts",
+                                 workers=None, seed=None, output_format="json", compression=None,
+                                 progress_callback=None, checkpoint=False, resume_from=None):
+        """Generate every part file in a process pool, one part per task
+        
+        Each shard draws from its own seed derived from seed, so a run is
+        repeatable for a given seed and chunk_size. progress_callback, if
+        given, is called with the number of reviews written so far each time
+        a part finishes.
+        
+        With checkpoint, the finished parts are saved to a checkpoint as they
+        complete. resume_from is such a checkpoint; its parts are kept and
+        only the missing ones are generated, from the same seed.
+        """
+        _check_output_options(output_format, compression)
+        if self.engine == "unique":
+            raise ValueError("The unique engine draws a whole run from one permutation and can't be sharded")
+        if self.profile in ("cprofile", "tracemalloc"):
+            raise ValueError(f"A {self.profile} capture only covers one process; profile sharded runs with stages")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        settings = self.run_settings(total_reviews, chunk_size, output_format, compression, sharded=True)
+        parts = {}
+        if resume_from is not None:
+            self._check_resume(resume_from, settings)
+            seed = resume_from["seed"]
+            parts = {int(part_number): path for part_number, path in resume_from["parts"].items()}
+        
+        # Each shard deduplicates its own reviews; their counts add up here
+        self.deduplicator = None
+        self._shard_dedup_counts = None
+        if self.dedup is not None:
+            self._shard_dedup_counts = dict(resume_from["dedup"]) if resume_from else dict.fromkeys(DEDUP_COUNTERS, 0)
+        
+        total_chunks = math.ceil(total_reviews / chunk_size)
+        shard_sizes = [min(chunk_size, total_reviews - i * chunk_size) for i in range(total_chunks)]
+        shard_targets = self.split_aspect_targets(total_reviews, shard_sizes)
+        
+        if seed is None:
+            seed = self.seed if self.seed is not None else self.rng.randrange(2 ** 32)
+        seeder = random.Random(seed)
+        shard_seeds = [seeder.getrandbits(64) for _ in range(total_chunks)]
+        
+        print(f"Generating {total_reviews:,} reviews in {total_chunks} shards (seed {seed})...")
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_generate_shard, i + 1, total_chunks, i * chunk_size + 1, shard_sizes[i],
+                            shard_targets[i], shard_seeds[i], output_dir, self.engine, self.batch_size,
+                            output_format, compression, self.include_structure_id, self.dedup,
+                            self.uniqueness_target, self.profile, self.templates.name,
+                            self.serializer.backend, self.serializer.compat): i + 1
+                for i in range(total_chunks) if i + 1 not in parts
+            }
+            try:
+                written = sum(shard_sizes[part_number - 1] for part_number in parts)
+                for future in as_completed(futures):
+                    part_number = futures[future]
+                    parts[part_number], dedup_counts, stages = future.result()
+                    written += shard_sizes[part_number - 1]
+                    if dedup_counts is not None:
+                        for name, count in dedup_counts.items():
+                            self._shard_dedup_counts[name] += count
+                    if stages is not None:
+                        self.profiler.merge(stages)
+                    if checkpoint:
+                        save_checkpoint(output_dir, {"settings": settings, "seed": seed,
+                                                     "parts": {str(n): path for n, path in sorted(parts.items())},
+                                                     "dedup": self._shard_dedup_counts})
+                    if progress_callback is not None:
+                        progress_callback(written)
+                return [parts[part_number] for part_number in range(1, total_chunks + 1)]
+            except BaseException:
+                # Don't start the remaining shards when the run is abandoned
+                for future in futures:
+                    future.cancel()
+                raise
+    
+    def generate_readme(self, total_reviews, num_files, output_dir="dataset_parts",
+                        output_format="json", compression=None):
+        """Generate README file for the dataset"""
+        format_name = {
+            "json": "JSON",
+            "jsonl": "JSON Lines (one review per line)",
+            "parquet": "Parquet (aspects and problems dictionary-encoded)",
+            "arrow": "Arrow IPC file (aspects and problems dictionary-encoded)",
+        }[output_format]
+        if compression:
+            format_name += f", {compression} compressed"
+        
+        readme_content = f"""# Negative Hotel Reviews Dataset
+
+## Overview
+This dataset contains {total_reviews:,} negative hotel reviews specifically designed for commercial AI training and analysis.
+
+## Dataset Characteristics
+- **Total Reviews**: {total_reviews:,}
+- **Format**: {format_name}
+- **Language**: English
+- **Review Length**: Maximum 60 tokens per review
+- **Balance**: Comprehensive coverage of all hotel aspects with synonyms
+
+## Dataset Structure
+Each review contains:
+- `review_id`: Unique identifier
+- `review_text`: The actual review text
+- `aspects`: List of hotel aspects mentioned
+- `problems`: List of specific problems identified
+
+## Hotel Aspects Covered
+The dataset covers all major hotel aspects with natural language variations:
+- Accommodation: rooms, suites, quarters
+- Facilities: bathrooms (wc, toilet), shower, pool, gym, fitness
+- Amenities: wifi (wi-fi, internet), air conditioning (ac, air con), tv, minibar
+- Service: staff, reception, housekeeping, cleaning
+- Dining: restaurant, breakfast, bar, food, drinks
+- Comfort: bed, pillows, blankets, carpet, towels
+- Environment: noise, smell, temperature, view
+- Value: price, extra charges, extra fees
+
+## Files
+The dataset is split into {num_files} parts for easy download and processing:
+"""
+        
+        for i in range(1, num_files + 1):
+            readme_content += f"- `{self.part_filename(i, num_files, output_format, compression)}`\n"
+        
+        dedup_stats = self.dedup_stats()
+        duplicates = ""
+        if dedup_stats is not None:
+            duplicates = (f"- Duplicate texts: {dedup_stats['exact_rate']:.2%} exact, "
+                          f"{dedup_stats['near_rate']:.2%} near duplicates\n")
+        
+        readme_content += f"""
+## Quality Assurance
+- Balanced representation across all hotel aspects
+- Natural language variations and synonyms
+- Realistic negative review patterns
+- Commercial-grade quality for AI training
+{duplicates}
+## Usage
+This dataset is designed for:
+- Sentiment analysis training
+- Aspect-based opinion mining
+- Hotel service improvement analysis
+- Natural language processing research
+
+## Generated
+Dataset generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Total aspects covered: {len(self.aspect_mappings)}
+"""
+        
+        readme_path = os.path.join(output_dir, "README.md")
+        with open(readme_path + ".tmp", 'w', encoding='utf-8') as f:
+            f.write(readme_content)
+        os.replace(readme_path + ".tmp", readme_path)
+        
+        return readme_path
+
+def _generate_shard(part_number, total_chunks, start_id, shard_reviews, aspect_targets, shard_seed, output_dir,
+                    engine="python", batch_size=100000, output_format="json", compression=None,
+                    include_structure_id=False, dedup=None, uniqueness_target=None, profile=None,
+                    templates="standard", serializer=None, json_compat=False):
+    """Generate and write a single part file inside a worker process
+    
+    Returns the path of the part, the counters of its dedup stage and the
+    totals of its profiled stages, the last two None when they are off.
+    """
+    generator = HotelReviewDatasetGenerator(seed=shard_seed, engine=engine, batch_size=batch_size,
+                                            include_structure_id=include_structure_id, dedup=dedup,
+                                            uniqueness_target=uniqueness_target, profile=profile,
+                                            templates=templates, serializer=serializer,
+                                            json_compat=json_compat)
+    reviews = list(generator.iter_balanced_dataset(shard_reviews, start_id, aspect_targets, verbose=False))
+    filepath = generator._write_part(reviews, part_number, total_chunks, output_dir, output_format, compression)
+    return (filepath, generator.deduplicator.counts if generator.deduplicator is not None else None,
+            generator.profiler.stages if generator.profiler is not None else None)
@@ -0,0 +1,164 @@
+import contextlib
+import time
+
+from .generator import HotelReviewDatasetGenerator
+from .output import clear_checkpoint, load_checkpoint
+
+class GenerationCancelled(Exception):
+    """Raised inside a run when its job has been asked to stop"""
+
+class ProgressReporter:
+    """Publish the progress of a run through a callback every `interval` reviews
+    
+    Each report is a plain dict with the reviews done so far, the current
+    phase, the seconds spent in each phase, the rate and an ETA, so the
+    receiving side only has to merge it into its status.
+    """
+    
+    def __init__(self, total, callback, interval=10000, start=0):
+        self.total = total
+        self.callback = callback
+        self.interval = max(1, interval)
+        # A resumed run starts part way, and only what it generates counts towards the rate
+        self.start = start
+        self.progress = start
+        self.next_report = (start // self.interval + 1) * self.interval
+        self.started = time.perf_counter()
+        self.phase = None
+        self.phase_started = self.started
+        self.phase_timings = {}
+        # Optional callable returning the duplicate counts and rates so far
+        self.dedup_stats = None
+        # Optional callable returning the profiled stage timings so far
+        self.profile = None
+        # Optional callable returning the stalls of the part writer threads so far
+        self.pipeline = None
+    
+    def start_phase(self, name):
+        """Close the current phase and report the start of the next one"""
+        now = time.perf_counter()
+        if self.phase is not None:
+            self.add_time(self.phase, now - self.phase_started)
+        self.phase = name
+        self.phase_started = now
+        self.report()
+    
+    def add_time(self, name, seconds):
+        """Add seconds to a named phase, also for work timed inside another phase"""
+        self.phase_timings[name] = self.phase_timings.get(name, 0.0) + seconds
+    
+    def advance(self, progress):
+        """Record how many reviews are done, reporting once per interval"""
+        self.progress = progress
+        if progress >= self.next_report:
+            self.next_report = (progress // self.interval + 1) * self.interval
+            self.report()
+    
+    def snapshot(self):
+        now = time.perf_counter()
+        elapsed = now - self.started
+        rate = (self.progress - self.start) / elapsed if elapsed > 0 else 0.0
+        phase_timings = dict(self.phase_timings)
+        if self.phase is not None:
+            phase_timings[self.phase] = phase_timings.get(self.phase, 0.0) + now - self.phase_started
+        snapshot = {
+            "progress": self.progress,
+            "total": self.total,
+            "current_phase": self.phase or "",
+            "elapsed_seconds": round(elapsed, 3),
+            "reviews_per_second": round(rate, 1),
+            "eta_seconds": round((self.total - self.progress) / rate, 1) if rate > 0 else None,
+            "phase_timings": {name: round(seconds, 3) for name, seconds in phase_timings.items()},
+        }
+        if self.dedup_stats is not None:
+            snapshot["duplicates"] = self.dedup_stats()
+        if self.profile is not None:
+            snapshot["profile"] = self.profile()
+        if self.pipeline is not None:
+            snapshot["pipeline"] = self.pipeline()
+        return snapshot
+    
+    def report(self):
+        self.callback(self.snapshot())
+    
+    def finish(self, phase="Completed"):
+        """Close the current phase and send a final report"""
+        if self.phase is not None:
+            self.add_time(self.phase, time.perf_counter() - self.phase_started)
+        self.phase = None
+        self.progress = self.total
+        self.callback(dict(self.snapshot(), current_phase=phase, eta_seconds=0.0))
+
+def run_generation_job(params, progress_queue, cancel_event=None):
+    """Run one generation request in a worker process and return the files written
+    
+    params holds the fields of a DatasetGenerationRequest. Progress reports
+    are put on progress_queue as dicts that the server merges into its status.
+    cancel_event is checked at every report, and GenerationCancelled is
+    raised once it is set. A checkpoint is kept in the output directory after
+    every part, so with params["resume"] a cancelled or crashed run continues
+    from its last finished part.
+    """
+    def report(status):
+        if cancel_event is not None and cancel_event.is_set():
+            raise GenerationCancelled("Generation cancelled")
+        progress_queue.put(status)
+    
+    total_reviews = params["total_reviews"]
+    chunk_size = params["chunk_size"]
+    output_dir = params["output_dir"]
+    sharded = params["workers"] > 1
+    
+    # A fresh generator per run so a seeded request is reproducible
+    generator = HotelReviewDatasetGenerator(seed=params["seed"], engine=params["engine"],
+                                            include_structure_id=params["include_structure_id"],
+                                            dedup=params["dedup"], uniqueness_target=params["uniqueness_target"],
+                                            profile=params["profile"], serializer=params["serializer"],
+                                            json_compat=params["json_compat"])
+    
+    checkpoint = load_checkpoint(output_dir) if params["resume"] else None
+    if checkpoint is None:
+        done = 0
+    else:
+        generator._check_resume(checkpoint, generator.run_settings(
+            total_reviews, chunk_size, params["output_format"], params["compression"], sharded))
+        if sharded:
+            done = sum(min(chunk_size, total_reviews - (int(n) - 1) * chunk_size) for n in checkpoint["parts"])
+        else:
+            done = checkpoint["generator"]["generated"]
+    progress = ProgressReporter(total_reviews, report, params["progress_interval"], start=done)
+    if generator.dedup is not None:
+        progress.dedup_stats = generator.dedup_stats
+    if generator.profiler is not None:
+        progress.profile = generator.profile_report
+    if not sharded and params["writer_threads"]:
+        progress.pipeline = generator.pipeline_stats
+    progress.start_phase("Resuming generation" if checkpoint else "Generating reviews")
+    
+    # A profiled run is captured until its last part is written
+    with generator.profiler or contextlib.nullcontext():
+        if sharded:
+            # One part file per worker process
+            file_paths = generator.generate_sharded_dataset(
+                total_reviews, chunk_size, output_dir,
+                workers=params["workers"], output_format=params["output_format"],
+                compression=params["compression"], progress_callback=progress.advance,
+                checkpoint=True, resume_from=checkpoint)
+        else:
+            # Generate the dataset lazily while writer threads write each part as soon as it is full
+            reviews = generator.iter_balanced_dataset(
+                total_reviews, progress=progress, resume=checkpoint["generator"] if checkpoint else None)
+            file_paths = generator.stream_and_save_dataset(
+                reviews, total_reviews, chunk_size, output_dir,
+                params["output_format"], params["compression"], progress=progress,
+                checkpoint=True, resume_from=checkpoint, writers=params["writer_threads"])
+    
+    progress.advance(total_reviews)
+    progress.start_phase("Generating documentation")
+    readme_path = generator.generate_readme(
+        total_reviews, len(file_paths), output_dir,
+        params["output_format"], params["compression"])
+    file_paths.append(readme_path)
+    clear_checkpoint(output_dir)
+    progress.finish()
+    return file_paths
@@ -0,0 +1,66 @@
+import gzip
+import json
+import os
+
+try:
+    import zstandard
+except ImportError:  # only needed for zstd compressed parts
+    zstandard = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # only needed for the columnar output formats
+    pa = None
+
+# File extension of each output format and compression
+OUTPUT_FORMATS = {"json": ".json", "jsonl": ".jsonl", "parquet": ".parquet", "arrow": ".arrow"}
+COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# Columnar formats compress inside the file, so they keep their own extension
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+def _check_output_options(output_format, compression):
+    """Reject unknown output formats or compressions before anything is generated"""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if output_format in COLUMNAR_FORMATS:
+        if pa is None:
+            raise ImportError(f"{output_format} output requires the pyarrow package")
+        if output_format == "arrow" and compression == "gzip":
+            raise ValueError("Arrow IPC files only support zstd compression")
+    elif compression == "zstd" and zstandard is None:
+        raise ImportError("zstd compression requires the zstandard package")
+
+def _open_part_file(filepath, compression):
+    """Open a part file for writing encoded bytes, compressing on the fly if asked to"""
+    if compression == "gzip":
+        return gzip.open(filepath, 'wb', compresslevel=6)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().stream_writer(open(filepath, 'wb'))
+    return open(filepath, 'wb')
+
+# Written to the output directory after every part so an interrupted run can resume
+CHECKPOINT_FILENAME = "checkpoint.json"
+
+def load_checkpoint(output_dir):
+    """Read the checkpoint of an unfinished run in output_dir, or None if there is none"""
+    path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_checkpoint(output_dir, checkpoint):
+    """Replace the checkpoint in output_dir without ever leaving a half-written one"""
+    path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+def clear_checkpoint(output_dir):
+    """Remove the checkpoint once a run has finished"""
+    path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+    if os.path.exists(path):
+        os.remove(path)
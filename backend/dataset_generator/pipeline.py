@@ -0,0 +1,110 @@
+import os
+import queue
+import threading
+import time
+
+# Writer threads only pay off with a core to spare next to generation
+DEFAULT_WRITERS = max(0, min(2, (os.cpu_count() or 1) - 1))
+
+# Tells a writer thread that no more chunks are coming
+_DONE = object()
+
+class WritePipeline:
+    """Serialize and write parts on a pool of threads while the caller keeps generating
+    
+    submit hands a chunk to the writers through a queue of at most depth
+    chunks, so no more than depth plus one per writer are held in memory.
+    JSON encoding holds the GIL, but compression, Arrow encoding and the
+    file writes release it and overlap with generation.
+    
+    Both sides time their stalls: generation stalls while the queue is full,
+    so writing is the bottleneck, and a writer stalls while the queue is
+    empty, waiting for generation. If a write fails, the remaining chunks
+    are dropped and the error is raised to the caller by the next submit or
+    by close.
+    """
+    
+    def __init__(self, write, writers=2, depth=None):
+        self.write = write
+        self.writers = writers
+        self.depth = depth or writers
+        self.chunks = 0
+        self.generation_stall = 0.0
+        self.writer_stall = 0.0
+        self.write_time = 0.0
+        self._queue = queue.Queue(self.depth)
+        self._lock = threading.Lock()
+        self._error = None
+        self._dropping = False
+        self._threads = [threading.Thread(target=self._run, name=f"part-writer-{i + 1}", daemon=True)
+                         for i in range(writers)]
+        for thread in self._threads:
+            thread.start()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # When generation fails, its error wins and queued chunks aren't written
+        if exc_type is not None:
+            self._dropping = True
+        self.close(raise_error=exc_type is None)
+    
+    def submit(self, item):
+        """Queue item for writing, waiting while the queue is full"""
+        if self._error is not None:
+            raise self._error
+        started = time.perf_counter()
+        self._queue.put(item)
+        self.generation_stall += time.perf_counter() - started
+    
+    def close(self, raise_error=True):
+        """Wait until every queued item is written and stop the writers"""
+        for _ in self._threads:
+            self._queue.put(_DONE)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if raise_error and self._error is not None:
+            raise self._error
+    
+    def stats(self):
+        """Chunks written and the seconds each side spent writing or stalled, as a plain dict"""
+        with self._lock:
+            return {
+                "writers": self.writers,
+                "queue_depth": self.depth,
+                "chunks_written": self.chunks,
+                "write_seconds": round(self.write_time, 3),
+                "generation_stall_seconds": round(self.generation_stall, 3),
+                "writer_stall_seconds": round(self.writer_stall, 3),
+            }
+    
+    def _run(self):
+        while True:
+            started = time.perf_counter()
+            item = self._queue.get()
+            waited = time.perf_counter() - started
+            if item is _DONE:
+                with self._lock:
+                    self.writer_stall += waited
+                return
+            
+            written = False
+            if self._error is None and not self._dropping:
+                try:
+                    self.write(item)
+                    written = True
+                except BaseException as e:
+                    self._error = e
+                    self._dropping = True
+            with self._lock:
+                self.writer_stall += waited
+                if written:
+                    self.chunks += 1
+                    self.write_time += time.perf_counter() - started - waited
+
+def _format_pipeline_stats(stats):
+    return (f"Writers: {stats['chunks_written']:,} parts by {stats['writers']} threads in "
+            f"{stats['write_seconds']:.3f}s; generation stalled {stats['generation_stall_seconds']:.3f}s, "
+            f"writers stalled {stats['writer_stall_seconds']:.3f}s")
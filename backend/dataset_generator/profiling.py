@@ -0,0 +1,231 @@
+import contextlib
+import cProfile
+import functools
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+# What a profiled run captures besides its stage timers
+PROFILE_MODES = (None, "stages", "cprofile", "tracemalloc")
+
+# Functions or allocation sites listed in a cProfile or tracemalloc capture
+PROFILE_TOP = 20
+
+# Generator methods timed as stages of a profiled run
+PROFILED_METHODS = {
+    "_draw_review": "Text assembly",
+    "_unrank_review": "Text assembly",
+    "_limit_review_length": "Length limit",
+    "_deduplicate": "Dedup",
+    "_deduplicate_block": "Dedup",
+    "_write_part": "Serialization",
+}
+
+def _check_profile_option(profile):
+    if profile not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {profile}")
+
+class StageProfiler:
+    """Cumulative wall time, CPU time and allocations of the named stages of a run
+    
+    A stage is timed exclusively: while one stage runs inside another, only
+    the inner one is charged. Allocations are the net change in the number
+    of memory blocks Python holds; an object parked in a free list still
+    holds its block, so the stage that frees it may be charged for a block
+    the next stage reuses. Stages run on other threads, such as part
+    writers, are timed as a whole and without allocations. With mode
+    "cprofile" or "tracemalloc" the run between start and stop is also
+    captured with that module. The report then lists the top functions, or
+    the top allocation sites when traced memory was at its largest.
+    """
+    
+    def __init__(self, mode="stages"):
+        self.mode = mode
+        # name -> [calls, wall nanoseconds, CPU nanoseconds, allocated blocks]
+        self.stages = {}
+        self.elapsed = 0.0
+        self.top = None
+        self.peak_bytes = None
+        self._stack = []
+        self._last = None
+        self._started = None
+        self._profile = None
+        self._snapshot = None
+        self._snapshot_size = 0
+        # Stages nest on the thread that made the profiler; other threads only add totals
+        self._thread = threading.get_ident()
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Start the run's clock and its capture, if any"""
+        self._started = time.perf_counter()
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == "tracemalloc":
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+    
+    def stop(self):
+        """Stop the run's clock and keep the top entries of its capture"""
+        if self._started is None:
+            return
+        self.elapsed += time.perf_counter() - self._started
+        self._started = None
+        if self.mode == "cprofile":
+            self._profile.disable()
+            stats = pstats.Stats(self._profile).sort_stats("cumulative")
+            self.top = []
+            for function in stats.fcn_list[:PROFILE_TOP]:
+                _, calls, total, cumulative, _ = stats.stats[function]
+                self.top.append({"function": pstats.func_std_string(function), "calls": calls,
+                                 "total_seconds": round(total, 3), "cumulative_seconds": round(cumulative, 3)})
+            self._profile = None
+        elif self.mode == "tracemalloc":
+            snapshot = self._snapshot or tracemalloc.take_snapshot()
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.top = [{"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                        for stat in snapshot.statistics("lineno")[:PROFILE_TOP]]
+            self._snapshot = None
+            self._snapshot_size = 0
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def enter(self, name):
+        """Start charging the stage name, pausing the stage it runs inside"""
+        self._switch()
+        self._stack.append(name)
+        self._totals(name)[0] += 1
+    
+    def exit(self):
+        """Stop charging the innermost stage and resume the one it ran inside"""
+        self._switch()
+        self._stack.pop()
+        if self.mode == "tracemalloc":
+            self._keep_largest_snapshot()
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+    
+    def wrap(self, name, function):
+        """function, timed as the stage name on every call"""
+        enter = self.enter
+        leave = self.exit
+        thread = self._thread
+        
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            if threading.get_ident() != thread:
+                return self._time_elsewhere(name, function, args, kwargs)
+            enter(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                leave()
+        return timed
+    
+    def instrument(self, obj, methods):
+        """Replace methods of obj, a {method name: stage name} dict, by timed ones"""
+        for method, name in methods.items():
+            setattr(obj, method, self.wrap(name, getattr(obj, method)))
+    
+    def merge(self, stages):
+        """Add the stage totals of another run, such as a shard"""
+        for name, totals in stages.items():
+            own = self._totals(name)
+            for i, value in enumerate(totals):
+                own[i] += value
+    
+    def report(self):
+        """Stage totals, and the capture once the run has stopped, as a plain dict"""
+        elapsed = self.elapsed
+        if self._started is not None:
+            elapsed += time.perf_counter() - self._started
+        report = {
+            "mode": self.mode,
+            "elapsed_seconds": round(elapsed, 3),
+            "stages": {name: {"calls": calls, "wall_seconds": round(wall / 1e9, 3),
+                              "cpu_seconds": round(cpu / 1e9, 3), "allocated_blocks": blocks}
+                       for name, (calls, wall, cpu, blocks) in list(self.stages.items())},
+        }
+        if self.top is not None:
+            report["top"] = self.top
+        if self.peak_bytes is not None:
+            report["peak_traced_bytes"] = self.peak_bytes
+        return report
+    
+    def _totals(self, name):
+        totals = self.stages.get(name)
+        if totals is None:
+            totals = self.stages[name] = [0, 0, 0, 0]
+        return totals
+    
+    def _switch(self):
+        """Charge what was used since the last stage change to the innermost stage
+        
+        Only the latest reading is kept, blocks are counted before the clocks
+        allocate their results and times are kept as integer nanoseconds,
+        which unlike floats have no free list. So the profiler holds as many
+        blocks at every reading and its own allocations cancel out.
+        """
+        now = (sys.getallocatedblocks(), time.perf_counter_ns(), time.thread_time_ns())
+        if self._stack:
+            totals = self._totals(self._stack[-1])
+            totals[1] += now[1] - self._last[1]
+            totals[2] += now[2] - self._last[2]
+            totals[3] += now[0] - self._last[0]
+        self._last = now
+    
+    def _time_elsewhere(self, name, function, args, kwargs):
+        """Call function on a thread other than the profiler's and add its times to the stage name"""
+        wall, cpu = time.perf_counter_ns(), time.thread_time_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            wall, cpu = time.perf_counter_ns() - wall, time.thread_time_ns() - cpu
+            with self._lock:
+                totals = self._totals(name)
+                totals[0] += 1
+                totals[1] += wall
+                totals[2] += cpu
+    
+    def _keep_largest_snapshot(self):
+        """Snapshot the traced allocations each time they grow a quarter past the last snapshot"""
+        if self._started is None:
+            return
+        size = tracemalloc.get_traced_memory()[0]
+        if size > self._snapshot_size * 1.25:
+            self._snapshot = tracemalloc.take_snapshot()
+            self._snapshot_size = size
+
+def _format_profile(report):
+    """Readable table of a StageProfiler report"""
+    lines = [f"Profile ({report['mode']}, {report['elapsed_seconds']:.3f}s"
+             + (f", peak traced memory {report['peak_traced_bytes']:,} B" if "peak_traced_bytes" in report else "")
+             + "):",
+             f"  {'Stage':<18}{'Calls':>12}{'Wall s':>10}{'CPU s':>10}{'Blocks':>12}"]
+    for name, stage in sorted(report["stages"].items(), key=lambda item: -item[1]["wall_seconds"]):
+        lines.append(f"  {name:<18}{stage['calls']:>12,}{stage['wall_seconds']:>10.3f}"
+                     f"{stage['cpu_seconds']:>10.3f}{stage['allocated_blocks']:>+12,}")
+    if report.get("top"):
+        lines.append("  Top functions by cumulative time:" if report["mode"] == "cprofile"
+                     else "  Top allocation sites at the largest traced memory:")
+    for entry in report.get("top", []):
+        if "function" in entry:
+            lines.append(f"  {entry['cumulative_seconds']:>9.3f}s {entry['calls']:>10,}  {entry['function']}")
+        else:
+            lines.append(f"  {entry['size_bytes']:>10,} B {entry['count']:>9,}  {entry['location']}")
+    return "\n".join(lines)
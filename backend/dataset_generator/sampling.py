@@ -0,0 +1,210 @@
+import random
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the vectorized engine
+    np = None
+
+class AspectQuotaScheduler:
+    """Picks the aspect keys of each review while keeping aspects balanced
+    
+    Aspects still below their quota are kept in a list together with their
+    position in it, so an aspect that reaches its quota is dropped with a
+    swap-and-pop and each draw costs O(1) instead of a scan of every aspect.
+    """
+    
+    def __init__(self, aspect_targets, rng):
+        self.rng = rng
+        self.aspect_keys = list(aspect_targets)
+        self.counts = {key: 0 for key in self.aspect_keys}
+        self.remaining = dict(aspect_targets)
+        self.pending = [key for key in self.aspect_keys if self.remaining[key] > 0]
+        self.position = {key: i for i, key in enumerate(self.pending)}
+    
+    def draw(self):
+        """Return 1-3 distinct aspect keys, taken from under-quota aspects while any remain"""
+        num_aspects = int(self.rng.random() * 3) + 1
+        pending = self.pending
+        
+        if pending:
+            # Force selection from underrepresented aspects
+            aspect_keys = self._sample(pending, min(num_aspects, len(pending)))
+            for key in aspect_keys:
+                self.remaining[key] -= 1
+                if self.remaining[key] == 0:
+                    self._retire(key)
+        else:
+            # Normal random selection
+            aspect_keys = self._sample(self.aspect_keys, num_aspects)
+        
+        for key in aspect_keys:
+            self.counts[key] += 1
+        return aspect_keys
+    
+    def draw_block(self, np_rng, size):
+        """Draw the aspect indices of size reviews at once, padded with -1
+        
+        Aspects still under quota are dealt from a shuffled deck that holds
+        each of them as many times as it is short. A review dealt the same
+        aspect twice keeps one copy and the other goes back to the deck for
+        the following reviews. Reviews the deck doesn't reach draw 1-3
+        distinct aspects uniformly.
+        
+        The deck is never built: how many cards of each aspect the next
+        slots get is a multivariate hypergeometric draw from the per-aspect
+        counts, so only the dealt cards are materialized and shuffled and a
+        block costs the same however large the run.
+        """
+        num_keys = len(self.aspect_keys)
+        num_aspects = np_rng.integers(1, 4, size)
+        aspect_ids = self._uniform_block(np_rng, num_aspects)
+        
+        deck = np.array([self.remaining[key] for key in self.aspect_keys], dtype=np.int64)
+        row = 0
+        while deck.sum() and row < size:
+            # Deal cards from the deck into the aspect slots of the next reviews
+            positions = np.flatnonzero(np.arange(3) < num_aspects[row:, None])[:int(deck.sum())]
+            hand = np_rng.multivariate_hypergeometric(deck, len(positions))
+            deck -= hand
+            hand = np.repeat(np.arange(num_keys), hand)
+            np_rng.shuffle(hand)
+            dealt_rows = positions[-1] // 3 + 1
+            dealt = np.full(dealt_rows * 3, -1, dtype=np.int64)
+            dealt[positions] = hand
+            dealt = dealt.reshape(dealt_rows, 3)
+            
+            # Keep the first copy of an aspect within a review, return the rest
+            second_dup = (dealt[:, 1] >= 0) & (dealt[:, 1] == dealt[:, 0])
+            third_dup = (dealt[:, 2] >= 0) & ((dealt[:, 2] == dealt[:, 0]) | (dealt[:, 2] == dealt[:, 1]))
+            returned = np.concatenate([dealt[second_dup, 1], dealt[third_dup, 2]])
+            dealt[second_dup, 1] = -1
+            dealt[third_dup, 2] = -1
+            gap = (dealt[:, 1] < 0) & (dealt[:, 2] >= 0)
+            dealt[gap, 1] = dealt[gap, 2]
+            dealt[gap, 2] = -1
+            
+            aspect_ids[row:row + dealt_rows] = dealt
+            row += dealt_rows
+            deck += np.bincount(returned, minlength=num_keys)
+        
+        # Whatever is left of the deck carries over to the next block
+        counts = np.bincount(aspect_ids[aspect_ids >= 0], minlength=num_keys).tolist()
+        for key, left, count in zip(self.aspect_keys, deck.tolist(), counts):
+            self.remaining[key] = left
+            self.counts[key] += count
+        self.pending = [key for key in self.aspect_keys if self.remaining[key] > 0]
+        self.position = {key: i for i, key in enumerate(self.pending)}
+        return aspect_ids
+    
+    def get_state(self):
+        """Quota counters as plain data for a checkpoint"""
+        return {"counts": dict(self.counts), "remaining": dict(self.remaining), "pending": list(self.pending)}
+    
+    def set_state(self, state):
+        """Restore the quota counters saved by get_state"""
+        self.counts = dict(state["counts"])
+        self.remaining = dict(state["remaining"])
+        self.pending = list(state["pending"])
+        self.position = {key: i for i, key in enumerate(self.pending)}
+    
+    def _uniform_block(self, np_rng, num_aspects):
+        """Draw 1-3 distinct aspect indices per review uniformly, padded with -1"""
+        num_keys = len(self.aspect_keys)
+        size = len(num_aspects)
+        
+        # Draw three distinct indices by skipping over the ones already taken
+        first = np_rng.integers(0, num_keys, size)
+        second = np_rng.integers(0, num_keys - 1, size)
+        second += second >= first
+        third = np_rng.integers(0, num_keys - 2, size)
+        third += third >= np.minimum(first, second)
+        third += third >= np.maximum(first, second)
+        
+        aspect_ids = np.stack([first, second, third], axis=1)
+        aspect_ids[num_aspects < 2, 1] = -1
+        aspect_ids[num_aspects < 3, 2] = -1
+        return aspect_ids
+    
+    def _sample(self, population, k):
+        """Draw k distinct items by rejection, which is cheap because k is at most 3"""
+        size = len(population)
+        picked = []
+        while len(picked) < k:
+            item = population[int(self.rng.random() * size)]
+            if item not in picked:
+                picked.append(item)
+        return picked
+    
+    def _retire(self, key):
+        """Remove an aspect that met its quota by swapping it with the last pending one"""
+        index = self.position.pop(key)
+        last = self.pending.pop()
+        if last != key:
+            self.pending[index] = last
+            self.position[last] = index
+
+# Reviews mention 1 to this many distinct aspects
+MAX_ASPECTS = 3
+
+def _elementary_symmetric(weights, k):
+    """e_0..e_k of weights, where e_j sums the products of every j distinct weights"""
+    sums = [1] + [0] * k
+    for weight in weights:
+        for j in range(k, 0, -1):
+            sums[j] += weight * sums[j - 1]
+    return sums
+
+def _without(sums, weight):
+    """Elementary symmetric sums of the same weights with one of them left out"""
+    result = [1]
+    for j in range(1, len(sums)):
+        result.append(sums[j] - weight * result[j - 1])
+    return result
+
+def _sum_without(sums, weight, k):
+    """e_k alone of the same weights with one of them left out"""
+    result = 1
+    for j in range(1, k + 1):
+        result = sums[j] - weight * result
+    return result
+
+class FeistelPermutation:
+    """Pseudorandom bijection of range(size) that needs no table
+    
+    A balanced Feistel network permutes the smallest even-bit domain holding
+    size, and values that land past size are sent through it again (cycle
+    walking). The domain is less than four times size, so that takes under
+    four passes on average.
+    """
+    
+    ROUNDS = 4
+    MASK64 = (1 << 64) - 1
+    
+    def __init__(self, size, key):
+        self.size = size
+        self.half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+        key_rng = random.Random(key)
+        self.round_keys = [key_rng.getrandbits(64) for _ in range(self.ROUNDS)]
+    
+    def __call__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(f"{index} is outside a permutation of {self.size}")
+        value = index
+        while True:
+            value = self._encrypt(value)
+            if value < self.size:
+                return value
+    
+    def _encrypt(self, value):
+        left, right = value >> self.half_bits, value & self.half_mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+        return (left << self.half_bits) | right
+    
+    def _round(self, half, round_key):
+        # splitmix64 finalizer
+        x = ((half ^ round_key) * 0x9E3779B97F4A7C15) & self.MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & self.MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & self.MASK64
+        return (x ^ (x >> 31)) & self.half_mask
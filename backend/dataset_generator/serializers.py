@@ -0,0 +1,94 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # optional, the fastest JSON backend
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional JSON backend
+    msgspec = None
+
+# JSON backends, fastest first; the json module is always available
+SERIALIZERS = ("orjson", "msgspec", "json")
+
+# Raised by a fast backend for values only the json module encodes
+_ENCODE_ERRORS = (TypeError, OverflowError) + ((msgspec.EncodeError,) if msgspec is not None else ())
+
+_compact_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_indented_encode = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+
+def _available(backend):
+    return backend == "json" or (backend == "orjson" and orjson is not None) or (
+        backend == "msgspec" and msgspec is not None)
+
+def _contains_float(value):
+    """Whether a float is anywhere inside value, walking dicts, lists and tuples"""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+class JSONSerializer:
+    """Encode values to UTF-8 JSON bytes with orjson or msgspec, or the json module
+    
+    With backend None the fastest installed one is used. All three write the
+    same bytes as json.dumps with ensure_ascii=False, except for floats: the
+    fast backends write 1e16 or 0.00001 where json writes 1e+16 or 1e-05.
+    With compat, values holding a float are encoded by the json module, so
+    the output is byte for byte what the json module writes. Values a fast
+    backend can't encode, such as integers past 64 bits, always fall back
+    to the json module.
+    """
+    
+    def __init__(self, backend=None, compat=False):
+        if backend is None:
+            backend = next(name for name in SERIALIZERS if _available(name))
+        if backend not in SERIALIZERS:
+            raise ValueError(f"Unknown serializer: {backend}")
+        if not _available(backend):
+            raise ImportError(f"The {backend} serializer requires the {backend} package")
+        self.backend = backend
+        self.compat = compat
+        if backend == "msgspec":
+            self._encode = msgspec.json.Encoder().encode
+    
+    def dumps(self, value):
+        """Compact JSON, as json.dumps(value, ensure_ascii=False, separators=(",", ":"))"""
+        if self._fast(value):
+            try:
+                return orjson.dumps(value) if self.backend == "orjson" else self._encode(value)
+            except _ENCODE_ERRORS:
+                pass
+        return _compact_encode(value).encode('utf-8')
+    
+    def dumps_indented(self, value):
+        """JSON indented by 2 spaces, as json.dumps(value, ensure_ascii=False, indent=2)"""
+        if self._fast(value):
+            try:
+                if self.backend == "orjson":
+                    return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+                return msgspec.json.format(self._encode(value), indent=2)
+            except _ENCODE_ERRORS:
+                pass
+        return _indented_encode(value).encode('utf-8')
+    
+    def dumps_lines(self, values):
+        """One compact JSON value per line, each line ending in a newline"""
+        if self._fast(values):
+            try:
+                dumps = orjson.dumps if self.backend == "orjson" else self._encode
+                return b"".join([dumps(value) + b"\n" for value in values])
+            except _ENCODE_ERRORS:
+                pass
+        return "".join([_compact_encode(value) + "\n" for value in values]).encode('utf-8')
+    
+    def _fast(self, value):
+        return self.backend != "json" and not (self.compat and _contains_float(value))
@@ -0,0 +1,1136 @@
+import hashlib
+import json
+from string import Formatter
+from types import MappingProxyType
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the vectorized engine
+    np = None
+
+def _split_template(template):
+    """Split a format string into its literal pieces and the field names between them"""
+    literals, fields = [], []
+    for literal, field, _, _ in Formatter().parse(template):
+        literals.append(literal)
+        if field is not None:
+            fields.append(field)
+    if len(literals) == len(fields):
+        literals.append("")
+    return literals, fields
+
+def _compile_template(template, fields):
+    """Pre-split a format string into its leading text and (slot, literal) pairs
+    
+    Slots are positions in fields, so a compiled template is filled from a
+    tuple of values with plain concatenation and no format parsing.
+    """
+    literals, names = _split_template(template)
+    return literals[0], tuple((fields.index(name), literal) for name, literal in zip(names, literals[1:]))
+
+def _render_template(compiled, values):
+    """Fill a template compiled by _compile_template with a tuple of values"""
+    text, pieces = compiled
+    for slot, literal in pieces:
+        text += values[slot] + literal
+    return text
+
+def _object_array(values):
+    """Build a 1-d object array of strings, which NumPy can index and concatenate"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+def _compile_template_columns(templates, fields):
+    """Encode templates for column-wise assembly
+    
+    Every template becomes its literal pieces plus the index into fields of
+    each slot between them. The number of spaces in the literals and how
+    often each field is used let callers count words without scanning text.
+    """
+    pieces, slots = [], []
+    uses = np.zeros((len(fields), len(templates)), dtype=np.int64)
+    spaces = np.zeros(len(templates), dtype=np.int64)
+    for t, template in enumerate(templates):
+        literals, names = _split_template(template)
+        pieces.append(literals)
+        slots.append([fields.index(name) for name in names])
+        for name in names:
+            uses[fields.index(name), t] += 1
+        spaces[t] = sum(literal.count(" ") for literal in literals)
+    return {"fields": fields, "pieces": pieces, "slots": slots, "uses": uses, "spaces": spaces}
+
+def _assemble_columns(table, template_ids, values, value_spaces):
+    """Fill the chosen template of every row with that row's values
+    
+    Rows are grouped by template so each group is built with only the
+    concatenations its template needs. Returns the texts as an object array
+    and their number of spaces, which is known from the tables.
+    """
+    texts = np.empty(len(template_ids), dtype=object)
+    columns = [values[field] for field in table["fields"]]
+    order = np.argsort(template_ids, kind="stable")
+    template_order = template_ids[order]
+    starts = np.flatnonzero(np.diff(template_order, prepend=-1))
+    for start, end in zip(starts.tolist(), np.append(starts[1:], len(order)).tolist()):
+        rows = order[start:end]
+        t = int(template_order[start])
+        group = None
+        for literal, slot in zip(table["pieces"][t], table["slots"][t] + [None]):
+            if literal:
+                group = literal if group is None else group + literal
+            if slot is not None:
+                column = columns[slot][rows]
+                group = column if group is None else group + column
+        texts[rows] = group
+    
+    spaces = table["spaces"][template_ids].copy()
+    for code, field in enumerate(table["fields"]):
+        spaces += table["uses"][code][template_ids] * value_spaces[field]
+    return texts, spaces
+
+class TemplateSet:
+    """Read-only template tables that reviews are assembled from
+    
+    Tables are frozen into tuples and mapping proxies when the set is built,
+    once per process at import, so every generator and worker shares them
+    instead of building its own copy. Tables derived from them, which only
+    some runs need, are built on first use and shared the same way.
+    """
+    
+    def __init__(self, name, aspect_mappings, problem_templates, review_structures, connectors,
+                 complaint_structures, realistic_endings=(), ending_probability=0.0):
+        self.name = name
+        self.aspect_mappings = MappingProxyType({key: tuple(values) for key, values in aspect_mappings.items()})
+        self.problem_templates = MappingProxyType({key: tuple(values) for key, values in problem_templates.items()})
+        self.review_structures = tuple(review_structures)
+        self.connectors = tuple(connectors)
+        self.complaint_structures = tuple(complaint_structures)
+        # Closing remarks added to this share of multi-aspect reviews
+        self.realistic_endings = tuple(realistic_endings)
+        self.ending_probability = ending_probability
+        
+        # Every template pre-split so review assembly never parses a format string
+        self.compiled_structures = tuple(enumerate(
+            _compile_template(structure, ["aspect", "problem"]) for structure in self.review_structures
+        ))
+        self.compiled_complaints = tuple(
+            _compile_template(structure, ["connector", "aspect", "problem"])
+            for structure in self.complaint_structures
+        )
+        self._fingerprint = None
+        self._derived = {}
+    
+    def fingerprint(self):
+        """Hash of every table, which changes whenever the generated text would"""
+        if self._fingerprint is None:
+            tables = [dict(self.aspect_mappings), dict(self.problem_templates), self.review_structures,
+                      self.connectors, self.complaint_structures, self.realistic_endings, self.ending_probability]
+            self._fingerprint = hashlib.sha256(json.dumps(tables, sort_keys=True).encode('utf-8')).hexdigest()
+        return self._fingerprint
+    
+    def derived(self, name, build):
+        """The table called name, built by calling build() the first time it is asked for"""
+        table = self._derived.get(name)
+        if table is None:
+            table = self._derived[name] = build()
+        return table
+
+# The templates of the web app's datasets
+STANDARD = TemplateSet(
+    "standard",
+    # Comprehensive aspect mapping with synonyms and variations
+    aspect_mappings={
+        "rooms": ["rooms", "room", "suite", "accommodation", "quarters"],
+        "bathrooms": ["bathrooms", "bathroom", "restroom", "wc", "toilet", "washroom", "lavatory"],
+        "shower": ["shower", "showers", "bathtub", "bath", "tub"],
+        "bed": ["bed", "beds", "mattress", "bedding", "sleeping area"],
+        "carpet": ["carpet", "carpets", "flooring", "floor", "rug", "rugs"],
+        "pillows": ["pillows", "pillow", "cushions", "headrest"],
+        "blankets": ["blankets", "blanket", "covers", "bedding", "comforter", "duvet"],
+        "wifi": ["wifi", "wi-fi", "internet", "wireless", "connection", "network"],
+        "elevator": ["elevator", "elevators", "lift", "lifts"],
+        "breakfast": ["breakfast", "morning meal", "buffet", "continental breakfast"],
+        "restaurant": ["restaurant", "dining", "dining room", "eatery", "cafe"],
+        "lobby": ["lobby", "reception area", "entrance", "foyer", "main hall"],
+        "staff": ["staff", "employees", "personnel", "workers", "team", "crew"],
+        "service": ["service", "customer service", "hospitality", "assistance"],
+        "cleaning": ["cleaning", "housekeeping", "maintenance", "upkeep", "sanitation"],
+        "air_conditioning": ["air conditioning", "air con", "ac", "cooling", "climate control", "hvac"],
+        "bar": ["bar", "lounge", "pub", "cocktail bar", "drinks area"],
+        "minibars": ["minibar", "mini bar", "in-room bar", "fridge"],
+        "food": ["food", "meals", "cuisine", "dining", "menu"],
+        "pizza": ["pizza", "pizzas", "italian food"],
+        "drinks": ["drinks", "beverages", "cocktails", "alcohol"],
+        "juice": ["juice", "juices", "fresh juice", "fruit juice"],
+        "guide": ["guide", "tour guide", "concierge", "information"],
+        "transport": ["transport", "transportation", "shuttle", "taxi", "transfer"],
+        "price": ["price", "cost", "rate", "pricing", "fees"],
+        "expensiveness": ["expensive", "overpriced", "costly", "pricey", "charges"],
+        "kettle": ["kettle", "coffee maker", "tea maker", "hot water"],
+        "pool": ["pool", "swimming pool", "spa", "jacuzzi", "hot tub"],
+        "stairs": ["stairs", "staircase", "steps", "stairway"],
+        "reception": ["reception", "front desk", "check-in", "desk", "counter"],
+        "view": ["view", "scenery", "outlook", "window view", "vista"],
+        "extra_charges": ["extra charges", "hidden fees", "additional costs", "surcharges"],
+        "extra_fees": ["extra fees", "additional fees", "hidden charges", "supplements"],
+        "water": ["water", "hot water", "water pressure", "plumbing"],
+        "temperature": ["temperature", "heating", "warmth", "cold", "hot"],
+        "tv": ["tv", "television", "tv set", "entertainment", "cable"],
+        "gym": ["gym", "fitness center", "exercise room", "workout area"],
+        "fitness": ["fitness", "fitness facilities", "exercise equipment", "weights"],
+        "window": ["window", "windows", "glass", "view"],
+        "smoke": ["smoke", "smoking", "cigarette smell", "odor"],
+        "smell": ["smell", "odor", "scent", "aroma", "stench"],
+        "hair": ["hair", "hairs", "dirty hair", "previous guest hair"],
+        "bugs": ["bugs", "insects", "pests", "cockroaches", "ants"],
+        "coffee": ["coffee", "espresso", "cappuccino", "coffee machine"],
+        "tea": ["tea", "herbal tea", "tea bags", "tea service"],
+        "alcohol": ["alcohol", "wine", "beer", "spirits", "liquor"],
+        "towels": ["towels", "towel", "bath towels", "linens"],
+        "parking": ["parking", "parking lot", "valet", "garage"],
+        "housekeeping": ["housekeeping", "room service", "cleaning service", "maid service"],
+        "noise": ["noise", "loud", "sounds", "disturbance", "racket"]
+    },
+    
+    # Problem templates for each aspect category
+    problem_templates={
+        "rooms": [
+            "cramped and uncomfortable space",
+            "outdated and shabby decor",
+            "broken furniture and fixtures",
+            "poor lighting throughout",
+            "musty and unpleasant atmosphere",
+            "dirty and unkempt condition",
+            "inadequate storage space",
+            "damaged walls and surfaces"
+        ],
+        "bathrooms": [
+            "moldy and dirty surfaces",
+            "broken fixtures and fittings",
+            "clogged drains and poor drainage",
+            "cracked tiles and grout",
+            "leaking pipes and water damage",
+            "inadequate ventilation",
+            "dirty and stained surfaces",
+            "missing or broken accessories"
+        ],
+        "shower": [
+            "poor water pressure",
+            "inconsistent water temperature",
+            "leaking and flooding issues",
+            "moldy and dirty shower head",
+            "broken or missing shower door",
+            "slippery and unsafe floor",
+            "rusty and corroded fixtures",
+            "inadequate drainage"
+        ],
+        "bed": [
+            "uncomfortable and lumpy mattress",
+            "broken or squeaky frame",
+            "stained and dirty sheets",
+            "inadequate size for guests",
+            "poor support and sagging",
+            "noisy springs and creaking",
+            "worn out and old bedding",
+            "uncomfortable sleeping surface"
+        ],
+        "carpet": [
+            "stained and dirty throughout",
+            "worn out and frayed edges",
+            "strong odors and smells",
+            "loose and unsafe areas",
+            "poor quality and cheap material",
+            "visible wear and tear",
+            "sticky and unclean surface",
+            "damaged and torn sections"
+        ],
+        "pillows": [
+            "flat and uncomfortable support",
+            "dirty and stained covers",
+            "lumpy and uneven filling",
+            "strong odors and smells",
+            "inadequate number provided",
+            "poor quality and cheap material",
+            "worn out and old condition",
+            "uncomfortable and unsupportive"
+        ],
+        "blankets": [
+            "thin and inadequate warmth",
+            "dirty and stained condition",
+            "torn and damaged fabric",
+            "strong odors and smells",
+            "inadequate size and coverage",
+            "poor quality and cheap material",
+            "worn out and old appearance",
+            "uncomfortable and scratchy texture"
+        ],
+        "wifi": [
+            "extremely slow connection speed",
+            "frequent disconnections and outages",
+            "poor signal strength throughout",
+            "complicated login process",
+            "limited data allowance",
+            "unreliable and inconsistent service",
+            "expensive additional charges",
+            "technical issues and problems"
+        ],
+        "elevator": [
+            "frequent breakdowns and malfunctions",
+            "extremely slow and inefficient",
+            "strange noises and vibrations",
+            "dirty and unkempt interior",
+            "broken buttons and controls",
+            "poor lighting and atmosphere",
+            "overcrowded and uncomfortable",
+            "safety concerns and issues"
+        ],
+        "breakfast": [
+            "limited and poor quality options",
+            "cold and unappetizing food",
+            "long queues and waiting times",
+            "dirty and unsanitary conditions",
+            "expensive additional charges",
+            "poor variety and selection",
+            "stale and old food items",
+            "inadequate seating and space"
+        ],
+        "restaurant": [
+            "poor quality and tasteless food",
+            "extremely slow service",
+            "dirty and unsanitary conditions",
+            "overpriced and expensive menu",
+            "rude and unprofessional staff",
+            "limited menu options",
+            "long waiting times",
+            "cold and unappetizing meals"
+        ],
+        "lobby": [
+            "dirty and unkempt appearance",
+            "uncomfortable and worn furniture",
+            "poor lighting and atmosphere",
+            "crowded and chaotic environment",
+            "outdated and shabby decor",
+            "strong odors and smells",
+            "inadequate seating areas",
+            "poor maintenance and upkeep"
+        ],
+        "staff": [
+            "rude and unprofessional behavior",
+            "unhelpful and dismissive attitude",
+            "poor communication skills",
+            "slow response to requests",
+            "inadequate knowledge and training",
+            "argumentative and defensive",
+            "unavailable when needed",
+            "discriminatory treatment of guests"
+        ],
+        "service": [
+            "extremely poor customer service",
+            "slow response to complaints",
+            "unprofessional and rude treatment",
+            "inadequate problem resolution",
+            "poor communication and follow-up",
+            "dismissive attitude toward concerns",
+            "lack of attention to detail",
+            "disappointing overall experience"
+        ],
+        "cleaning": [
+            "poor and inadequate cleaning standards",
+            "dirty and unsanitary conditions",
+            "missed areas and surfaces",
+            "strong chemical odors",
+            "inadequate frequency of service",
+            "careless and rushed job",
+            "dirty cleaning equipment used",
+            "unprofessional cleaning staff"
+        ],
+        "air_conditioning": [
+            "not working or broken",
+            "extremely loud and noisy operation",
+            "poor temperature control",
+            "musty and unpleasant odors",
+            "inadequate cooling capacity",
+            "frequent breakdowns and issues",
+            "dirty and clogged filters",
+            "poor air circulation"
+        ],
+        "bar": [
+            "overpriced and expensive drinks",
+            "poor quality and watered down cocktails",
+            "slow and inefficient service",
+            "limited selection and options",
+            "dirty and unsanitary conditions",
+            "rude and unprofessional bartenders",
+            "crowded and uncomfortable atmosphere",
+            "poor quality and stale ingredients"
+        ],
+        "minibars": [
+            "extremely overpriced items",
+            "broken or not working",
+            "limited and poor selection",
+            "warm and not cooling properly",
+            "dirty and unsanitary interior",
+            "expired and stale products",
+            "hidden charges and fees",
+            "inadequate restocking service"
+        ],
+        "food": [
+            "poor quality and tasteless meals",
+            "cold and unappetizing presentation",
+            "limited and poor variety",
+            "overpriced and expensive options",
+            "stale and old ingredients",
+            "poor preparation and cooking",
+            "unsanitary and dirty conditions",
+            "disappointing overall quality"
+        ],
+        "pizza": [
+            "cold and unappetizing slices",
+            "poor quality and cheap toppings",
+            "overpriced and expensive",
+            "burnt and overcooked crust",
+            "stale and old ingredients",
+            "poor preparation and presentation",
+            "limited variety and options",
+            "disappointing taste and quality"
+        ],
+        "drinks": [
+            "overpriced and expensive",
+            "poor quality and watered down",
+            "limited selection and variety",
+            "warm and not properly chilled",
+            "stale and old ingredients",
+            "slow service and long waits",
+            "dirty glasses and containers",
+            "disappointing overall quality"
+        ],
+        "juice": [
+            "artificial and poor taste",
+            "overpriced and expensive",
+            "not fresh and stale",
+            "limited variety and options",
+            "watered down and diluted",
+            "warm and not properly chilled",
+            "poor quality and cheap",
+            "disappointing and unappetizing"
+        ],
+        "guide": [
+            "inadequate knowledge and information",
+            "poor communication skills",
+            "unhelpful and dismissive attitude",
+            "expensive and overpriced services",
+            "unreliable and unpunctual",
+            "poor organization and planning",
+            "rude and unprofessional behavior",
+            "disappointing overall experience"
+        ],
+        "transport": [
+            "unreliable and delayed service",
+            "overpriced and expensive",
+            "uncomfortable and cramped vehicles",
+            "poor condition and maintenance",
+            "rude and unprofessional drivers",
+            "inadequate scheduling and frequency",
+            "dirty and unsanitary conditions",
+            "disappointing overall experience"
+        ],
+        "price": [
+            "extremely overpriced for quality",
+            "hidden fees and charges",
+            "poor value for money",
+            "expensive additional costs",
+            "unreasonable and excessive rates",
+            "misleading and deceptive pricing",
+            "unexpected surcharges and fees",
+            "disappointing overall value"
+        ],
+        "expensiveness": [
+            "ridiculously overpriced everything",
+            "excessive charges for basic services",
+            "poor value for money spent",
+            "unreasonable and inflated prices",
+            "expensive with poor quality",
+            "costly with disappointing results",
+            "overcharged for substandard service",
+            "pricey with terrible experience"
+        ],
+        "kettle": [
+            "broken and not working",
+            "dirty and unsanitary condition",
+            "missing or inadequate supplies",
+            "poor quality and cheap",
+            "electrical issues and problems",
+            "inadequate capacity and size",
+            "difficult to use and operate",
+            "rusty and corroded appearance"
+        ],
+        "pool": [
+            "dirty and unsanitary water",
+            "closed or not available",
+            "overcrowded and uncomfortable",
+            "poor maintenance and upkeep",
+            "broken equipment and facilities",
+            "unsafe and hazardous conditions",
+            "inadequate size and depth",
+            "strong chemical odors"
+        ],
+        "stairs": [
+            "dirty and poorly maintained",
+            "unsafe and hazardous conditions",
+            "poor lighting and visibility",
+            "worn out and damaged steps",
+            "inadequate handrails and support",
+            "crowded and difficult access",
+            "strong odors and smells",
+            "poor overall condition"
+        ],
+        "reception": [
+            "extremely slow check-in process",
+            "rude and unprofessional staff",
+            "long queues and waiting times",
+            "poor communication and service",
+            "inadequate information provided",
+            "dismissive attitude toward guests",
+            "disorganized and chaotic",
+            "disappointing first impression"
+        ],
+        "view": [
+            "obstructed and disappointing",
+            "construction and noise outside",
+            "dirty windows and poor visibility",
+            "misleading and deceptive advertising",
+            "ugly and unpleasant scenery",
+            "blocked by other buildings",
+            "poor quality and uninspiring",
+            "not as advertised or promised"
+        ],
+        "extra_charges": [
+            "unexpected and hidden fees",
+            "excessive and unreasonable costs",
+            "misleading and deceptive billing",
+            "charged for basic amenities",
+            "expensive additional services",
+            "unfair and unjustified charges",
+            "poor value for extra cost",
+            "disappointing surprise expenses"
+        ],
+        "extra_fees": [
+            "hidden and unexpected costs",
+            "excessive and unreasonable charges",
+            "misleading billing practices",
+            "expensive additional services",
+            "unfair and unjustified fees",
+            "poor transparency and disclosure",
+            "surprising and disappointing costs",
+            "overcharged for basic services"
+        ],
+        "water": [
+            "poor pressure and flow",
+            "inconsistent temperature control",
+            "dirty and contaminated supply",
+            "frequent outages and interruptions",
+            "strange taste and odor",
+            "inadequate hot water supply",
+            "rusty and discolored water",
+            "poor quality and safety"
+        ],
+        "temperature": [
+            "too hot and uncomfortable",
+            "too cold and freezing",
+            "inconsistent and fluctuating",
+            "poor control and regulation",
+            "inadequate heating and cooling",
+            "uncomfortable room climate",
+            "extreme and unbearable conditions",
+            "poor ventilation and circulation"
+        ],
+        "tv": [
+            "not working or broken",
+            "poor picture and sound quality",
+            "limited channels and options",
+            "outdated and old equipment",
+            "difficult to operate and use",
+            "poor reception and signal",
+            "small screen and inadequate size",
+            "missing remote control"
+        ],
+        "gym": [
+            "closed or not available",
+            "poor quality and broken equipment",
+            "dirty and unsanitary conditions",
+            "overcrowded and uncomfortable",
+            "inadequate facilities and space",
+            "poor maintenance and upkeep",
+            "limited hours and access",
+            "disappointing overall condition"
+        ],
+        "fitness": [
+            "broken and malfunctioning equipment",
+            "dirty and unsanitary facilities",
+            "overcrowded and uncomfortable",
+            "poor quality and outdated machines",
+            "inadequate variety and options",
+            "poor maintenance and service",
+            "limited access and availability",
+            "disappointing overall experience"
+        ],
+        "window": [
+            "dirty and smudged glass",
+            "broken or damaged frames",
+            "poor insulation and drafts",
+            "difficult to open and close",
+            "inadequate size and lighting",
+            "poor quality and cheap materials",
+            "blocked or obstructed view",
+            "safety concerns and issues"
+        ],
+        "smoke": [
+            "strong cigarette odor throughout",
+            "poor ventilation and circulation",
+            "designated smoking areas dirty",
+            "smoke infiltrating non-smoking rooms",
+            "inadequate air purification",
+            "stale and unpleasant atmosphere",
+            "health concerns and discomfort",
+            "poor enforcement of policies"
+        ],
+        "smell": [
+            "strong and unpleasant odors",
+            "musty and stale atmosphere",
+            "chemical and cleaning smells",
+            "poor ventilation and circulation",
+            "sewage and drainage odors",
+            "food and cooking smells",
+            "cigarette and smoke odors",
+            "overall unpleasant environment"
+        ],
+        "hair": [
+            "previous guests hair everywhere",
+            "dirty and unsanitary conditions",
+            "poor cleaning and housekeeping",
+            "hair in bathroom and shower",
+            "disgusting and unhygienic",
+            "inadequate cleaning standards",
+            "hair on bedding and furniture",
+            "gross and unacceptable condition"
+        ],
+        "bugs": [
+            "cockroaches and insects present",
+            "bed bugs and pest infestation",
+            "poor pest control and management",
+            "unsanitary and dirty conditions",
+            "health hazards and concerns",
+            "disgusting and unacceptable",
+            "inadequate cleaning and maintenance",
+            "unsafe and unhygienic environment"
+        ],
+        "coffee": [
+            "poor quality and terrible taste",
+            "cold and unappetizing",
+            "expensive and overpriced",
+            "limited variety and options",
+            "stale and old coffee",
+            "poor preparation and service",
+            "weak and watered down",
+            "disappointing overall quality"
+        ],
+        "tea": [
+            "poor quality and cheap tea bags",
+            "limited variety and selection",
+            "stale and old tea",
+            "inadequate preparation supplies",
+            "poor taste and quality",
+            "expensive and overpriced",
+            "cold and unappetizing",
+            "disappointing overall experience"
+        ],
+        "alcohol": [
+            "overpriced and expensive drinks",
+            "poor quality and watered down",
+            "limited selection and variety",
+            "slow service and long waits",
+            "poor bartending and preparation",
+            "stale and old ingredients",
+            "disappointing overall quality",
+            "expensive with poor value"
+        ],
+        "towels": [
+            "dirty and stained condition",
+            "thin and poor quality",
+            "inadequate number provided",
+            "rough and uncomfortable texture",
+            "old and worn out appearance",
+            "strong odors and smells",
+            "poor absorbency and quality",
+            "unhygienic and unsanitary"
+        ],
+        "parking": [
+            "extremely expensive and overpriced",
+            "inadequate spaces and availability",
+            "poor security and safety",
+            "difficult access and navigation",
+            "dirty and poorly maintained",
+            "far from hotel entrance",
+            "unclear pricing and policies",
+            "disappointing overall experience"
+        ],
+        "housekeeping": [
+            "poor cleaning and maintenance",
+            "missed areas and surfaces",
+            "rude and unprofessional staff",
+            "inadequate frequency of service",
+            "careless and rushed cleaning",
+            "dirty equipment and supplies",
+            "poor attention to detail",
+            "disappointing overall standards"
+        ],
+        "noise": [
+            "extremely loud and disruptive",
+            "construction and traffic noise",
+            "thin walls and poor insulation",
+            "noisy neighbors and guests",
+            "loud air conditioning and equipment",
+            "street noise and disturbances",
+            "poor soundproofing throughout",
+            "uncomfortable and disturbing"
+        ]
+    },
+    
+    # Review structure templates for variety
+    review_structures=[
+        "The {aspect} was {problem}",
+        "{aspect} had {problem}",
+        "Poor {aspect} with {problem}",
+        "Terrible {aspect} - {problem}",
+        "Disappointed with {aspect} that had {problem}",
+        "{aspect} was disappointing with {problem}",
+        "Awful {aspect} suffering from {problem}",
+        "The {aspect} experienced {problem}",
+        "Unacceptable {aspect} with {problem}",
+        "Bad {aspect} featuring {problem}",
+        "{aspect} in poor condition with {problem}",
+        "Horrible {aspect} plagued by {problem}",
+        "The {aspect} was terrible due to {problem}",
+        "{aspect} completely ruined by {problem}",
+        "Disgusting {aspect} with obvious {problem}",
+        "Shocking {aspect} that showed {problem}",
+        "Appalling {aspect} marked by {problem}",
+        "Dreadful {aspect} contaminated with {problem}",
+        "Pathetic {aspect} destroyed by {problem}",
+        "Repulsive {aspect} overwhelmed by {problem}"
+    ],
+    
+    # Connectors and structure for every aspect after the first
+    connectors=[" and ", " while ", " plus ", " also "],
+    complaint_structures=["{connector}{aspect} with {problem}"],
+    
+    # No closing remarks in this dataset
+    realistic_endings=[],
+    ending_probability=0.0
+)
+
+# Shorter, plainer wording like actual booking.com reviews, used by the CLI
+BOOKING = TemplateSet(
+    "booking",
+    # Comprehensive aspect mapping with synonyms and variations
+    aspect_mappings={
+        "rooms": ["rooms", "room", "suite", "accommodation", "quarters", "small room", "tiny room", "cramped room", "compact room"],
+        "bathrooms": ["bathrooms", "bathroom", "restroom", "wc", "toilet", "washroom", "lavatory"],
+        "shower": ["shower", "showers", "bathtub", "bath", "tub"],
+        "bed": ["bed", "beds", "mattress", "bedding", "sleeping area"],
+        "carpet": ["carpet", "carpets", "flooring", "floor", "rug", "rugs"],
+        "pillows": ["pillows", "pillow", "cushions", "headrest"],
+        "blankets": ["blankets", "blanket", "covers", "bedding", "comforter", "duvet"],
+        "wifi": ["wifi", "wi-fi", "internet", "wireless", "connection", "network"],
+        "elevator": ["elevator", "elevators", "lift", "lifts"],
+        "breakfast": ["breakfast", "morning meal", "buffet", "continental breakfast"],
+        "restaurant": ["restaurant", "dining", "dining room", "eatery", "cafe"],
+        "lobby": ["lobby", "reception area", "entrance", "foyer", "main hall"],
+        "staff": ["staff", "employees", "personnel", "workers", "team", "crew"],
+        "service": ["service", "customer service", "hospitality", "assistance"],
+        "cleaning": ["cleaning", "housekeeping", "maintenance", "upkeep", "sanitation"],
+        "air_conditioning": ["air conditioning", "air con", "ac", "cooling", "climate control", "hvac"],
+        "bar": ["bar", "lounge", "pub", "cocktail bar", "drinks area"],
+        "minibars": ["minibar", "mini bar", "in-room bar", "fridge"],
+        "food": ["food", "meals", "cuisine", "dining", "menu"],
+        "pizza": ["pizza", "pizzas", "italian food"],
+        "drinks": ["drinks", "beverages", "cocktails", "alcohol"],
+        "juice": ["juice", "juices", "fresh juice", "fruit juice"],
+        "guide": ["guide", "tour guide", "concierge", "information"],
+        "transport": ["transport", "transportation", "shuttle", "taxi", "transfer"],
+        "price": ["price", "cost", "rate", "pricing", "fees"],
+        "expensiveness": ["expensive", "overpriced", "costly", "pricey", "charges"],
+        "kettle": ["kettle", "coffee maker", "tea maker", "hot water"],
+        "pool": ["pool", "swimming pool", "spa", "jacuzzi", "hot tub"],
+        "stairs": ["stairs", "staircase", "steps", "stairway"],
+        "reception": ["reception", "front desk", "check-in", "desk", "counter"],
+        "view": ["view", "scenery", "outlook", "window view", "vista"],
+        "extra_charges": ["extra charges", "hidden fees", "additional costs", "surcharges"],
+        "extra_fees": ["extra fees", "additional fees", "hidden charges", "supplements"],
+        "water": ["water", "hot water", "water pressure", "plumbing"],
+        "temperature": ["temperature", "heating", "warmth", "cold", "hot"],
+        "tv": ["tv", "television", "tv set", "entertainment", "cable"],
+        "gym": ["gym", "fitness center", "exercise room", "workout area"],
+        "fitness": ["fitness", "fitness facilities", "exercise equipment", "weights"],
+        "window": ["window", "windows", "glass", "view"],
+        "smoke": ["smoke", "smoking", "cigarette smell", "odor"],
+        "smell": ["smell", "odor", "scent", "aroma", "stench"],
+        "hair": ["hair", "hairs", "dirty hair", "previous guest hair"],
+        "breakfast": ["breakfast", "morning meal", "buffet", "continental breakfast"],
+        "bugs": ["bugs", "insects", "pests", "cockroaches", "ants"],
+        "coffee": ["coffee", "espresso", "cappuccino", "coffee machine"],
+        "tea": ["tea", "herbal tea", "tea bags", "tea service"],
+        "alcohol": ["alcohol", "wine", "beer", "spirits", "liquor"],
+        "towels": ["towels", "towel", "bath towels", "linens"],
+        "parking": ["parking", "parking lot", "valet", "garage"],
+        "housekeeping": ["housekeeping", "room service", "cleaning service", "maid service"],
+        "noise": ["noise", "loud", "sounds", "disturbance", "racket"]
+    },
+    
+    # Problem templates for each aspect category - REALISTIC like actual booking.com reviews
+    problem_templates={
+        "rooms": [
+            "was very small", "was quite small for the price", "was really small", "was a bit small",
+            "was smaller than expected", "was too small", "felt cramped", "not much space",
+            "very basic compared to other hotels", "was old and dated", "needs updating",
+            "was not what we asked for", "furniture felt crammed in", "no storage space",
+            "was hot even when set at lowest temp", "was very cold", "needs a modern upgrade"
+        ],
+        "bathrooms": [
+            "was quite small", "no privacy at all", "door doesn't close properly", "very small",
+            "had no bath", "drain was not functioning well", "needs updating", "was old",
+            "door doesn't lock", "very basic", "needs money spending on this",
+            "could do with updating", "plumbing could do with updating"
+        ],
+        "shower": [
+            "had poor water pressure", "lack of water pressure", "drain was blocked",
+            "was too small", "plumbing could do with updating", "needs updating",
+            "pressure was poor", "was very small", "drain not working properly"
+        ],
+        "bed": [
+            "was not comfy", "was a bit hard", "was quite hard", "wasn't the most comfortable",
+            "was two singles pushed together", "had a gap in the centre", "was small and bit hard",
+            "was not comfortable", "was too small", "mattress was hard", "was uncomfortable"
+        ],
+        "carpet": [
+            "was a bit tatty", "was very worn", "in the hallway was very worn", "was dirty",
+            "was old and dirty", "needs replacing", "was worn through", "was stained"
+        ],
+        "pillows": [
+            "were too small", "were not comfortable", "were quite hard", "were flat",
+            "only one provided", "were old", "were uncomfortable"
+        ],
+        "blankets": [
+            "were thin", "were not warm enough", "were old", "didn't cover the bed properly",
+            "were uncomfortable", "were too small"
+        ],
+        "wifi": [
+            "was very slow", "didn't work in the room", "sucks", "was poor",
+            "no free wifi in the room", "not available in rooms", "was terrible",
+            "keeps disconnecting", "signal was weak", "was unreliable"
+        ],
+        "elevator": [
+            "was quite small", "was very small", "was slow", "only one working",
+            "was out of order", "barely room for two people", "was too small"
+        ],
+        "breakfast": [
+            "was expensive", "was disappointing", "was not very good", "was ok but not excellent",
+            "could be included", "variety was poor", "quality was not good", "was overpriced",
+            "room was quite small", "limited options", "same options every day"
+        ],
+        "restaurant": [
+            "was ok but not excellent", "service made several mistakes", "was average",
+            "food was ok for the price", "had slow service", "staff need to keep regular hours",
+            "no food available after 4pm", "was closed when needed"
+        ],
+        "lobby": [
+            "was quite small", "was old and dated", "needs updating", "was run down",
+            "was crowded", "no seating available"
+        ],
+        "staff": [
+            "was poor", "was rude and unfriendly", "was unhelpful", "couldn't find my booking",
+            "was non cooperative", "had poor attitude", "ignored us", "was unfriendly",
+            "manner was impolite", "one grumpy lady", "need better training", "was rude"
+        ],
+        "service": [
+            "made several mistakes", "was poor", "was slow", "was disappointing",
+            "could be better", "was not helpful", "needs improvement"
+        ],
+        "cleaning": [
+            "was poor", "room wasn't cleaned", "missed areas", "was not thorough",
+            "needs improvement", "housekeeping didn't come"
+        ],
+        "air_conditioning": [
+            "didn't work", "was not good enough", "was too noisy", "couldn't control temperature",
+            "was probably broken", "kept starting in the night", "was very drying",
+            "couldn't make it stop", "remote didn't work", "wasn't working properly"
+        ],
+        "bar": [
+            "no wine available", "was expensive", "room fridge not working", "limited selection",
+            "9 pounds for a glass of wine", "overpriced drinks", "closed early"
+        ],
+        "minibars": [
+            "not restocked daily", "was empty", "no minibar available", "didn't work",
+            "no water available", "items were expensive"
+        ],
+        "food": [
+            "was ok but not more than average", "choice was limited", "was disappointing",
+            "quality was poor", "was overpriced", "no variety"
+        ],
+        "pizza": [
+            "was average", "was overpriced", "took too long", "was disappointing"
+        ],
+        "drinks": [
+            "were overpriced", "limited selection", "no wine in the bar", "were expensive"
+        ],
+        "juice": [
+            "was limited", "only basic options", "was expensive", "not fresh"
+        ],
+        "guide": [
+            "was not helpful", "didn't know the area", "was expensive", "poor service"
+        ],
+        "transport": [
+            "taxi was expensive", "was a rip off", "driver didn't know directions",
+            "was overpriced", "shuttle was unreliable"
+        ],
+        "price": [
+            "was expensive", "poor value for money", "not worth what we paid",
+            "was overpriced", "expensive for what you get"
+        ],
+        "expensiveness": [
+            "everything was expensive", "was overpriced", "poor value", "too expensive"
+        ],
+        "kettle": [
+            "no tea coffee making facilities", "was not working", "was old", "was broken"
+        ],
+        "pool": [
+            "no swimming pool", "was too small", "was closed", "was not clean",
+            "hours were limited", "was overcrowded"
+        ],
+        "stairs": [
+            "were steep and narrow", "carpet was worn", "were difficult to access",
+            "lighting was poor", "were not safe"
+        ],
+        "reception": [
+            "staff couldn't find booking", "was slow", "couldn't help with early check in",
+            "staff was unable to find my booking", "no one picked up phone",
+            "computer system was down", "staff ignored us", "checkout was early"
+        ],
+        "view": [
+            "no view from room", "was of a brick wall", "was not nice", "was disappointing",
+            "was blocked", "faces main road", "was of parking lot", "room had no view"
+        ],
+        "extra_charges": [
+            "parking was expensive", "hidden fees", "charged for everything",
+            "deposit not refunded", "extra costs not mentioned"
+        ],
+        "extra_fees": [
+            "safe box needs payment", "breakfast charged separately", "wifi costs extra",
+            "everything costs extra", "hidden charges"
+        ],
+        "water": [
+            "no hot water", "pressure was poor", "was brown", "tasted bad",
+            "limited hot water", "kept running out"
+        ],
+        "temperature": [
+            "room was very hot", "was too cold", "couldn't control", "heating didn't work",
+            "was uncomfortable", "thermostat didn't work"
+        ],
+        "tv": [
+            "no English channels", "was very small", "was old", "channels were limited",
+            "didn't work properly", "was from the 1990s"
+        ],
+        "gym": [
+            "was closed", "equipment was old", "was too small", "limited hours",
+            "was not available", "needs updating"
+        ],
+        "fitness": [
+            "equipment was broken", "was not available", "limited facilities",
+            "needs updating", "was disappointing"
+        ],
+        "window": [
+            "single glazed", "curtain was damaged", "couldn't open", "was broken",
+            "cold air coming through", "needs double glazing"
+        ],
+        "smoke": [
+            "smell in room", "from other rooms", "in hallways", "ventilation poor"
+        ],
+        "smell": [
+            "was unpleasant", "from cooking", "musty odor", "needed better ventilation"
+        ],
+        "hair": [
+            "in bathroom", "on towels", "in drain", "from previous guests"
+        ],
+        "breakfast": [
+            "was expensive", "was disappointing", "limited variety", "quality was poor",
+            "room was small", "waiting for tables", "same every day"
+        ],
+        "bugs": [
+            "in the room", "in bathroom", "need pest control", "quite a problem"
+        ],
+        "coffee": [
+            "no facilities in room", "was expensive", "quality was poor", "machine broken"
+        ],
+        "tea": [
+            "no facilities in room", "was expensive", "limited options", "quality poor"
+        ],
+        "alcohol": [
+            "was overpriced", "limited selection", "quality was poor", "bar closed early"
+        ],
+        "towels": [
+            "were old", "were thin", "not enough provided", "were dirty",
+            "needed replacing", "were small"
+        ],
+        "parking": [
+            "was expensive", "no spaces available", "was far from hotel",
+            "costs more than room", "difficult to find"
+        ],
+        "housekeeping": [
+            "entered without permission", "didn't clean properly", "was poor",
+            "didn't come daily", "missed areas"
+        ],
+        "noise": [
+            "from next room", "from outside", "construction work nearby",
+            "from main road", "thin walls", "poor soundproofing", "traffic noise",
+            "from other guests", "woke us up early"
+        ]
+    },
+    
+    # Review structure templates - REALISTIC like actual booking.com reviews
+    review_structures=[
+        "The {aspect} {problem}",
+        "{aspect} {problem}",
+        "The {aspect} was {problem}",
+        "Really the only thing I can fault was the {aspect} it {problem}",
+        "To be really picky the {aspect} {problem}",
+        "Would have liked the {aspect} not {problem}",
+        "I thought that the {aspect} {problem}",
+        "The {aspect} {problem} but not a massive deal",
+        "Choice of {aspect}",
+        "No {aspect}",
+        "{aspect} could be {problem}",
+        "Extremely {problem} {aspect}",
+        "Sound proofing is poor {aspect} {problem}",
+        "Needs {problem} {aspect}",
+        "I cannot believe {aspect} {problem}",
+        "Calling {aspect} {problem}",
+        "Dated {aspect} and {problem}",
+        "Didn't realize but {aspect} {problem}",
+        "The {aspect} {problem}",
+        "Very peculiar {aspect} {problem}",
+        "The {aspect} was quite {problem}",
+        "Found the {aspect} {problem}",
+        "Not a single bad thing except {aspect} {problem}",
+        "For sure not {problem} {aspect}",
+        "Just the {aspect} {problem}",
+        "The first ever hotel with {aspect} {problem}",
+        "The {aspect} {problem} well below standard",
+        "11:00 is an early {aspect}",
+        "Maybe the {aspect} {problem}",
+        "Wi Fi {problem}",
+        "This should not be {problem}",
+        "The only problem we had was {aspect} {problem}",
+        "expensive {aspect}",
+        "The property is a bit dated with {aspect} {problem}",
+        "Asked for {aspect} but got {problem}",
+        "Every thing is fine except the {aspect} {problem}",
+        "Aircon {problem}",
+        "Small {aspect} only but not a big deal",
+        "The staff at {aspect} {problem}",
+        "BREAKFAST {problem}",
+        "Rooms are not very well {problem}",
+        "Room was a little {problem}",
+        "The neighbourhood {problem}",
+        "9 pounds for a {aspect}",
+        "Very unfriendly {aspect} {problem}",
+        "I still haven't got my {aspect} {problem}",
+        "The room was {problem}",
+        "Just round the back is {aspect} {problem}",
+        "Rooms could be a bit {problem}",
+        "For sure not a 4 star hotel the {aspect} {problem}",
+        "The first ever hotel I have stayed in with {aspect} {problem}",
+        "Just the bare essentials {aspect} {problem}",
+        "No {aspect} {problem}",
+        "Room was {problem}",
+        "The room and {aspect} were {problem}",
+        "The lift is quite {problem}",
+        "Small {aspect}",
+        "Our room was really {problem}",
+        "The price of {aspect} {problem}",
+        "Harassment on {aspect}",
+        "location is a bit {problem}",
+        "Small room Small {aspect}",
+        "I thought that the {aspect} was a little {problem}",
+        "1 {aspect} {problem}",
+        "no {aspect} available in the room",
+        "Bed was {problem}",
+        "Quicker {aspect} {problem}",
+        "Bed was a bit {problem}",
+        "Small bathroom {aspect} {problem}",
+        "One of the booked rooms was very {problem}",
+        "Slow service for {aspect}",
+        "The property is a bit {problem}",
+        "Asked for a double bed but got {aspect} {problem}",
+        "Two people on {aspect} {problem}",
+        "The {aspect} quality was not good enough",
+        "Every thing is fine except the {aspect} {problem}",
+        "Small {aspect} only",
+        "The staff at the {aspect} {problem}",
+        "BREAKFAST NOT VERY {problem}",
+        "Room was a little {problem}",
+        "The {aspect} is very bad",
+        "9 for a glass of {aspect}",
+        "Very unfriendly {aspect} {problem}",
+        "I still haven't got my {aspect} {problem}",
+        "The room was {problem}",
+        "Rooms could be a bit {problem}",
+        "For sure not a 4 star {aspect} {problem}",
+        "No {aspect} {problem}",
+        "Just the bare essentials {aspect} {problem}",
+        "No {aspect} {problem} facilities in room",
+        "Room was {problem}",
+        "The {aspect} was awful and {problem}",
+        "The lift is quite {problem} Free {aspect} is very {problem}",
+        "Small {aspect}",
+        "Our room was really {problem}",
+        "Bed was {problem} Hassle with {aspect}",
+        "Small {aspect} {problem}",
+        "The property is a bit {problem} with {aspect} {problem}",
+        "Every thing is fine in this hotel except the {aspect} {problem}",
+        "Reception {aspect} was {problem}",
+        "Small {aspect} only but not a big deal",
+        "The {aspect} was {problem}",
+        "BREAKFAST {problem}",
+        "Rooms are not very well {problem}",
+        "The {aspect} is very {problem}"
+    ],
+    
+    # Realistic connectors used in actual reviews
+    connectors=[
+        " ", " The ", " Also ", " Also the ", " ", " Really the only thing ",
+        " To be really picky ", " ", " I thought that ", " ", " Would have liked ",
+        " ", " No ", " ", " Maybe the ", " ", " Just the ", " "
+    ],
+    
+    # More realistic complaint structures for every aspect after the first
+    complaint_structures=[
+        "{connector}{aspect} {problem}",
+        "{connector}the {aspect} {problem}",
+        "{connector}{aspect} was {problem}",
+        "{connector}{aspect} {problem} but not a big deal"
+    ],
+    
+    # Realistic but less dramatic endings, added to 15% of multi-aspect reviews
+    realistic_endings=[
+        " Will not go back here again",
+        " but not a massive deal though",
+        " Not a big deal but worth mentioning",
+        " Otherwise everything was fine",
+        " Apart from that it was ok",
+        ""  # Most reviews don't have endings
+    ],
+    ending_probability=0.15
+)
+
+TEMPLATE_SETS = {templates.name: templates for templates in (STANDARD, BOOKING)}
@@ -0,0 +1,187 @@
+import asyncio
+import gzip
+import os
+import re
+import shutil
+
+import anyio
+from starlette.responses import FileResponse
+
+# Media type of each part file extension; compressed parts are sent as they are
+MEDIA_TYPES = {".json": "application/json", ".jsonl": "application/x-ndjson", ".md": "text/markdown",
+               ".parquet": "application/vnd.apache.parquet", ".arrow": "application/vnd.apache.arrow.file",
+               ".gz": "application/gzip", ".zst": "application/zstd"}
+
+# Text files that get a gzip compressed copy to send to clients accepting gzip
+GZIP_VARIANT_EXTENSIONS = (".json", ".jsonl", ".md")
+# Directory the copies are kept in, next to the files, where no part name can reach them
+GZIP_VARIANT_DIR = ".gzip-variants"
+
+# A single range; several ranges in one header are answered with the whole file
+_BYTE_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+# Held while the gzip copy of a file is written, so it is compressed once;
+# each entry is [lock, number of requests using it] and goes once unused
+_compress_locks = {}
+
+def _byte_range(header, size):
+    """(start, stop) of the bytes a Range header asks for, or None to send the whole file
+    
+    Headers that are malformed or ask for several ranges are ignored, as
+    HTTP allows. Raises ValueError for a range that starts past the end.
+    """
+    match = _BYTE_RANGE.match(header.strip()) if header else None
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # A suffix range, the last bytes of the file
+        if int(last) == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - int(last)), size
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, (min(int(last) + 1, size) if last else size)
+
+def _etag_matches(header, etag):
+    """Whether an If-None-Match header lists etag, comparing weakly"""
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+class PartFileResponse(FileResponse):
+    """FileResponse that answers Range, If-Range and If-None-Match requests
+    
+    A single byte range is sent as a 206, so a large file can be fetched in
+    parallel ranges or resumed after a dropped connection; If-Range makes
+    sure the file hasn't changed in between. A matching If-None-Match gets
+    a 304. Servers offering the ASGI zero-copy send extension send the file
+    with sendfile, others get it in chunks read on a worker thread.
+    """
+    
+    def __init__(self, path, stat_result, request_headers, filename, content_encoding=None):
+        media_type = MEDIA_TYPES.get(os.path.splitext(filename)[1], "application/octet-stream")
+        super().__init__(path, stat_result=stat_result, filename=filename, media_type=media_type)
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["vary"] = "Accept-Encoding"
+        if content_encoding is not None:
+            self.headers["content-encoding"] = content_encoding
+        self.range = None
+        
+        size = stat_result.st_size
+        etag = self.headers["etag"]
+        if _etag_matches(request_headers.get("if-none-match"), etag):
+            self.status_code = 304
+            del self.headers["content-length"]
+            return
+        
+        # A range of a file that changed since the client's first request would mix two versions
+        if_range = request_headers.get("if-range")
+        if if_range is not None and if_range not in (etag, self.headers["last-modified"]):
+            return
+        try:
+            self.range = _byte_range(request_headers.get("range"), size)
+        except ValueError:
+            self.status_code = 416
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            return
+        if self.range is not None:
+            start, stop = self.range
+            self.status_code = 206
+            self.headers["content-range"] = f"bytes {start}-{stop - 1}/{size}"
+            self.headers["content-length"] = str(stop - start)
+    
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD" or self.status_code in (304, 416):
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        
+        start, stop = self.range or (0, self.stat_result.st_size)
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions:
+            with open(self.path, "rb") as file:
+                await send({"type": "http.response.zerocopysend", "file": file, "offset": start,
+                            "count": stop - start, "more_body": False})
+        elif "http.response.pathsend" in extensions and self.range is None:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+        else:
+            async with await anyio.open_file(self.path, "rb") as file:
+                await file.seek(start)
+                remaining = stop - start
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        # The file shrank since it was opened
+                        break
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0 or stop == start:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+def _write_gzip_variant(path, gz_path, mtime_ns):
+    """Compress path to gz_path, stamped with its modification time to tell when it goes stale"""
+    os.makedirs(os.path.dirname(gz_path), exist_ok=True)
+    tmp_path = gz_path + ".tmp"
+    with open(path, "rb") as source, open(tmp_path, "wb") as raw:
+        with gzip.GzipFile(os.path.basename(path), "wb", 6, raw, mtime=0) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+    os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+    os.replace(tmp_path, gz_path)
+
+async def _gzip_variant(path, stat_result):
+    """Path and stat of the gzip copy of path, written when first asked for and again once path changed"""
+    gz_path = os.path.join(os.path.dirname(path), GZIP_VARIANT_DIR, os.path.basename(path) + ".gz")
+    entry = _compress_locks.setdefault(gz_path, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            try:
+                gz_stat = await asyncio.to_thread(os.stat, gz_path)
+                if gz_stat.st_mtime_ns == stat_result.st_mtime_ns:
+                    return gz_path, gz_stat
+            except FileNotFoundError:
+                pass
+            await asyncio.to_thread(_write_gzip_variant, path, gz_path, stat_result.st_mtime_ns)
+            return gz_path, await asyncio.to_thread(os.stat, gz_path)
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _compress_locks[gz_path]
+
+def remove_gzip_variants(output_dir):
+    """Remove the gzip copies of the files in output_dir, before a job replaces them"""
+    shutil.rmtree(os.path.join(output_dir, GZIP_VARIANT_DIR), ignore_errors=True)
+
+def _accepts_gzip(header):
+    """Whether an Accept-Encoding header accepts gzip, with a weight above 0"""
+    for coding in (header or "").split(","):
+        name, _, weight = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            weight = weight.strip().removeprefix("q=")
+            try:
+                return not weight or float(weight) > 0
+            except ValueError:
+                return False
+    return False
+
+async def part_file_response(path, request_headers):
+    """Response sending the file at path, or its gzip copy to a client accepting gzip
+    
+    Range and If-Range requests always get the file itself, as clients
+    compute their ranges from its listed size. Raises FileNotFoundError when
+    the file is gone.
+    """
+    stat_result = await asyncio.to_thread(os.stat, path)
+    filename = os.path.basename(path)
+    ranged = "range" in request_headers or "if-range" in request_headers
+    if (filename.endswith(GZIP_VARIANT_EXTENSIONS) and not ranged
+            and _accepts_gzip(request_headers.get("accept-encoding"))):
+        gz_path, gz_stat = await _gzip_variant(path, stat_result)
+        return PartFileResponse(gz_path, gz_stat, request_headers, filename, content_encoding="gzip")
+    return PartFileResponse(path, stat_result, request_headers, filename)
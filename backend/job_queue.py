@@ -0,0 +1,312 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from dataset_generator import GenerationCancelled, run_generation_job
+from downloads import remove_gzip_variants
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATES = ("queued", "running")
+# Jobs that stopped early and can continue from their last checkpoint
+RESUMABLE_STATES = ("cancelled", "failed")
+# How long a server shutdown waits for running jobs to stop at their next progress report
+SHUTDOWN_GRACE_SECONDS = 10.0
+
+class OutputDirInUse(Exception):
+    """Raised when a job would write to the output directory of another active job"""
+
+class GenerationJob:
+    """One generation request together with its current status"""
+    
+    def __init__(self, params, priority=0, job_id=None, status=None):
+        self.id = job_id or str(uuid.uuid4())
+        self.params = params
+        self.priority = priority
+        self.cancel_event = None
+        self.status = status or {
+            "job_id": self.id,
+            "state": "queued",
+            "priority": priority,
+            "params": params,
+            "created_at": datetime.utcnow(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "is_running": False,
+            "progress": 0,
+            "total": params["total_reviews"],
+            "current_phase": "Queued",
+            "completed": False,
+            "files_created": [],
+            "elapsed_seconds": 0.0,
+            "reviews_per_second": 0.0,
+            "eta_seconds": None,
+            "phase_timings": {},
+            "duplicates": None,
+            "profile": None,
+            "pipeline": None,
+            "cache_hit": False
+        }
+    
+    @property
+    def state(self):
+        return self.status["state"]
+
+class JobQueue:
+    """Run generation jobs in a bounded process pool, at most max_workers at a time
+    
+    Jobs with a higher priority start first, jobs of equal priority start in
+    the order they were submitted. Every status change is saved to the Mongo
+    collection and passed to on_update as (job, changes). A job whose
+    dataset is already in cache is served from it without generating.
+    """
+    
+    def __init__(self, collection, max_workers=2, on_update=None, cache=None):
+        self.collection = collection
+        self.max_workers = max_workers
+        self.on_update = on_update
+        self.cache = cache
+        self.jobs = {}
+        self._pending = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._runners = []
+        self._pool = None
+        self._manager = None
+        self._stopping = False
+    
+    async def start(self):
+        """Start the worker pool, then restore unfinished jobs from the collection"""
+        # spawn, because forking a process that already runs the event loop and
+        # the Mongo client threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        # Workers run at a lower priority so API requests win the CPU
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context,
+                                         initializer=os.nice, initargs=(10,))
+        self._manager = context.Manager()
+        
+        documents = self.collection.find({"state": {"$in": list(ACTIVE_STATES)}}, {"_id": 0})
+        async for document in documents.sort("created_at", 1):
+            job = GenerationJob(document["params"], document["priority"], document["job_id"], document)
+            self.jobs[job.id] = job
+            if job.state == "running":
+                # The process that was running it went away with the old server
+                await self._finish(job, {"state": "failed", "current_phase": "Interrupted",
+                                         "error": "Interrupted by a server restart"})
+            else:
+                self._enqueue(job)
+        
+        self._runners = [asyncio.create_task(self._run_jobs()) for _ in range(self.max_workers)]
+    
+    async def shutdown(self, grace=SHUTDOWN_GRACE_SECONDS):
+        """Stop running jobs, record their final state and shut the worker pool down
+        
+        Running jobs are asked to stop and get grace seconds to do so, which
+        they do at their next progress report. A job that finishes in that
+        time is recorded as completed, every other one as cancelled, so it
+        can be resumed from its last checkpoint. Queued jobs stay queued and
+        are restored on the next start. The pool is shut down without
+        waiting for its processes.
+        """
+        self._stopping = True
+        running = [job for job in self.jobs.values() if job.state == "running"]
+        for job in running:
+            if job.cancel_event is not None:
+                job.cancel_event.set()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + grace
+        while any(job.id in self.jobs for job in running) and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+        
+        for runner in self._runners:
+            runner.cancel()
+        await asyncio.gather(*self._runners, return_exceptions=True)
+        for job in running:
+            if job.id in self.jobs:
+                await self._finish(job, {"state": "cancelled", "current_phase": "Stopped by a server shutdown"})
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+    
+    async def submit(self, params, priority=0):
+        """Persist a new job and queue it
+        
+        Raises OutputDirInUse when another active job writes to its output
+        directory. The check and the registration of the job happen before
+        anything is awaited, so two requests can't both pass it.
+        """
+        if self.is_output_dir_in_use(params["output_dir"]):
+            raise OutputDirInUse(params["output_dir"])
+        job = GenerationJob(params, priority)
+        self.jobs[job.id] = job
+        try:
+            await self.collection.insert_one(dict(job.status))
+        except BaseException:
+            self.jobs.pop(job.id, None)
+            raise
+        self._enqueue(job)
+        return job
+    
+    async def get(self, job_id):
+        """Status of one job, from memory while it is active and from Mongo after"""
+        if job_id in self.jobs:
+            return self.jobs[job_id].status
+        return await self.collection.find_one({"job_id": job_id}, {"_id": 0})
+    
+    async def list_jobs(self, limit=100):
+        """Statuses of the most recently submitted jobs, newest first"""
+        documents = self.collection.find({}, {"_id": 0}).sort("created_at", -1)
+        statuses = await documents.to_list(limit)
+        # Active jobs have fresher progress in memory than their last saved copy
+        return [self.jobs[status["job_id"]].status if status["job_id"] in self.jobs else status
+                for status in statuses]
+    
+    async def cancel(self, job_id):
+        """Drop a queued job or ask a running one to stop
+        
+        Returns the job, or None if it is not active.
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if job.state == "queued":
+            await self._finish(job, {"state": "cancelled", "current_phase": "Cancelled"})
+        elif job.cancel_event is not None:
+            job.cancel_event.set()
+            await self._update(job, {"current_phase": "Cancelling"})
+        return job
+    
+    async def resume(self, job_id):
+        """Queue a cancelled or failed job again to continue from its last checkpoint
+        
+        Returns the job, or None if there is no such job that can be resumed.
+        Raises OutputDirInUse when another active job writes to its output
+        directory.
+        """
+        if job_id in self.jobs:
+            return None
+        status = await self.collection.find_one({"job_id": job_id}, {"_id": 0})
+        # Checked again, with no await until the job is registered, as another request may have resumed it
+        if status is None or status["state"] not in RESUMABLE_STATES or job_id in self.jobs:
+            return None
+        if self.is_output_dir_in_use(status["params"]["output_dir"]):
+            raise OutputDirInUse(status["params"]["output_dir"])
+        
+        params = dict(status["params"], resume=True)
+        job = GenerationJob(params, status["priority"], job_id, status)
+        self.jobs[job.id] = job
+        await self._update(job, {"state": "queued", "params": params, "current_phase": "Queued",
+                                 "error": None, "finished_at": None})
+        self._enqueue(job)
+        return job
+    
+    def count(self, state):
+        """Number of active jobs in the given state"""
+        return sum(1 for job in self.jobs.values() if job.state == state)
+    
+    def is_output_dir_in_use(self, output_dir):
+        """Whether an active job already writes to output_dir"""
+        output_dir = os.path.abspath(output_dir)
+        return any(os.path.abspath(job.params["output_dir"]) == output_dir
+                   for job in self.jobs.values() if job.state in ACTIVE_STATES)
+    
+    def _enqueue(self, job):
+        self._pending.put_nowait((-job.priority, next(self._sequence), job))
+    
+    async def _run_jobs(self):
+        while True:
+            _, _, job = await self._pending.get()
+            if self._stopping:
+                return  # left queued for the next start
+            if job.state != "queued":
+                continue  # cancelled while it was waiting
+            try:
+                await self._run(job)
+            except Exception as e:
+                logger.exception("Generation job %s failed", job.id)
+                await self._finish(job, {"state": "failed", "current_phase": f"Error: {str(e)}", "error": str(e)})
+    
+    async def _run(self, job):
+        # Gzip copies of the files this job replaces would only take up space
+        await asyncio.to_thread(remove_gzip_variants, job.params["output_dir"])
+        # The job stays queued, and can be cancelled, until it starts running
+        if job.state != "queued":
+            return
+        
+        # A resumed job has parts of its own on disk and a profiled job has to
+        # run to be profiled, so both always generate
+        cache_key = None
+        if self.cache is not None and not job.params["resume"] and job.params["profile"] is None:
+            cache_key = self.cache.key(job.params)
+        if cache_key is not None:
+            file_paths = await asyncio.to_thread(self.cache.fetch, cache_key, job.params["output_dir"])
+            if job.state != "queued":
+                return
+            if file_paths is not None:
+                await self._finish(job, {"state": "completed", "current_phase": "Completed", "completed": True,
+                                         "progress": job.params["total_reviews"], "files_created": file_paths,
+                                         "cache_hit": True})
+                return
+        
+        progress_queue = self._manager.Queue()
+        job.cancel_event = self._manager.Event()
+        await self._update(job, {"state": "running", "is_running": True, "current_phase": "Initializing",
+                                 "started_at": datetime.utcnow()})
+        
+        # Await the worker process while applying its progress reports
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool, run_generation_job, job.params, progress_queue, job.cancel_event)
+        try:
+            while True:
+                done, _ = await asyncio.wait({future}, timeout=0.25)
+                await self._drain(job, progress_queue)
+                if done:
+                    break
+            file_paths = future.result()
+        except GenerationCancelled:
+            phase = "Stopped by a server shutdown" if self._stopping else "Cancelled"
+            await self._finish(job, {"state": "cancelled", "current_phase": phase})
+        else:
+            await self._finish(job, {"state": "completed", "current_phase": "Completed", "completed": True,
+                                     "files_created": file_paths})
+            print(f"Job {job.id} completed! Generated {job.params['total_reviews']} reviews "
+                  f"in {len(file_paths)-1} files")
+            if cache_key is not None:
+                try:
+                    await asyncio.to_thread(self.cache.store, cache_key, file_paths)
+                except OSError:
+                    logger.exception("Could not cache the dataset of generation job %s", job.id)
+        finally:
+            job.cancel_event = None
+    
+    async def _drain(self, job, progress_queue):
+        """Merge every pending progress report of a job into its status"""
+        changes = {}
+        while True:
+            try:
+                changes.update(progress_queue.get_nowait())
+            except queue.Empty:
+                break
+        if changes:
+            await self._update(job, changes)
+    
+    async def _finish(self, job, changes):
+        changes.update({"is_running": False, "finished_at": datetime.utcnow()})
+        await self._update(job, changes)
+        # Finished jobs are served from Mongo from now on
+        self.jobs.pop(job.id, None)
+    
+    async def _update(self, job, changes):
+        job.status.update(changes)
+        if self.on_update is not None:
+            self.on_update(job, changes)
+        try:
+            await self.collection.update_one({"job_id": job.id}, {"$set": changes})
+        except Exception:
+            logger.exception("Could not save the status of generation job %s", job.id)
@@ -0,0 +1,126 @@
+import os
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from pymongo import monitoring
+
+# Generation jobs last from seconds to hours
+PHASE_BUCKETS = (0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+
+REVIEWS_GENERATED = Counter(
+    "generation_reviews_generated_total", "Reviews generated by finished and running jobs")
+BYTES_WRITTEN = Counter(
+    "generation_bytes_written_total", "Bytes of dataset files written by completed jobs",
+    ["format", "compression"])
+JOBS_FINISHED = Counter(
+    "generation_jobs_finished_total", "Generation jobs that stopped, by their final state", ["state"])
+CACHE_HITS = Counter(
+    "generation_cache_hits_total", "Generation jobs served from the dataset cache")
+PHASE_DURATION = Histogram(
+    "generation_phase_duration_seconds", "Seconds a generation job spent in each phase",
+    ["phase"], buckets=PHASE_BUCKETS)
+QUEUE_DEPTH = Gauge(
+    "generation_queue_depth", "Generation jobs waiting for a worker")
+JOBS_RUNNING = Gauge(
+    "generation_jobs_running", "Generation jobs running in the worker pool")
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Seconds until the response of an API request started",
+    ["method", "route", "status"])
+MONGO_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "Seconds MongoDB took to answer a command",
+    ["command", "outcome"], buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+
+FINAL_STATES = ("completed", "cancelled", "failed")
+
+class JobMetrics:
+    """Turn the status changes of generation jobs into metrics
+    
+    Job workers only report their progress, so the reviews generated are
+    the increase of each running job's progress between two reports.
+    """
+    
+    def __init__(self):
+        self._progress = {}
+    
+    def track_queue(self, job_queue):
+        """Read the queue depth and running jobs from job_queue at every scrape"""
+        QUEUE_DEPTH.set_function(lambda: job_queue.count("queued"))
+        JOBS_RUNNING.set_function(lambda: job_queue.count("running"))
+    
+    def on_update(self, job, changes):
+        state = changes.get("state")
+        if state == "running":
+            # A resumed job starts from the progress it had already reported
+            self._progress[job.id] = job.status["progress"]
+        
+        if "progress" in changes and job.id in self._progress:
+            REVIEWS_GENERATED.inc(max(0, changes["progress"] - self._progress[job.id]))
+            self._progress[job.id] = changes["progress"]
+        
+        if state in FINAL_STATES:
+            self._progress.pop(job.id, None)
+            JOBS_FINISHED.labels(state).inc()
+            if changes.get("cache_hit"):
+                CACHE_HITS.inc()
+                return
+            for phase, seconds in job.status["phase_timings"].items():
+                PHASE_DURATION.labels(phase).observe(seconds)
+            if state == "completed":
+                BYTES_WRITTEN.labels(job.params["output_format"], job.params["compression"] or "none").inc(
+                    sum(os.path.getsize(path) for path in changes["files_created"] if os.path.exists(path)))
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Time every command the Mongo client sends, by command name"""
+    
+    def started(self, event):
+        pass
+    
+    def succeeded(self, event):
+        MONGO_LATENCY.labels(event.command_name, "ok").observe(event.duration_micros / 1e6)
+    
+    def failed(self, event):
+        MONGO_LATENCY.labels(event.command_name, "error").observe(event.duration_micros / 1e6)
+
+class RequestLatencyMiddleware:
+    """Time requests to the routes under path_prefix until their response starts
+    
+    Routes are labelled by their template, such as /api/generation/jobs/{job_id},
+    so job ids don't each get a series. Streaming responses are timed until
+    their first bytes, not for as long as they stay open.
+    """
+    
+    def __init__(self, app, path_prefix="/api/generation/"):
+        self.app = app
+        self.path_prefix = path_prefix
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        responded = False
+        
+        def observe(status):
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(scope["method"], route.path if route is not None else "unmatched",
+                                   status).observe(time.perf_counter() - started)
+        
+        async def timed_send(message):
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = True
+                observe(message["status"])
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, timed_send)
+        except Exception:
+            # The server turns the exception into a 500 further out
+            if not responded:
+                observe(500)
+            raise
+
+def render():
+    """Every metric in the Prometheus text format, with its content type"""
+    return generate_latest(), CONTENT_TYPE_LATEST
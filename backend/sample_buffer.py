@@ -0,0 +1,62 @@
+import asyncio
+import collections
+import contextlib
+import threading
+
+class SampleBuffer:
+    """Ring buffer of generated reviews, refilled in the background, for samples and test batches
+    
+    take hands out reviews that are already built, so a request costs about
+    the same however many it asks for, up to the buffer's size. Once fewer
+    than watermark reviews are left, a background task generates more on a
+    worker thread, refill_batch at a time, until the buffer is full again.
+    A request for more reviews than are left gets the rest generated on a
+    worker thread, never on the event loop.
+    """
+    
+    def __init__(self, generator, size=2000, watermark=1000, refill_batch=200):
+        if not 0 <= watermark <= size:
+            raise ValueError("The refill watermark must lie between 0 and the buffer size")
+        self.generator = generator
+        self.size = size
+        self.watermark = watermark
+        self.refill_batch = refill_batch
+        # Only the event loop adds or takes reviews; threads just build them
+        self.reviews = collections.deque(maxlen=size)
+        # The generator's RNG is shared by the refill and on-demand threads
+        self._lock = threading.Lock()
+        self._low = asyncio.Event()
+        self._task = None
+    
+    async def start(self):
+        """Fill the buffer in the background and keep it above the watermark"""
+        self._low.set()
+        self._task = asyncio.create_task(self._refill())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+    
+    async def take(self, count):
+        """count reviews with ids from 1, taken from the buffer and generated for what it lacks"""
+        taken = [self.reviews.popleft() for _ in range(min(count, len(self.reviews)))]
+        if len(self.reviews) < self.watermark:
+            self._low.set()
+        if len(taken) < count:
+            taken += await asyncio.to_thread(self._generate, count - len(taken))
+        return [dict(review, review_id=review_id) for review_id, review in enumerate(taken, 1)]
+    
+    def _generate(self, count):
+        with self._lock:
+            return [self.generator.generate_single_review(0) for _ in range(count)]
+    
+    async def _refill(self):
+        while True:
+            await self._low.wait()
+            self._low.clear()
+            while len(self.reviews) < self.size:
+                count = min(self.refill_batch, self.size - len(self.reviews))
+                self.reviews.extend(await asyncio.to_thread(self._generate, count))
@@ -1,45 +1,132 @@
-from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks
+from fastapi import FastAPI, APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Literal, Optional
 import uuid
 from datetime import datetime
-import json
 import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+import random
+import zlib
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from dataset_generator import HotelReviewDatasetGenerator
+from dataset_generator import (COMPRESSIONS, DEDUP_MODES, DEFAULT_WRITERS, ENGINES, OUTPUT_FORMATS, PROFILE_MODES,
+                               SERIALIZERS, HotelReviewDatasetGenerator, JSONSerializer)
+from dataset_generator.dedup import _check_dedup_options
+from dataset_generator.output import _check_output_options
+from job_queue import JobQueue, OutputDirInUse
+from dataset_cache import DatasetCache
+from downloads import part_file_response
+from sample_buffer import SampleBuffer
+from metrics import JobMetrics, MongoCommandMetrics, RequestLatencyMiddleware, render as render_metrics
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# Every Mongo command is timed for the metrics
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()])
 db = client[os.environ['DB_NAME']]
 
+# Responses and status events are encoded by orjson or msgspec when installed,
+# JSON_SERIALIZER picks one and JSON_COMPAT=1 keeps floats as the json module writes them
+api_serializer = JSONSerializer(os.environ.get("JSON_SERIALIZER") or None,
+                                compat=os.environ.get("JSON_COMPAT") == "1")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded by api_serializer"""
+    
+    def render(self, content):
+        return api_serializer.dumps(content)
+
 # Create the main app without a prefix
-app = FastAPI(title="Hotel Review Dataset Generator")
+app = FastAPI(title="Hotel Review Dataset Generator", default_response_class=FastJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# Global variables for tracking generation progress
+# Status of the most recently submitted generation job, as shown on the dashboard
 generation_status = {
+    "job_id": None,
+    "state": "idle",
     "is_running": False,
     "progress": 0,
     "total": 0,
     "current_phase": "",
     "completed": False,
-    "files_created": []
+    "files_created": [],
+    "elapsed_seconds": 0.0,
+    "reviews_per_second": 0.0,
+    "eta_seconds": None,
+    "phase_timings": {},
+    "duplicates": None,
+    "profile": None,
+    "pipeline": None,
+    "cache_hit": False
 }
 
+# Every open /generation/events stream has a bounded queue of encoded events
+status_watchers = set()
+WATCHER_QUEUE_SIZE = 32
+HEARTBEAT_SECONDS = 15
+
+def encode_status_event(status):
+    """Encode a status dict as one Server-Sent Events message"""
+    return f"data: {api_serializer.dumps(status).decode('utf-8')}\n\n"
+
+def update_status(changes):
+    """Apply changes to the generation status and push what changed to every watcher
+    
+    Only the event loop writes generation_status, so the status endpoint
+    reads it without any locking. The delta is encoded once however many
+    watchers there are. A watcher whose queue is full has fallen behind, so
+    its backlog is replaced by a single full snapshot.
+    """
+    delta = {key: value for key, value in changes.items() if generation_status.get(key) != value}
+    generation_status.update(delta)
+    if not delta or not status_watchers:
+        return
+    
+    event = encode_status_event(delta)
+    for watcher in status_watchers:
+        try:
+            watcher.put_nowait(event)
+        except asyncio.QueueFull:
+            while not watcher.empty():
+                watcher.get_nowait()
+            watcher.put_nowait(encode_status_event(generation_status))
+
+def follow_latest_job(job, changes):
+    """Mirror status changes of the most recently submitted job into generation_status"""
+    if job.id == generation_status["job_id"]:
+        update_status({key: value for key, value in changes.items() if key in generation_status})
+
+# Counters and histograms of every job, served at /metrics
+job_metrics = JobMetrics()
+
+def on_job_update(job, changes):
+    follow_latest_job(job, changes)
+    job_metrics.on_update(job, changes)
+
+# Finished seeded datasets are kept and reused for identical requests
+dataset_cache = DatasetCache(os.environ.get("DATASET_CACHE_DIR", str(ROOT_DIR / "dataset_cache")),
+                             int(os.environ.get("DATASET_CACHE_MAX_BYTES", str(5 * 1024 ** 3))),
+                             HotelReviewDatasetGenerator().template_fingerprint())
+
+# Generation jobs run concurrently in a bounded process pool
+job_queue = JobQueue(db.generation_jobs, max_workers=int(os.environ.get("GENERATION_MAX_JOBS", "2")),
+                     on_update=on_job_update, cache=dataset_cache)
+job_metrics.track_queue(job_queue)
+
 # Models
 class StatusCheck(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -50,21 +137,81 @@ class StatusCheckCreate(BaseModel):
     client_name: str
 
 class DatasetGenerationRequest(BaseModel):
-    total_reviews: int = 750000
-    chunk_size: int = 50000
+    total_reviews: int = Field(750000, gt=0)
+    chunk_size: int = Field(50000, gt=0)
     output_dir: str = "dataset_parts"
+    workers: int = Field(1, gt=0)
+    # Threads writing parts while generation continues, when workers is 1
+    writer_threads: int = Field(DEFAULT_WRITERS, ge=0)
+    seed: Optional[int] = None
+    engine: Literal[ENGINES] = "python"
+    output_format: Literal[tuple(OUTPUT_FORMATS)] = "json"
+    compression: Optional[Literal[tuple(name for name in COMPRESSIONS if name)]] = None
+    include_structure_id: bool = False
+    dedup: Optional[Literal[tuple(mode for mode in DEDUP_MODES if mode)]] = None
+    uniqueness_target: Optional[float] = None
+    profile: Optional[Literal[tuple(mode for mode in PROFILE_MODES if mode)]] = None
+    # JSON backend of json and jsonl parts, by default the fastest installed one
+    serializer: Optional[Literal[SERIALIZERS]] = None
+    json_compat: bool = False
+    progress_interval: int = Field(10000, gt=0)
+    priority: int = 0
+    resume: bool = False
+    
+    @model_validator(mode="after")
+    def check_combination(self):
+        """Reject settings the generator would refuse, so they get a 422 instead of a failed job"""
+        try:
+            _check_output_options(self.output_format, self.compression)
+        except ImportError as e:
+            raise ValueError(str(e))
+        _check_dedup_options(self.dedup, self.uniqueness_target)
+        if self.dedup is not None and self.engine == "unique":
+            raise ValueError("The unique engine never repeats a combination and has no dedup stage")
+        if self.workers > 1:
+            if self.engine == "unique":
+                raise ValueError("The unique engine draws a whole run from one permutation and can't be sharded")
+            if self.profile in ("cprofile", "tracemalloc"):
+                raise ValueError(f"A {self.profile} capture only covers one process; profile sharded runs with stages")
+        return self
 
 class GenerationStatus(BaseModel):
+    job_id: Optional[str] = None
+    state: str = "idle"
     is_running: bool
     progress: int
     total: int
     current_phase: str
     completed: bool
     files_created: List[str]
+    elapsed_seconds: float = 0.0
+    reviews_per_second: float = 0.0
+    eta_seconds: Optional[float] = None
+    phase_timings: Dict[str, float] = {}
+    duplicates: Optional[Dict[str, Any]] = None
+    profile: Optional[Dict[str, Any]] = None
+    pipeline: Optional[Dict[str, Any]] = None
+    cache_hit: bool = False
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+class GenerationJobStatus(GenerationStatus):
+    job_id: str
+    priority: int
+    params: Dict[str, Any]
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
 
 # Dataset generator instance
 generator = HotelReviewDatasetGenerator()
 
+# Reviews built ahead of time for /generation/sample and /generation/test-batch;
+# refilled once fewer than SAMPLE_BUFFER_WATERMARK are left
+sample_buffer = SampleBuffer(HotelReviewDatasetGenerator(), size=int(os.environ.get("SAMPLE_BUFFER_SIZE", "2000")),
+                             watermark=int(os.environ.get("SAMPLE_BUFFER_WATERMARK", "1000")))
+
 @api_router.get("/")
 async def root():
     return {"message": "Hotel Review Dataset Generator API"}
@@ -84,82 +231,235 @@ async def get_status_checks():
 @api_router.get("/generation/status", response_model=GenerationStatus)
 async def get_generation_status():
     """Get current dataset generation status"""
-    return GenerationStatus(**generation_status)
+    return GenerationStatus(**generation_status, **dataset_cache.stats())
+
+@api_router.get("/generation/events")
+async def stream_generation_status():
+    """Stream generation status changes as Server-Sent Events
+    
+    The first event is the full status, later events only carry the fields
+    that changed. A comment line is sent as a heartbeat when nothing changes.
+    """
+    async def events():
+        watcher = asyncio.Queue(maxsize=WATCHER_QUEUE_SIZE)
+        status_watchers.add(watcher)
+        try:
+            yield encode_status_event(generation_status)
+            while True:
+                try:
+                    yield await asyncio.wait_for(watcher.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+        finally:
+            status_watchers.discard(watcher)
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Reviews /generation/stream generates, encodes and sends at a time
+STREAM_BLOCK_REVIEWS = 1000
+
+# Largest n a single stream may ask for
+STREAM_MAX_REVIEWS = int(os.environ.get("STREAM_MAX_REVIEWS", "1000000"))
+
+# Streams generate in the API process, so only this many run at once, each
+# on a thread of its own instead of the default executor other requests use
+STREAM_MAX_CONCURRENT = int(os.environ.get("STREAM_MAX_CONCURRENT", "2"))
+stream_slots = asyncio.Semaphore(STREAM_MAX_CONCURRENT)
+stream_executor = ThreadPoolExecutor(max_workers=STREAM_MAX_CONCURRENT, thread_name_prefix="stream")
+
+class SlotStreamingResponse(StreamingResponse):
+    """StreamingResponse that gives its stream slot back however the response ends"""
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            stream_slots.release()
+
+@api_router.get("/generation/stream")
+async def stream_generated_reviews(n: int, seed: Optional[int] = None, engine: Literal[ENGINES] = "python",
+                                   include_structure_id: bool = False, compression: Optional[str] = None):
+    """Generate n reviews on the fly and stream them as NDJSON, one review per line
+    
+    Nothing is written to disk. Each block of STREAM_BLOCK_REVIEWS reviews
+    is generated and encoded on a worker thread once the previous one has
+    been handed to the connection, which waits while the client's socket is
+    full, so a slow client holds generation back instead of piling reviews
+    up in memory. With compression "gzip" the body is sent gzip encoded.
+    The seed is returned in X-Generation-Seed so a stream can be repeated.
+    At most STREAM_MAX_CONCURRENT streams run at once; further requests
+    get a 503. n is at most STREAM_MAX_REVIEWS, as a run's quotas take
+    memory in proportion to it; larger datasets are generated as jobs.
+    """
+    if n < 1:
+        raise HTTPException(status_code=400, detail="n must be at least 1")
+    if n > STREAM_MAX_REVIEWS:
+        raise HTTPException(status_code=400, detail=f"n must be at most {STREAM_MAX_REVIEWS}; "
+                                                    "start a generation job for larger datasets")
+    if compression not in (None, "gzip"):
+        raise HTTPException(status_code=400, detail="compression must be gzip or left out")
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compression == "gzip" else None
+    
+    def encode_block(reviews):
+        """The next block of the body and whether it is the last one"""
+        block = list(itertools.islice(reviews, STREAM_BLOCK_REVIEWS))
+        last = len(block) < STREAM_BLOCK_REVIEWS
+        data = api_serializer.dumps_lines(block)
+        if compressor is not None:
+            data = compressor.compress(data) + (compressor.flush() if last else b"")
+        return data, last
+    
+    if stream_slots.locked():
+        raise HTTPException(status_code=503, detail="Too many streams are running, try again later",
+                            headers={"Retry-After": "5"})
+    await stream_slots.acquire()
+    loop = asyncio.get_running_loop()
+    
+    # The first block is generated before the response starts, so a request
+    # the generator rejects, such as more unique reviews than the templates
+    # allow, gets an error status instead of a cut off body
+    try:
+        stream_generator = HotelReviewDatasetGenerator(seed=seed, engine=engine, batch_size=STREAM_BLOCK_REVIEWS * 10,
+                                                       include_structure_id=include_structure_id)
+        reviews = stream_generator.iter_balanced_dataset(n, verbose=False)
+        first = await loop.run_in_executor(stream_executor, encode_block, reviews)
+    except (ValueError, ImportError) as e:
+        stream_slots.release()
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        stream_slots.release()
+        raise
+    
+    async def body():
+        data, last = first
+        while True:
+            if data:
+                yield data
+            if last:
+                return
+            data, last = await loop.run_in_executor(stream_executor, encode_block, reviews)
+    
+    headers = {"X-Generation-Seed": str(seed), "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if compressor is not None:
+        headers["Content-Encoding"] = "gzip"
+    return SlotStreamingResponse(body(), media_type="application/x-ndjson", headers=headers)
 
 @api_router.post("/generation/start")
-async def start_generation(request: DatasetGenerationRequest, background_tasks: BackgroundTasks):
-    """Start dataset generation in background"""
-    if generation_status["is_running"]:
-        raise HTTPException(status_code=409, detail="Generation already in progress")
-    
-    # Reset status
-    generation_status.update({
-        "is_running": True,
-        "progress": 0,
-        "total": request.total_reviews,
-        "current_phase": "Initializing",
-        "completed": False,
-        "files_created": []
-    })
-    
-    # Start background task
-    background_tasks.add_task(generate_dataset_background, request)
-    
-    return {"message": "Dataset generation started", "total_reviews": request.total_reviews}
-
-async def generate_dataset_background(request: DatasetGenerationRequest):
-    """Background task for dataset generation"""
+async def start_generation(request: DatasetGenerationRequest):
+    """Queue a dataset generation job"""
     try:
-        # Update status
-        generation_status["current_phase"] = "Generating reviews"
-        
-        # Generate the dataset
-        reviews = generator.generate_balanced_dataset(request.total_reviews)
-        
-        generation_status["progress"] = len(reviews)
-        generation_status["current_phase"] = "Splitting and saving files"
-        
-        # Split and save
-        file_paths = generator.split_and_save_dataset(
-            reviews, 
-            request.chunk_size, 
-            request.output_dir
-        )
-        
-        generation_status["current_phase"] = "Generating documentation"
-        
-        # Generate README
-        readme_path = generator.generate_readme(
-            len(reviews), 
-            len(file_paths), 
-            request.output_dir
-        )
-        
-        file_paths.append(readme_path)
-        
-        # Update final status
-        generation_status.update({
-            "is_running": False,
-            "current_phase": "Completed",
-            "completed": True,
-            "files_created": file_paths
-        })
-        
-        print(f"Dataset generation completed! Generated {len(reviews)} reviews in {len(file_paths)-1} files")
-        
-    except Exception as e:
-        generation_status.update({
-            "is_running": False,
-            "current_phase": f"Error: {str(e)}",
-            "completed": False
-        })
-        print(f"Error in dataset generation: {str(e)}")
+        job = await job_queue.submit(request.dict(), request.priority)
+    except OutputDirInUse:
+        raise HTTPException(status_code=409, detail="Another job is already writing to this output directory")
+    
+    # The dashboard follows the newest job
+    update_status({key: value for key, value in job.status.items() if key in generation_status})
+    
+    return {"message": "Dataset generation queued", "job_id": job.id, "total_reviews": request.total_reviews}
+
+@api_router.get("/generation/jobs", response_model=List[GenerationJobStatus])
+async def list_generation_jobs(limit: int = 100):
+    """List generation jobs, newest first"""
+    return [GenerationJobStatus(**status) for status in await job_queue.list_jobs(limit)]
+
+@api_router.get("/generation/jobs/{job_id}", response_model=GenerationJobStatus)
+async def get_generation_job(job_id: str):
+    """Get the status of one generation job"""
+    status = await job_queue.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return GenerationJobStatus(**status)
+
+@api_router.get("/generation/jobs/{job_id}/files")
+async def list_job_files(job_id: str):
+    """Name, size and download URL of every file a job created"""
+    status = await job_queue.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    files = []
+    for path in status["files_created"]:
+        name = os.path.basename(path)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = None
+        files.append({"name": name, "size_bytes": size, "url": f"/api/generation/jobs/{job_id}/files/{name}"})
+    return {"job_id": job_id, "files": files}
+
+@api_router.api_route("/generation/jobs/{job_id}/files/{filename}", methods=["GET", "HEAD"])
+async def download_job_file(job_id: str, filename: str, request: Request):
+    """Download a file a job created
+    
+    Answers Range requests with the bytes asked for, so parts can be
+    fetched in parallel ranges or resumed, and If-None-Match with a 304.
+    Clients accepting gzip get json, jsonl and README files gzip encoded,
+    from a compressed copy written on the first request and removed when
+    the next job in the same output directory starts.
+    """
+    status = await job_queue.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Only files listed by the job are served, never arbitrary paths
+    path = next((path for path in status["files_created"] if os.path.basename(path) == filename), None)
+    if path is None:
+        raise HTTPException(status_code=404, detail="The job created no such file")
+    try:
+        return await part_file_response(path, request.headers)
+    except FileNotFoundError:
+        raise HTTPException(status_code=410, detail="The file has been removed")
+
+@api_router.post("/generation/jobs/{job_id}/cancel", response_model=GenerationJobStatus)
+async def cancel_generation_job(job_id: str):
+    """Cancel a queued job or stop a running one"""
+    job = await job_queue.cancel(job_id)
+    if job is None:
+        if await job_queue.get(job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=409, detail="Job has already finished")
+    return GenerationJobStatus(**job.status)
+
+@api_router.post("/generation/jobs/{job_id}/resume", response_model=GenerationJobStatus)
+async def resume_generation_job(job_id: str):
+    """Continue a cancelled or failed job from its last finished part"""
+    status = await job_queue.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    try:
+        job = await job_queue.resume(job_id)
+    except OutputDirInUse:
+        raise HTTPException(status_code=409, detail="Another job is already writing to this output directory")
+    if job is None:
+        raise HTTPException(status_code=409, detail="Only cancelled or failed jobs can be resumed")
+    
+    # The dashboard follows the newest job
+    update_status({key: value for key, value in job.status.items() if key in generation_status})
+    return GenerationJobStatus(**job.status)
+
+@api_router.get("/generation/profile")
+async def get_generation_profile(job_id: Optional[str] = None):
+    """Stage timings of a job started with a profile mode, by default the newest job
+    
+    While the job runs they cover the work done so far. Once it has finished
+    they also list the top functions or allocation sites of a cprofile or
+    tracemalloc capture.
+    """
+    status = generation_status if job_id is None else await job_queue.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if status.get("profile") is None:
+        raise HTTPException(status_code=404, detail="The job was not started with a profile mode")
+    return {"job_id": status["job_id"], "state": status["state"], "profile": status["profile"]}
 
 @api_router.get("/generation/sample")
 async def get_sample_review():
     """Get a sample generated review"""
     try:
-        sample = generator.generate_single_review(1)
+        sample, = await sample_buffer.take(1)
         return sample
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating sample: {str(e)}")
@@ -172,6 +472,39 @@ async def get_covered_aspects():
         "aspects": generator.aspect_mappings
     }
 
+@api_router.get("/generation/capacity")
+async def get_generation_capacity():
+    """How many distinct reviews the templates allow, by number of aspects"""
+    capacity = generator.capacity()
+    return {
+        "by_aspect_count": capacity,
+        "total": sum(capacity.values())
+    }
+
+# Only the newest test batch files are kept, older ones are removed as new ones are saved
+TEST_BATCH_KEEP = int(os.environ.get("TEST_BATCH_KEEP", "20"))
+
+def prune_test_batches(directory, keep):
+    """Remove all but the newest keep test batch files in directory"""
+    batches = []
+    for entry in os.scandir(directory):
+        if entry.name.startswith("test_reviews_") and entry.name.endswith(".json"):
+            try:
+                batches.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                pass  # removed by a concurrent batch
+    for _, path in sorted(batches, reverse=True)[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def save_test_batch(path, reviews):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(api_serializer.dumps_indented(reviews))
+    prune_test_batches(os.path.dirname(path), TEST_BATCH_KEEP)
+
 @api_router.post("/generation/test-batch")
 async def generate_test_batch(size: int = 100):
     """Generate a small test batch to verify quality"""
@@ -179,16 +512,12 @@ async def generate_test_batch(size: int = 100):
         raise HTTPException(status_code=400, detail="Test batch size cannot exceed 1000")
     
     try:
-        reviews = []
-        for i in range(1, size + 1):
-            review = generator.generate_single_review(i)
-            reviews.append(review)
+        reviews = await sample_buffer.take(size)
         
-        # Save test batch
-        os.makedirs("test_batch", exist_ok=True)
-        test_file = "test_batch/test_reviews.json"
-        with open(test_file, 'w', encoding='utf-8') as f:
-            json.dump(reviews, f, indent=2, ensure_ascii=False)
+        # Save test batch, to a file of its own so concurrent batches never write the same one;
+        # only the newest TEST_BATCH_KEEP are kept
+        test_file = f"test_batch/test_reviews_{uuid.uuid4().hex}.json"
+        await asyncio.to_thread(save_test_batch, test_file, reviews)
         
         return {
             "message": f"Generated {len(reviews)} test reviews",
@@ -201,6 +530,18 @@ async def generate_test_batch(size: int = 100):
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Metrics in the Prometheus text format
+    
+    Scraped on the backend port; the nginx front end doesn't proxy /metrics.
+    """
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
+
+# Time the /api/generation/* requests
+app.add_middleware(RequestLatencyMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -216,6 +557,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_job_queue():
+    await job_queue.start()
+
+@app.on_event("startup")
+async def start_sample_buffer():
+    await sample_buffer.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await job_queue.shutdown()
+    await sample_buffer.stop()
+    stream_executor.shutdown(wait=False, cancel_futures=True)
     client.close()
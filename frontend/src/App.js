@@ -12,7 +12,11 @@ function App() {
     total: 0,
     current_phase: "",
     completed: false,
-    files_created: []
+    files_created: [],
+    reviews_per_second: 0,
+    eta_seconds: null,
+    phase_timings: {},
+    duplicates: null
   });
   
   const [sampleReview, setSampleReview] = useState(null);
@@ -23,8 +27,11 @@ function App() {
     chunk_size: 50000
   });
 
-  // Poll for generation status
+  // Follow generation status
   useEffect(() => {
+    let interval = null;
+    let source = null;
+
     const pollStatus = async () => {
       try {
         const response = await axios.get(`${API}/generation/status`);
@@ -34,11 +41,32 @@ function App() {
       }
     };
 
-    // Poll every 2 seconds when generation is running
-    const interval = setInterval(pollStatus, 2000);
-    pollStatus(); // Initial call
+    // Poll every 2 seconds when the event stream is not available
+    const startPolling = () => {
+      if (interval) return;
+      interval = setInterval(pollStatus, 2000);
+      pollStatus(); // Initial call
+    };
 
-    return () => clearInterval(interval);
+    if (window.EventSource) {
+      // The server pushes the full status first, then only the fields that changed
+      source = new EventSource(`${API}/generation/events`);
+      source.onmessage = (event) => {
+        const changes = JSON.parse(event.data);
+        setGenerationStatus((status) => ({ ...status, ...changes }));
+      };
+      source.onerror = () => {
+        // EventSource reconnects on its own unless the stream was refused
+        if (source.readyState === EventSource.CLOSED) startPolling();
+      };
+    } else {
+      startPolling();
+    }
+
+    return () => {
+      if (source) source.close();
+      if (interval) clearInterval(interval);
+    };
   }, []);
 
   const startGeneration = async () => {
@@ -77,6 +105,12 @@ function App() {
     }
   };
 
+  const formatDuration = (seconds) => {
+    if (seconds === null || seconds === undefined) return "-";
+    const minutes = Math.floor(seconds / 60);
+    return minutes > 0 ? `${minutes}m ${Math.round(seconds % 60)}s` : `${seconds.toFixed(1)}s`;
+  };
+
   const formatProgress = () => {
     if (generationStatus.total === 0) return "0%";
     return ((generationStatus.progress / generationStatus.total) * 100).toFixed(1) + "%";
@@ -170,6 +204,33 @@ function App() {
                 <p className="font-medium">{generationStatus.progress.toLocaleString()} / {generationStatus.total.toLocaleString()}</p>
               </div>
               
+              {generationStatus.is_running && (
+                <div>
+                  <span className="text-sm text-gray-600">Rate / ETA:</span>
+                  <p className="font-medium">
+                    {Math.round(generationStatus.reviews_per_second).toLocaleString()} reviews/s, {formatDuration(generationStatus.eta_seconds)} left
+                  </p>
+                </div>
+              )}
+              
+              {Object.keys(generationStatus.phase_timings || {}).length > 0 && (
+                <div>
+                  <span className="text-sm text-gray-600">Phase Timings:</span>
+                  {Object.entries(generationStatus.phase_timings).map(([phase, seconds]) => (
+                    <p key={phase} className="text-sm">{phase}: {formatDuration(seconds)}</p>
+                  ))}
+                </div>
+              )}
+              
+              {generationStatus.duplicates && (
+                <div>
+                  <span className="text-sm text-gray-600">Duplicates:</span>
+                  <p className="font-medium">
+                    {(generationStatus.duplicates.exact_rate * 100).toFixed(2)}% exact, {(generationStatus.duplicates.near_rate * 100).toFixed(2)}% near, {generationStatus.duplicates.resampled.toLocaleString()} drawn again
+                  </p>
+                </div>
+              )}
+              
               {generationStatus.completed && generationStatus.files_created.length > 0 && (
                 <div>
                   <span className="text-sm text-gray-600">Files Created:</span>
@@ -0,0 +1,188 @@
+"""Benchmarks of the dataset generation hot paths
+
+Needs pytest-benchmark. Save a run as a baseline with
+
+    pytest tests/test_benchmarks.py --benchmark-autosave
+
+and compare a later change against the saved runs with
+
+    pytest tests/test_benchmarks.py --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Runs are saved under .benchmarks/<machine>/, and --benchmark-compare
+compares against the newest one of the machine running it. Besides the
+timings, each run records reviews per second, peak RSS and bytes written in
+its extra_info. Runs of 1M reviews are skipped unless BENCHMARK_MAX_REVIEWS
+is raised to 1000000.
+
+The committed baseline, .benchmarks/Linux-CPython-3.11-64bit/0001_*.json,
+was recorded on a single core 2.1 GHz Intel Xeon VM with CPython 3.11.7,
+with numpy, pyarrow, zstandard, orjson and msgspec installed. Timings only
+compare on similar hardware; on another machine save a baseline of its own
+before the change being measured.
+"""
+import gc
+import itertools
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from generate_dataset import HotelReviewDatasetGenerator
+# generate_dataset puts backend/ on the path
+from dataset_generator.output import _check_output_options
+from dataset_generator.serializers import SERIALIZERS, JSONSerializer
+
+MAX_REVIEWS = int(os.environ.get("BENCHMARK_MAX_REVIEWS", "100000"))
+
+# The CLI's template set
+TEMPLATES = "booking"
+
+SIZES = [
+    pytest.param(size, marks=pytest.mark.skipif(size > MAX_REVIEWS, reason="raise BENCHMARK_MAX_REVIEWS to run"))
+    for size in (10000, 100000, 1000000)
+]
+
+# Every output format, plain and with the compressions it supports
+OUTPUT_MODES = [
+    ("json", None), ("json", "gzip"), ("json", "zstd"),
+    ("jsonl", None), ("jsonl", "gzip"), ("jsonl", "zstd"),
+    ("parquet", None), ("parquet", "gzip"), ("parquet", "zstd"),
+    ("arrow", None), ("arrow", "zstd"),
+]
+
+CHUNK_SIZE = 50000
+
+def _reset_peak_rss():
+    """Start a new peak RSS measurement, where the kernel supports it (Linux)"""
+    gc.collect()
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def _peak_rss():
+    """Peak RSS in bytes since _reset_peak_rss, or of the whole process where it can't be reset"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+def _check_mode(output_format, compression):
+    try:
+        _check_output_options(output_format, compression)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+def _serializer(backend):
+    try:
+        return JSONSerializer(backend)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+def _run(benchmark, function, setup, total_reviews):
+    """Time function once per round with a fresh setup and record reviews/s and peak RSS"""
+    rounds = 3 if total_reviews <= 10000 else 1
+    _reset_peak_rss()
+    result = benchmark.pedantic(function, setup=setup, rounds=rounds, iterations=1)
+    benchmark.extra_info["peak_rss_bytes"] = _peak_rss()
+    # No stats are kept with --benchmark-disable, which runs each benchmark once as a plain test
+    if benchmark.stats is not None:
+        benchmark.extra_info["reviews_per_second"] = round(total_reviews / benchmark.stats.stats.mean)
+    return result
+
+def test_generate_review_text(benchmark):
+    generator = HotelReviewDatasetGenerator(seed=1, templates=TEMPLATES)
+    review = next(r for r in generator.iter_balanced_dataset(100, verbose=False) if len(r["aspects"]) == 3)
+
+    text = benchmark(generator.generate_review_text, review["aspects"], review["problems"])
+    assert text
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+@pytest.mark.parametrize("total_reviews", SIZES)
+def test_generate_balanced_dataset(benchmark, engine, total_reviews):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+
+    def setup():
+        return (HotelReviewDatasetGenerator(seed=1, engine=engine, templates=TEMPLATES),), {}
+
+    reviews = _run(benchmark, lambda generator: generator.generate_balanced_dataset(total_reviews),
+                   setup, total_reviews)
+    assert len(reviews) == total_reviews
+
+@pytest.mark.parametrize("output_format,compression", OUTPUT_MODES)
+@pytest.mark.parametrize("total_reviews", SIZES)
+def test_split_and_save_dataset(benchmark, tmp_path, output_format, compression, total_reviews):
+    """Writing an already generated dataset"""
+    _check_mode(output_format, compression)
+    generator = HotelReviewDatasetGenerator(seed=1, templates=TEMPLATES)
+    reviews = generator.generate_balanced_dataset(total_reviews)
+    runs = itertools.count()
+
+    def setup():
+        return (reviews, CHUNK_SIZE, str(tmp_path / f"run_{next(runs)}"), output_format, compression), {}
+
+    file_paths = _run(benchmark, generator.split_and_save_dataset, setup, total_reviews)
+    benchmark.extra_info["bytes_written"] = _directory_size(os.path.dirname(file_paths[0]))
+
+@pytest.mark.parametrize("writers", [0, 2])
+@pytest.mark.parametrize("output_format,compression", OUTPUT_MODES)
+@pytest.mark.parametrize("total_reviews", SIZES)
+def test_stream_and_save_dataset(benchmark, tmp_path, output_format, compression, total_reviews, writers):
+    """Generating and writing a dataset part by part, as the CLI and the server do, with and without writer threads"""
+    _check_mode(output_format, compression)
+    runs = itertools.count()
+
+    def setup():
+        generator = HotelReviewDatasetGenerator(seed=1, templates=TEMPLATES)
+        reviews = generator.iter_balanced_dataset(total_reviews, verbose=False)
+        return (generator, reviews, total_reviews, CHUNK_SIZE, str(tmp_path / f"run_{next(runs)}"),
+                output_format, compression), {"writers": writers}
+
+    def stream(generator, *args, **kwargs):
+        return generator.stream_and_save_dataset(*args, **kwargs)
+
+    file_paths = _run(benchmark, stream, setup, total_reviews)
+    benchmark.extra_info["bytes_written"] = _directory_size(os.path.dirname(file_paths[0]))
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+@pytest.mark.parametrize("output_format,compression", OUTPUT_MODES[:6])
+def test_write_part(benchmark, tmp_path, output_format, compression, serializer):
+    """Writing one JSON part of CHUNK_SIZE reviews with each serializer backend"""
+    _check_mode(output_format, compression)
+    generator = HotelReviewDatasetGenerator(seed=1, templates=TEMPLATES)
+    generator.serializer = _serializer(serializer)
+    chunk = generator.generate_balanced_dataset(CHUNK_SIZE)
+
+    def setup():
+        return (chunk, 1, 1, str(tmp_path), output_format, compression), {}
+
+    filepath = _run(benchmark, generator._write_part, setup, CHUNK_SIZE)
+    benchmark.extra_info["bytes_written"] = os.path.getsize(filepath)
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+def test_render_job_list_response(benchmark, serializer):
+    """Encoding the body of GET /api/generation/jobs for 100 jobs, as the server's response class does"""
+    encoder = _serializer(serializer)
+    status = {
+        "job_id": "0f8b6f5e-3c1a-4c2e-9d8e-2b7f4a1c9e10", "state": "completed", "is_running": False,
+        "progress": 750000, "total": 750000, "current_phase": "Completed", "completed": True,
+        "files_created": [f"dataset_parts/negative_hotel_reviews_part_{i:02d}_of_15.jsonl" for i in range(1, 16)],
+        "elapsed_seconds": 41.274, "reviews_per_second": 18171.3, "eta_seconds": 0.0,
+        "phase_timings": {"Generating reviews": 39.912, "Generating documentation": 0.004},
+        "duplicates": None, "profile": None, "pipeline": None, "cache_hit": False,
+    }
+    jobs = [dict(status, progress=i * 7500) for i in range(100)]
+
+    body = benchmark(encoder.dumps, jobs)
+    assert body.startswith(b"[{")
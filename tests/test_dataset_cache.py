@@ -0,0 +1,109 @@
+"""Content-addressed dataset cache"""
+import errno
+import os
+
+import generate_dataset  # noqa: F401, puts backend/ on the path
+import dataset_cache
+from dataset_cache import MANIFEST, DatasetCache
+
+PARAMS = {"total_reviews": 1000, "chunk_size": 500, "seed": 1, "engine": "python", "output_format": "json",
+          "compression": None, "include_structure_id": False, "dedup": None, "uniqueness_target": None,
+          "workers": 1, "output_dir": "out", "priority": 0}
+
+def _dataset(directory, size=100, names=("part_1.json", "README.md")):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name in names:
+        paths.append(os.path.join(directory, name))
+        with open(paths[-1], "wb") as f:
+            f.write(name.encode() * (size // len(name) + 1))
+    return paths
+
+def test_key_is_stable_and_covers_the_settings(tmp_path):
+    cache = DatasetCache(str(tmp_path), 10 ** 6, "templates-a")
+    key = cache.key(PARAMS)
+    assert key == DatasetCache(str(tmp_path), 10 ** 6, "templates-a").key(dict(PARAMS))
+    # Fields that don't decide the bytes don't change the key
+    assert cache.key(dict(PARAMS, output_dir="elsewhere", priority=5)) == key
+    assert cache.key(dict(PARAMS, workers=4)) == cache.key(dict(PARAMS, workers=2))
+    
+    assert cache.key(dict(PARAMS, seed=2)) != key
+    assert cache.key(dict(PARAMS, workers=2)) != key
+    assert DatasetCache(str(tmp_path), 10 ** 6, "templates-b").key(PARAMS) != key
+
+def test_unseeded_or_disabled_runs_are_not_cached(tmp_path):
+    assert DatasetCache(str(tmp_path), 10 ** 6, "t").key(dict(PARAMS, seed=None)) is None
+    assert DatasetCache(str(tmp_path), 0, "t").key(PARAMS) is None
+
+def test_hits_and_misses(tmp_path):
+    cache = DatasetCache(str(tmp_path / "cache"), 10 ** 6, "t")
+    key = cache.key(PARAMS)
+    assert cache.fetch(key, str(tmp_path / "a")) is None
+    
+    paths = _dataset(tmp_path / "run")
+    cache.store(key, paths)
+    fetched = cache.fetch(key, str(tmp_path / "b"))
+    assert [os.path.basename(path) for path in fetched] == ["part_1.json", "README.md"]
+    for source, copy in zip(paths, fetched):
+        assert open(source, "rb").read() == open(copy, "rb").read()
+    assert cache.stats() == {"cache_hits": 1, "cache_misses": 1}
+
+def test_files_are_hard_linked(tmp_path):
+    cache = DatasetCache(str(tmp_path / "cache"), 10 ** 6, "t")
+    key = cache.key(PARAMS)
+    paths = _dataset(tmp_path / "run")
+    cache.store(key, paths)
+    fetched = cache.fetch(key, str(tmp_path / "out"))
+    assert os.path.samefile(paths[0], fetched[0])
+
+def test_files_are_copied_across_filesystems(tmp_path, monkeypatch):
+    def cross_device_link(source, target):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+    monkeypatch.setattr(dataset_cache.os, "link", cross_device_link)
+    
+    cache = DatasetCache(str(tmp_path / "cache"), 10 ** 6, "t")
+    key = cache.key(PARAMS)
+    paths = _dataset(tmp_path / "run")
+    cache.store(key, paths)
+    fetched = cache.fetch(key, str(tmp_path / "out"))
+    assert not os.path.samefile(paths[0], fetched[0])
+    assert open(paths[0], "rb").read() == open(fetched[0], "rb").read()
+
+def test_storing_a_stored_key_again(tmp_path):
+    cache = DatasetCache(str(tmp_path / "cache"), 10 ** 6, "t")
+    key = cache.key(PARAMS)
+    cache.store(key, _dataset(tmp_path / "first"))
+    cache.store(key, _dataset(tmp_path / "second", names=("other.json",)))
+    assert [os.path.basename(path) for path in cache.fetch(key, str(tmp_path / "out"))] == \
+        ["part_1.json", "README.md"]
+
+def test_store_racing_another_store_of_the_same_key(tmp_path, monkeypatch):
+    cache = DatasetCache(str(tmp_path / "cache"), 10 ** 6, "t")
+    key = cache.key(PARAMS)
+    rename = os.rename
+    
+    def rename_after_another_store(source, target):
+        # The other run moves its entry into place between the check and this rename
+        monkeypatch.setattr(dataset_cache.os, "rename", rename)
+        DatasetCache(cache.root, cache.max_bytes, "t").store(key, _dataset(tmp_path / "other"))
+        rename(source, target)
+    monkeypatch.setattr(dataset_cache.os, "rename", rename_after_another_store)
+    
+    cache.store(key, _dataset(tmp_path / "run"))
+    assert os.listdir(cache.root) == [key]
+    assert cache.fetch(key, str(tmp_path / "out")) is not None
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DatasetCache(str(tmp_path / "cache"), 10 ** 6, "t")
+    keys = [cache.key(dict(PARAMS, seed=seed)) for seed in range(3)]
+    for age, key in enumerate(keys):
+        cache.store(key, _dataset(tmp_path / key, size=1000))
+        os.utime(os.path.join(cache.root, key, MANIFEST), (1000 + age, 1000 + age))
+    # Using the oldest entry makes the second one the least recently used
+    cache.fetch(keys[0], str(tmp_path / "out"))
+    
+    entry_size = sum(os.path.getsize(os.path.join(cache.root, keys[0], name))
+                     for name in os.listdir(os.path.join(cache.root, keys[0])))
+    cache.max_bytes = 2 * entry_size
+    cache.evict()
+    assert sorted(os.listdir(cache.root)) == sorted([keys[0], keys[2]])
@@ -0,0 +1,85 @@
+"""Duplicate and near-duplicate detection"""
+import pytest
+
+from generate_dataset import HotelReviewDatasetGenerator
+# generate_dataset puts backend/ on the path
+from dataset_generator.dedup import ReviewDeduplicator
+
+TEXT = ("The room was far too small for two people and the bathroom had mould on the ceiling while "
+        "the breakfast ran out of coffee before nine and the staff at reception did not seem to care at all")
+
+def _check(deduplicator, texts):
+    kinds = []
+    for text in texts:
+        kind, keys = deduplicator.classify(text)
+        deduplicator.keep(kind, keys)
+        kinds.append(kind)
+    return kinds
+
+def _generated_texts(count, engine="python"):
+    generator = HotelReviewDatasetGenerator(seed=5, engine=engine, templates="booking")
+    return [review["review_text"] for review in generator.iter_balanced_dataset(count, verbose=False)]
+
+def test_exact_duplicates():
+    deduplicator = ReviewDeduplicator(100, near=False)
+    assert _check(deduplicator, [TEXT, "Dirty towels", TEXT, "dirty towels"]) == [None, None, "exact", None]
+    assert deduplicator.stats()["exact_duplicates"] == 1
+    assert deduplicator.stats()["exact_rate"] == 0.25
+
+def test_near_duplicates():
+    deduplicator = ReviewDeduplicator(100)
+    near = TEXT.replace("at all", "at any point")
+    assert _check(deduplicator, [TEXT, near, TEXT, "Dirty towels"]) == [None, "near", "exact", None]
+    counts = deduplicator.stats()
+    assert (counts["exact_duplicates"], counts["near_duplicates"], counts["reviews"]) == (1, 1, 4)
+
+def test_short_texts_are_one_shingle():
+    deduplicator = ReviewDeduplicator(100)
+    assert _check(deduplicator, ["", "Noisy", "Noisy room", "noisy room"]) == [None, None, None, "near"]
+
+def test_block_keys_match_single_texts():
+    pytest.importorskip("numpy")
+    texts = _generated_texts(3000) + ["", "Noisy", "Noisy room"]
+    deduplicator = ReviewDeduplicator(len(texts))
+    assert deduplicator.block_keys(texts) == [deduplicator._keys(text) for text in texts]
+
+def test_block_counts_match_single_texts():
+    pytest.importorskip("numpy")
+    texts = _generated_texts(20000)
+    # Filters with room to spare, so that neither way sees a false positive
+    one_at_a_time = ReviewDeduplicator(len(texts) * 10)
+    _check(one_at_a_time, texts)
+    blocked = ReviewDeduplicator(len(texts) * 10)
+    blocked.classify_and_keep_block(texts)
+    assert blocked.counts == one_at_a_time.counts
+    assert blocked.counts["exact_duplicates"] == len(texts) - len(set(texts))
+    assert blocked.counts["exact_duplicates"] > 0 and blocked.counts["near_duplicates"] > 0
+    assert blocked.texts.bits == one_at_a_time.texts.bits
+    assert blocked.bands.bits == one_at_a_time.bands.bits
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_uniqueness_target_draws_duplicates_again(engine):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    generator = HotelReviewDatasetGenerator(seed=5, engine=engine, templates="booking", dedup="near",
+                                            uniqueness_target=0.99)
+    reviews = list(generator.iter_balanced_dataset(20000, verbose=False))
+    stats = generator.dedup_stats()
+    assert stats["reviews"] == len(reviews) == 20000
+    assert stats["resampled"] > 0
+    assert stats["duplicate_rate"] <= 0.01
+    
+    # Without a target the same run keeps far more duplicates
+    generator = HotelReviewDatasetGenerator(seed=5, engine=engine, templates="booking", dedup="near")
+    list(generator.iter_balanced_dataset(20000, verbose=False))
+    assert generator.dedup_stats()["duplicate_rate"] > 0.05
+
+def test_state_survives_a_checkpoint():
+    deduplicator = ReviewDeduplicator(100)
+    _check(deduplicator, [TEXT, "Dirty towels"])
+    
+    restored = ReviewDeduplicator(100)
+    restored.set_state(deduplicator.get_state())
+    assert restored.counts == deduplicator.counts
+    assert _check(restored, [TEXT, TEXT.replace("at all", "at any point"), "Cold shower"]) == \
+        ["exact", "near", None]
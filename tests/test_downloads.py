@@ -0,0 +1,123 @@
+"""Range, conditional and gzip downloads of job files"""
+import gzip
+import os
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import generate_dataset  # noqa: F401, puts backend/ on the path
+import downloads
+from downloads import GZIP_VARIANT_DIR, part_file_response, remove_gzip_variants
+
+CONTENT = bytes(range(256)) * 40
+
+@pytest.fixture
+def part(tmp_path):
+    path = tmp_path / "part_01_of_01.json"
+    path.write_bytes(CONTENT)
+    return path
+
+@pytest.fixture
+def client(tmp_path):
+    async def download(request):
+        return await part_file_response(str(tmp_path / request.path_params["name"]), request.headers)
+    app = Starlette(routes=[Route("/{name}", download, methods=["GET", "HEAD"])])
+    return TestClient(app)
+
+def _get(client, headers=None, method="GET"):
+    # Plain requests, so the body is the file and not its gzip copy
+    return client.request(method, "/part_01_of_01.json", headers={"accept-encoding": "identity", **(headers or {})})
+
+def test_whole_file(client, part):
+    response = _get(client)
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+
+def test_byte_range(client, part):
+    response = _get(client, {"range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert response.content == CONTENT[100:200]
+
+def test_open_ended_range(client, part):
+    response = _get(client, {"range": "bytes=10000-"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[10000:]
+
+def test_suffix_range(client, part):
+    response = _get(client, {"range": "bytes=-50"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes {len(CONTENT) - 50}-{len(CONTENT) - 1}/{len(CONTENT)}"
+    assert response.content == CONTENT[-50:]
+
+def test_range_past_the_end(client, part):
+    response = _get(client, {"range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert response.content == b""
+
+def test_several_ranges_get_the_whole_file(client, part):
+    response = _get(client, {"range": "bytes=0-9,20-29"})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+def test_if_none_match(client, part):
+    etag = _get(client).headers["etag"]
+    response = _get(client, {"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert _get(client, {"if-none-match": '"other"'}).status_code == 200
+
+def test_if_range(client, part):
+    etag = _get(client).headers["etag"]
+    assert _get(client, {"range": "bytes=0-9", "if-range": etag}).status_code == 206
+    # The file changed since the client's first request, so it gets all of it
+    response = _get(client, {"range": "bytes=0-9", "if-range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+def test_head(client, part):
+    response = _get(client, {"range": "bytes=0-9"}, method="HEAD")
+    assert response.status_code == 206
+    assert response.headers["content-length"] == "10"
+    assert response.content == b""
+
+def test_gzip_copy(client, part, tmp_path):
+    response = client.get("/part_01_of_01.json", headers={"accept-encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == CONTENT
+    assert os.listdir(tmp_path / GZIP_VARIANT_DIR) == ["part_01_of_01.json.gz"]
+    
+    remove_gzip_variants(str(tmp_path))
+    assert not os.path.exists(tmp_path / GZIP_VARIANT_DIR)
+
+def test_gzip_copy_leaves_gzip_parts_alone(client, part, tmp_path):
+    # Another job's gzip part in the same directory has the name a copy placed next to the file would get
+    other = tmp_path / "part_01_of_01.json.gz"
+    other.write_bytes(gzip.compress(b"other job"))
+    client.get("/part_01_of_01.json", headers={"accept-encoding": "gzip"})
+    assert gzip.decompress(other.read_bytes()) == b"other job"
+
+def test_range_with_default_client_headers(client, part, tmp_path):
+    # Clients accept gzip by default, and their ranges are of the listed, uncompressed file
+    response = client.get("/part_01_of_01.json", headers={"range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert response.content == CONTENT[100:200]
+    assert not os.path.exists(tmp_path / GZIP_VARIANT_DIR)
+
+def test_if_range_with_default_client_headers(client, part):
+    etag = _get(client).headers["etag"]
+    response = client.get("/part_01_of_01.json", headers={"range": "bytes=0-9", "if-range": etag})
+    assert response.status_code == 206
+    assert response.content == CONTENT[:10]
+
+def test_compress_locks_are_dropped(client, part):
+    client.get("/part_01_of_01.json", headers={"accept-encoding": "gzip"})
+    client.get("/part_01_of_01.json", headers={"accept-encoding": "gzip"})
+    assert downloads._compress_locks == {}
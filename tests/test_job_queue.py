@@ -0,0 +1,154 @@
+"""Job queue lifecycle, against an in-memory stand-in for the Mongo collection"""
+import asyncio
+import copy
+import time
+
+import generate_dataset  # noqa: F401, puts backend/ on the path
+from job_queue import JobQueue, OutputDirInUse
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+    
+    def sort(self, key, direction):
+        self.documents.sort(key=lambda document: document[key], reverse=direction < 0)
+        return self
+    
+    def __aiter__(self):
+        self._iterator = iter(self.documents)
+        return self
+    
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+    
+    async def to_list(self, limit):
+        return self.documents[:limit]
+
+class FakeCollection:
+    """The part of a motor collection JobQueue uses"""
+    
+    def __init__(self):
+        self.documents = {}
+    
+    def _matches(self, document, query):
+        for key, value in query.items():
+            if isinstance(value, dict):
+                if document.get(key) not in value["$in"]:
+                    return False
+            elif document.get(key) != value:
+                return False
+        return True
+    
+    async def insert_one(self, document):
+        # Let other requests run in between, as a real round trip to Mongo does
+        await asyncio.sleep(0)
+        self.documents[document["job_id"]] = copy.deepcopy(document)
+    
+    async def update_one(self, query, update):
+        self.documents[query["job_id"]].update(copy.deepcopy(update["$set"]))
+    
+    async def find_one(self, query, projection=None):
+        await asyncio.sleep(0)
+        return next((copy.deepcopy(d) for d in self.documents.values() if self._matches(d, query)), None)
+    
+    def find(self, query, projection=None):
+        return FakeCursor([copy.deepcopy(d) for d in self.documents.values() if self._matches(d, query)])
+
+def _params(output_dir, total_reviews):
+    return {"total_reviews": total_reviews, "chunk_size": 50000, "output_dir": str(output_dir), "workers": 1,
+            "writer_threads": 0, "seed": 1, "engine": "python", "output_format": "jsonl", "compression": None,
+            "include_structure_id": False, "dedup": None, "uniqueness_target": None, "profile": None,
+            "serializer": None, "json_compat": False, "progress_interval": 1000, "priority": 0, "resume": False}
+
+async def _wait_for(condition, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+def test_shutdown_stops_running_job_and_records_it(tmp_path):
+    async def scenario():
+        collection = FakeCollection()
+        queue = JobQueue(collection, max_workers=1)
+        await queue.start()
+        job = await queue.submit(_params(tmp_path / "big", 10_000_000))
+        queued = await queue.submit(_params(tmp_path / "next", 1000))
+        await _wait_for(lambda: job.status["progress"] > 0)
+        
+        started = time.monotonic()
+        await queue.shutdown(grace=5)
+        return collection, job, queued, time.monotonic() - started
+    
+    collection, job, queued, seconds = asyncio.run(scenario())
+    assert seconds < 5
+    assert collection.documents[job.id]["state"] == "cancelled"
+    assert collection.documents[job.id]["finished_at"] is not None
+    # Left for the next start to restore
+    assert collection.documents[queued.id]["state"] == "queued"
+
+def test_job_completes(tmp_path):
+    async def scenario():
+        collection = FakeCollection()
+        queue = JobQueue(collection, max_workers=1)
+        await queue.start()
+        job = await queue.submit(_params(tmp_path, 3000))
+        await _wait_for(lambda: job.id not in queue.jobs)
+        await queue.shutdown()
+        return collection.documents[job.id]
+    
+    status = asyncio.run(scenario())
+    assert status["state"] == "completed"
+    assert len(status["files_created"]) == 2
+
+def test_cancel_before_the_job_starts_running(tmp_path, monkeypatch):
+    import job_queue
+    
+    def slow_remove_gzip_variants(output_dir):
+        time.sleep(0.5)
+    monkeypatch.setattr(job_queue, "remove_gzip_variants", slow_remove_gzip_variants)
+    
+    async def scenario():
+        collection = FakeCollection()
+        queue = JobQueue(collection, max_workers=1)
+        await queue.start()
+        job = await queue.submit(_params(tmp_path, 3000))
+        await asyncio.sleep(0.1)
+        await queue.cancel(job.id)
+        await asyncio.sleep(1)
+        await queue.shutdown()
+        return collection.documents[job.id]
+    
+    status = asyncio.run(scenario())
+    assert status["state"] == "cancelled"
+    assert not any(tmp_path.iterdir())
+
+def test_concurrent_jobs_for_one_output_dir(tmp_path):
+    async def scenario():
+        collection = FakeCollection()
+        queue = JobQueue(collection, max_workers=1)
+        results = await asyncio.gather(queue.submit(_params(tmp_path, 1000)), queue.submit(_params(tmp_path, 1000)),
+                                       return_exceptions=True)
+        return collection, results
+    
+    collection, results = asyncio.run(scenario())
+    assert sum(isinstance(result, OutputDirInUse) for result in results) == 1
+    assert len(collection.documents) == 1
+
+def test_concurrent_resumes_for_one_output_dir(tmp_path):
+    async def scenario():
+        collection = FakeCollection()
+        queue = JobQueue(collection, max_workers=1)
+        for _ in range(2):
+            job = await queue.submit(_params(tmp_path, 1000))
+            await queue._finish(job, {"state": "cancelled"})
+        job_ids = list(collection.documents)
+        results = await asyncio.gather(*(queue.resume(job_id) for job_id in job_ids + job_ids),
+                                       return_exceptions=True)
+        return results
+    
+    results = asyncio.run(scenario())
+    assert sum(result is not None and not isinstance(result, Exception) for result in results) == 1
+    assert sum(isinstance(result, OutputDirInUse) for result in results) >= 1
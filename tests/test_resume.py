@@ -0,0 +1,67 @@
+"""A run that crashes part way and is resumed writes the same files as one that doesn't"""
+import os
+
+import pytest
+
+import generate_dataset
+from dataset_generator import load_checkpoint, run_generation_job
+
+TOTAL_REVIEWS = 23000
+CRASH_AFTER = 16000
+
+class Crash(Exception):
+    pass
+
+class ProgressQueue:
+    """Stands in for the job's progress queue, crashing the run once it has passed crash_after"""
+    
+    def __init__(self, crash_after=None):
+        self.crash_after = crash_after
+    
+    def put(self, status):
+        if self.crash_after is not None and status["progress"] > self.crash_after:
+            raise Crash()
+
+def _params(output_dir, engine, writer_threads, dedup, resume=False):
+    return {"total_reviews": TOTAL_REVIEWS, "chunk_size": 5000, "output_dir": str(output_dir), "workers": 1,
+            "writer_threads": writer_threads, "seed": 42, "engine": engine, "output_format": "jsonl",
+            "compression": None, "include_structure_id": True, "dedup": dedup, "uniqueness_target": None,
+            "profile": None, "serializer": None, "json_compat": False, "progress_interval": 1,
+            "priority": 0, "resume": resume}
+
+def _read_parts(output_dir):
+    return {name: open(os.path.join(output_dir, name), "rb").read()
+            for name in sorted(os.listdir(output_dir)) if name.endswith(".jsonl")}
+
+@pytest.mark.parametrize("dedup", [None, "exact", "near"])
+@pytest.mark.parametrize("writer_threads", [0, 2])
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_resume_after_crash_is_byte_identical(tmp_path, engine, writer_threads, dedup):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    
+    run_generation_job(_params(tmp_path / "straight", engine, writer_threads, dedup), ProgressQueue())
+    
+    crashed = tmp_path / "crashed"
+    with pytest.raises(Crash):
+        run_generation_job(_params(crashed, engine, writer_threads, dedup), ProgressQueue(CRASH_AFTER))
+    checkpoint = load_checkpoint(str(crashed))
+    assert checkpoint is not None
+    assert 0 < checkpoint["generator"]["generated"] < TOTAL_REVIEWS
+    
+    run_generation_job(_params(crashed, engine, writer_threads, dedup, resume=True), ProgressQueue())
+    assert load_checkpoint(str(crashed)) is None
+    straight = _read_parts(tmp_path / "straight")
+    assert len(straight) == 5
+    assert _read_parts(crashed) == straight
+
+def test_cli_refuses_a_checkpoint_of_other_settings(tmp_path):
+    # A sharded run's checkpoint has no generator state to resume a single process run from
+    with pytest.raises(Crash):
+        run_generation_job(dict(_params(tmp_path, "python", 0, None), workers=2), ProgressQueue(CRASH_AFTER))
+    assert load_checkpoint(str(tmp_path)) is not None
+    
+    with pytest.raises(ValueError, match="different settings"):
+        generate_dataset.main(["--total-reviews", str(TOTAL_REVIEWS), "--chunk-size", "5000", "--seed", "42",
+                               "--format", "jsonl", "--templates", "standard", "--output-dir", str(tmp_path),
+                               "--resume"])
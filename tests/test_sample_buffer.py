@@ -0,0 +1,44 @@
+"""Pre-generated samples and their background refill"""
+import asyncio
+
+from generate_dataset import HotelReviewDatasetGenerator
+# generate_dataset puts backend/ on the path
+from sample_buffer import SampleBuffer
+
+async def _until(condition, timeout=10):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+def test_take_refills_below_the_watermark():
+    async def scenario():
+        buffer = SampleBuffer(HotelReviewDatasetGenerator(seed=1), size=20, watermark=10, refill_batch=3)
+        await buffer.start()
+        try:
+            await _until(lambda: len(buffer.reviews) == buffer.size)
+            
+            # Still at the watermark, so nothing is generated
+            above = await buffer.take(10)
+            await asyncio.sleep(0.1)
+            left_above = len(buffer.reviews)
+            
+            below = await buffer.take(1)
+            await _until(lambda: len(buffer.reviews) == buffer.size)
+            return above, left_above, below
+        finally:
+            await buffer.stop()
+    
+    above, left_above, below = asyncio.run(scenario())
+    assert left_above == 10
+    assert [review["review_id"] for review in above] == list(range(1, 11))
+    assert [review["review_id"] for review in below] == [1]
+
+def test_take_generates_what_the_buffer_lacks():
+    async def scenario():
+        buffer = SampleBuffer(HotelReviewDatasetGenerator(seed=1), size=5, watermark=0)
+        buffer.reviews.extend(buffer._generate(5))
+        return await buffer.take(12), len(buffer.reviews)
+    
+    reviews, left = asyncio.run(scenario())
+    assert [review["review_id"] for review in reviews] == list(range(1, 13))
+    assert left == 0
@@ -0,0 +1,58 @@
+"""Aspect quota scheduling"""
+import random
+
+import pytest
+
+import generate_dataset  # noqa: F401, puts backend/ on the path
+from dataset_generator.sampling import AspectQuotaScheduler
+
+ASPECTS = [f"aspect_{i}" for i in range(12)]
+
+@pytest.mark.parametrize("block_size", [1, 7, 1000])
+def test_draw_block_meets_every_quota(block_size):
+    np = pytest.importorskip("numpy")
+    total_reviews = 6000
+    target = total_reviews // len(ASPECTS)
+    scheduler = AspectQuotaScheduler({key: target for key in ASPECTS}, random.Random(1))
+    np_rng = np.random.default_rng(1)
+    
+    counts = np.zeros(len(ASPECTS), dtype=np.int64)
+    for start in range(0, total_reviews, block_size):
+        aspect_ids = scheduler.draw_block(np_rng, min(block_size, total_reviews - start))
+        for row in aspect_ids.tolist():
+            ids = [i for i in row if i >= 0]
+            assert 1 <= len(ids) <= 3
+            assert len(set(ids)) == len(ids)
+            # Aspects are packed to the front of a row
+            assert row[:len(ids)] == ids
+        counts += np.bincount(aspect_ids[aspect_ids >= 0], minlength=len(ASPECTS))
+    
+    assert counts.min() >= target
+    assert counts.tolist() == [scheduler.counts[key] for key in ASPECTS]
+    assert all(left == 0 for left in scheduler.remaining.values())
+
+def test_draw_fills_quotas_then_picks_uniformly():
+    target = 500
+    scheduler = AspectQuotaScheduler({key: target for key in ASPECTS}, random.Random(3))
+    
+    # Quota phase: every key comes from the aspects still under quota
+    while scheduler.pending:
+        pending = set(scheduler.pending)
+        aspect_keys = scheduler.draw()
+        assert 1 <= len(aspect_keys) <= 3
+        assert len(set(aspect_keys)) == len(aspect_keys)
+        assert set(aspect_keys) <= pending
+        # Retired aspects leave the list and its positions in step
+        assert all(scheduler.pending[i] == key for key, i in scheduler.position.items())
+        assert set(scheduler.pending) == {key for key in ASPECTS if scheduler.remaining[key] > 0}
+    assert scheduler.counts == {key: target for key in ASPECTS}
+    
+    # Uniform phase: any aspect can follow, about equally often
+    draws = 30000
+    for _ in range(draws):
+        aspect_keys = scheduler.draw()
+        assert 1 <= len(aspect_keys) <= 3
+        assert len(set(aspect_keys)) == len(aspect_keys)
+    extra = [scheduler.counts[key] - target for key in ASPECTS]
+    expected = draws * 2 / len(ASPECTS)
+    assert all(abs(count - expected) < 0.1 * expected for count in extra)
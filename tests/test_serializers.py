@@ -0,0 +1,61 @@
+"""Every JSON backend writes the bytes the json module writes"""
+import json
+
+import pytest
+
+from generate_dataset import HotelReviewDatasetGenerator
+# generate_dataset puts backend/ on the path
+from dataset_generator.serializers import SERIALIZERS, JSONSerializer
+from dataset_generator.templates import TEMPLATE_SETS
+
+# Strings and shapes that encoders are known to disagree on
+AWKWARD_VALUES = [
+    {"text": 'Quotes " and \\ backslashes\tand a tab\nand a newline', "control": "\x00\x1f\x7f"},
+    {"text": "Café — naïve façade ✓ 漢字 😀", "separators": "  "},
+    {"empty_list": [], "empty_dict": {}, "nested": [[], {}, [[]]], "none": None, "flags": [True, False]},
+    {"ints": [0, -1, 2 ** 53, -(2 ** 63), 2 ** 64 - 1]},
+    {"big": 2 ** 70},
+]
+
+def _serializers(compat=False):
+    serializers = []
+    for backend in SERIALIZERS:
+        try:
+            serializers.append(JSONSerializer(backend, compat))
+        except ImportError:
+            continue
+    return serializers
+
+def _reviews(templates):
+    generator = HotelReviewDatasetGenerator(seed=3, templates=templates, include_structure_id=True)
+    return list(generator.iter_balanced_dataset(500, verbose=False))
+
+def _expected(value):
+    compact = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    indented = json.dumps(value, ensure_ascii=False, indent=2).encode("utf-8")
+    return compact, indented
+
+@pytest.mark.parametrize("serializer", _serializers(), ids=lambda serializer: serializer.backend)
+@pytest.mark.parametrize("templates", sorted(TEMPLATE_SETS))
+def test_reviews_match_the_json_module(serializer, templates):
+    reviews = _reviews(templates)
+    compact, indented = _expected(reviews)
+    assert serializer.dumps(reviews) == compact
+    assert serializer.dumps_indented(reviews) == indented
+    assert serializer.dumps_lines(reviews) == b"".join(_expected(review)[0] + b"\n" for review in reviews)
+
+@pytest.mark.parametrize("serializer", _serializers(), ids=lambda serializer: serializer.backend)
+@pytest.mark.parametrize("value", AWKWARD_VALUES)
+def test_awkward_values_match_the_json_module(serializer, value):
+    compact, indented = _expected(value)
+    assert serializer.dumps(value) == compact
+    assert serializer.dumps_indented(value) == indented
+    assert serializer.dumps_lines([value, value]) == compact + b"\n" + compact + b"\n"
+
+@pytest.mark.parametrize("serializer", _serializers(compat=True), ids=lambda serializer: serializer.backend)
+def test_floats_match_the_json_module_with_compat(serializer):
+    value = {"review_id": 1, "scores": [1e16, 0.00001, 1.5, -0.0], "progress": {"rate": 18171.3}}
+    compact, indented = _expected(value)
+    assert serializer.dumps(value) == compact
+    assert serializer.dumps_indented(value) == indented
+    assert serializer.dumps_lines([value]) == compact + b"\n"
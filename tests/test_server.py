@@ -0,0 +1,131 @@
+"""API endpoints, with no Mongo server behind them
+
+motor connects lazily, so endpoints that don't touch the database run
+against the app as it is.
+"""
+import asyncio
+import json
+
+import pytest
+
+import generate_dataset  # noqa: F401, puts backend/ on the path
+
+pytest.importorskip("motor")
+from fastapi.testclient import TestClient
+
+import server
+
+@pytest.fixture
+def client():
+    return TestClient(server.app)
+
+@pytest.mark.parametrize("params", [
+    {"engine": "nope"},
+    {"output_format": "xml"},
+    {"compression": "zip"},
+    {"total_reviews": 0},
+    {"chunk_size": 0},
+    {"workers": 0},
+    {"writer_threads": -1},
+    {"progress_interval": 0},
+    {"uniqueness_target": 0.9},
+    {"engine": "unique", "dedup": "exact"},
+    {"engine": "unique", "workers": 2},
+    {"profile": "cprofile", "workers": 2},
+])
+def test_invalid_generation_requests_are_rejected(client, params):
+    response = client.post("/api/generation/start", json=params)
+    assert response.status_code == 422
+
+def _event_data(event):
+    assert event.startswith("data: ") and event.endswith("\n\n")
+    return json.loads(event[len("data: "):])
+
+def test_status_events_send_a_snapshot_then_deltas(monkeypatch):
+    monkeypatch.setattr(server, "generation_status", dict(server.generation_status))
+    monkeypatch.setattr(server, "status_watchers", set())
+    
+    async def scenario():
+        response = await server.stream_generation_status()
+        events = response.body_iterator
+        first = _event_data(await events.__anext__())
+        server.update_status({"state": "running", "is_running": True, "progress": 0})
+        delta = _event_data(await events.__anext__())
+        # Unchanged fields send nothing
+        server.update_status({"state": "running"})
+        server.update_status({"progress": 10})
+        second = _event_data(await events.__anext__())
+        await events.aclose()
+        return first, delta, second
+    
+    before = dict(server.generation_status)
+    first, delta, second = asyncio.run(scenario())
+    assert first == before
+    assert delta == {"state": "running", "is_running": True}
+    assert second == {"progress": 10}
+    assert not server.status_watchers
+
+def test_status_events_replace_a_full_backlog_with_a_snapshot(monkeypatch):
+    monkeypatch.setattr(server, "generation_status", dict(server.generation_status))
+    monkeypatch.setattr(server, "status_watchers", set())
+    
+    async def scenario():
+        response = await server.stream_generation_status()
+        events = response.body_iterator
+        await events.__anext__()
+        watcher, = server.status_watchers
+        for progress in range(1, server.WATCHER_QUEUE_SIZE + 2):
+            server.update_status({"progress": progress})
+        backlog = watcher.qsize()
+        event = _event_data(await events.__anext__())
+        await events.aclose()
+        return backlog, event
+    
+    backlog, event = asyncio.run(scenario())
+    assert backlog == 1
+    assert event == server.generation_status
+    assert event["progress"] == server.WATCHER_QUEUE_SIZE + 1
+
+def test_metrics_label_requests_by_route_template(client, monkeypatch):
+    async def no_job(job_id):
+        return None
+    monkeypatch.setattr(server.job_queue, "get", no_job)
+    
+    assert client.get("/api/generation/jobs/f00d-cafe").status_code == 404
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/generation/jobs/{job_id}",status="404"' in response.text
+    assert "f00d-cafe" not in response.text
+    # Only /api/generation/* requests are timed
+    assert 'route="/metrics"' not in response.text
+
+def test_stream_sends_one_line_per_review(client):
+    n = server.STREAM_BLOCK_REVIEWS * 2 + 500
+    response = client.get("/api/generation/stream", params={"n": n, "seed": 5})
+    assert response.status_code == 200
+    assert response.headers["x-generation-seed"] == "5"
+    lines = response.text.splitlines()
+    assert len(lines) == n
+    assert [json.loads(line)["review_id"] for line in lines] == list(range(1, n + 1))
+
+def test_gzip_stream_decodes_to_the_same_lines(client):
+    params = {"n": server.STREAM_BLOCK_REVIEWS + 10, "seed": 5}
+    plain = client.get("/api/generation/stream", params=params)
+    compressed = client.get("/api/generation/stream", params=dict(params, compression="gzip"))
+    assert compressed.headers["content-encoding"] == "gzip"
+    # httpx decodes the body; fewer bytes than that came over the wire
+    assert compressed.num_bytes_downloaded < len(plain.content)
+    assert compressed.content == plain.content
+
+@pytest.mark.parametrize("params", [{"n": 0}, {"n": 11}, {"n": 5, "compression": "br"}])
+def test_stream_rejects_bad_sizes_and_compressions(client, monkeypatch, params):
+    monkeypatch.setattr(server, "STREAM_MAX_REVIEWS", 10)
+    response = client.get("/api/generation/stream", params=params)
+    assert response.status_code == 400
+
+def test_stream_is_refused_while_every_slot_is_taken(client, monkeypatch):
+    monkeypatch.setattr(server, "stream_slots", asyncio.Semaphore(0))
+    response = client.get("/api/generation/stream", params={"n": 5})
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
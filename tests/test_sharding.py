@@ -0,0 +1,73 @@
+"""Sharded generation across a process pool"""
+import json
+from collections import Counter
+
+import pytest
+
+from generate_dataset import HotelReviewDatasetGenerator
+# generate_dataset puts backend/ on the path
+
+TOTAL_REVIEWS = 30000
+CHUNK_SIZE = 4000
+
+def _engine(name):
+    if name == "numpy":
+        pytest.importorskip("numpy")
+    return name
+
+def _aspect_counts(generator, paths):
+    """Count mentions of each aspect key in the part files
+    
+    A few synonym and problem pairs belong to two aspects; their mentions
+    are counted per pair of keys instead.
+    """
+    owners = {}
+    for key, synonyms in generator.aspect_mappings.items():
+        for synonym in synonyms:
+            for problem in generator.problem_templates[key]:
+                owners.setdefault((synonym, problem), set()).add(key)
+    counts = Counter()
+    shared = Counter()
+    for path in paths:
+        with open(path) as f:
+            for review in json.load(f):
+                for pair in zip(review["aspects"], review["problems"]):
+                    keys = owners[pair]
+                    if len(keys) == 1:
+                        counts.update(keys)
+                    else:
+                        shared[frozenset(keys)] += 1
+    return counts, shared
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_every_aspect_reaches_its_target(tmp_path, engine):
+    generator = HotelReviewDatasetGenerator(engine=_engine(engine))
+    paths = generator.generate_sharded_dataset(TOTAL_REVIEWS, CHUNK_SIZE, str(tmp_path), workers=3, seed=11)
+
+    counts, shared = _aspect_counts(generator, paths)
+    target = TOTAL_REVIEWS // len(generator.aspect_mappings)
+    owned = set().union(*shared)
+    for key in generator.aspect_mappings:
+        if key not in owned:
+            assert counts[key] >= target
+    # The shared mentions must be able to make up what both keys lack
+    for keys, count in shared.items():
+        assert sum(max(0, target - counts[key]) for key in keys) <= count
+
+def test_shard_targets_add_up():
+    generator = HotelReviewDatasetGenerator()
+    shard_sizes = [CHUNK_SIZE] * (TOTAL_REVIEWS // CHUNK_SIZE) + [TOTAL_REVIEWS % CHUNK_SIZE]
+    shard_targets = generator.split_aspect_targets(TOTAL_REVIEWS, shard_sizes)
+    target = TOTAL_REVIEWS // len(generator.aspect_mappings)
+    for key in generator.aspect_mappings:
+        assert sum(targets[key] for targets in shard_targets) == target
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_worker_count_does_not_change_the_files(tmp_path, engine):
+    contents = []
+    for workers in (1, 3):
+        generator = HotelReviewDatasetGenerator(engine=_engine(engine))
+        paths = generator.generate_sharded_dataset(TOTAL_REVIEWS, CHUNK_SIZE, str(tmp_path / str(workers)),
+                                                   workers=workers, seed=11)
+        contents.append([open(path, "rb").read() for path in paths])
+    assert contents[0] == contents[1]
@@ -0,0 +1,24 @@
+"""The unique engine never renders two ranks as the same text"""
+import pytest
+
+from generate_dataset import HotelReviewDatasetGenerator
+# generate_dataset puts backend/ on the path
+from dataset_generator.templates import TEMPLATE_SETS
+
+@pytest.mark.parametrize("templates", sorted(TEMPLATE_SETS))
+def test_block_of_wordings_is_distinct(templates):
+    # The lowest ranks of two aspect reviews share their aspects and go
+    # through every opening structure, connector and complaint, and ending
+    generator = HotelReviewDatasetGenerator(seed=1, engine="unique", templates=templates)
+    space = generator._space()
+    block = len(space["structures"]) * len(space["complaints"]) * len(space["endings"])
+    assert generator.capacity()[2] % block == 0
+    
+    texts = [generator._unrank_review(2, rank)[0] for rank in range(block)]
+    assert len(set(texts)) == block
+
+@pytest.mark.parametrize("templates", sorted(TEMPLATE_SETS))
+def test_unique_run_has_no_duplicates(templates):
+    generator = HotelReviewDatasetGenerator(seed=7, engine="unique", templates=templates)
+    texts = [review["review_text"] for review in generator.iter_balanced_dataset(20000, verbose=False)]
+    assert len(set(texts)) == len(texts)